@@ -1,24 +1,43 @@
 from functools import wraps
+from inspect import iscoroutinefunction
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.tokens import AccessToken
 
 
+def _attach_user_id(request):
+    """Set request.user_id from the bearer token; returns an error Response for a bad token."""
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        try:
+            token = auth_header.split(' ')[1]
+            decoded_token = AccessToken(token)
+            user_id = decoded_token['user_id']
+            request.user_id = user_id # Attach id to requests
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        # No auth header: treat as anonymous
+        request.user_id = None
+    return None
+
+
 def extract_user_from_token(view_func):
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            error = _attach_user_id(request)
+            if error is not None:
+                return error
+            return await view_func(request, *args, **kwargs)
+
+        return async_wrapper
+
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            try:
-                token = auth_header.split(' ')[1]
-                decoded_token = AccessToken(token)
-                user_id = decoded_token['user_id']
-                request.user_id = user_id # Attach id to requests
-            except Exception as e:
-                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            # No auth header: treat as anonymous
-            request.user_id = None
+        error = _attach_user_id(request)
+        if error is not None:
+            return error
         return view_func(request, *args, **kwargs)
 
     return wrapper
\ No newline at end of file
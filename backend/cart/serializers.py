@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from rest_framework import serializers
 from causes.models import Causes
 from users_n_auth.models import User
@@ -49,4 +51,11 @@ class CartSerializer(serializers.ModelSerializer):
                 "updated_at": None,
                 "items": []
             }
-        return super().to_representation(instance)
\ No newline at end of file
+        return super().to_representation(instance)
+
+class DonateSerializer(serializers.Serializer):
+    """Input of the direct donate endpoint. The cause is looked up by the view, together with its organizer."""
+    cause_id = serializers.UUIDField()
+    donation_amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+    quantity = serializers.IntegerField(min_value=1, default=1)
+    email = serializers.EmailField(required=False)
@@ -1,7 +1,7 @@
 import uuid
 from decimal import Decimal
 from unittest.mock import patch
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError, transaction
@@ -234,13 +234,9 @@ class CheckoutTestCase(APITestCase):
             quantity=1
         )
 
-    @patch('cart.views.get_recipient_id_from_service')
-    @patch('cart.views.get_user_email_from_service')
     @patch('cart.views.Paystack.initialize_payment')
-    def test_checkout_authenticated_user(self, mock_initialize_payment, mock_get_email, mock_get_recipient):
+    def test_checkout_authenticated_user(self, mock_initialize_payment):
         """Test checkout for authenticated user"""
-        mock_get_recipient.return_value = uuid.uuid4()
-        mock_get_email.return_value = 'test@example.com'
         mock_initialize_payment.return_value = {
             'status': True,
             'data': {'authorization_url': 'https://checkout.paystack.com/...', 'reference': 'ref123'}
@@ -250,11 +246,9 @@ class CheckoutTestCase(APITestCase):
         paystack_response = mock_initialize_payment('test@example.com', 100.00)
         self.assertTrue(paystack_response['status'])
 
-    @patch('cart.views.get_recipient_id_from_service')
     @patch('cart.views.Paystack.initialize_payment')
-    def test_checkout_anonymous_user(self, mock_initialize_payment, mock_get_recipient):
+    def test_checkout_anonymous_user(self, mock_initialize_payment):
         """Test checkout for anonymous user"""
-        mock_get_recipient.return_value = uuid.uuid4()
         mock_initialize_payment.return_value = {
             'status': True,
             'data': {'authorization_url': 'https://checkout.paystack.com/...', 'reference': 'ref123'}
@@ -270,13 +264,9 @@ class CheckoutTestCase(APITestCase):
         self.cart_item.delete()
         self.assertFalse(self.cart.items.exists())
 
-    @patch('cart.views.get_recipient_id_from_service')
-    @patch('cart.views.get_user_email_from_service')
     @patch('cart.views.Paystack.initialize_payment')
-    def test_checkout_payment_failure(self, mock_initialize_payment, mock_get_email, mock_get_recipient):
+    def test_checkout_payment_failure(self, mock_initialize_payment):
         """Test checkout when payment initialization fails"""
-        mock_get_recipient.return_value = uuid.uuid4()
-        mock_get_email.return_value = 'test@example.com'
         mock_initialize_payment.return_value = {
             'status': False,
             'message': 'Payment initialization failed'
@@ -295,14 +285,10 @@ class CartIntegrationTestCase(APITestCase):
         self.cause_id = uuid.uuid4()
 
     @patch('cart.views.validate_cause_with_service')
-    @patch('cart.views.get_recipient_id_from_service')
-    @patch('cart.views.get_user_email_from_service')
     @patch('cart.views.Paystack.initialize_payment')
-    def test_cart_workflow(self, mock_initialize_payment, mock_get_email, mock_get_recipient, mock_validate_cause):
+    def test_cart_workflow(self, mock_initialize_payment, mock_validate_cause):
         """Test complete cart workflow"""
         mock_validate_cause.return_value = None
-        mock_get_recipient.return_value = uuid.uuid4()
-        mock_get_email.return_value = 'test@example.com'
         mock_initialize_payment.return_value = {
             'status': True,
             'data': {'authorization_url': 'https://checkout.paystack.com/...', 'reference': 'ref123'}
@@ -332,4 +318,216 @@ class CartIntegrationTestCase(APITestCase):
 
         # Test payment initialization
         paystack_response = mock_initialize_payment('test@example.com', 100.00)
-        self.assertTrue(paystack_response['status'])
\ No newline at end of file
+        self.assertTrue(paystack_response['status'])
+
+class AsyncPaymentViewsTestCase(TestCase):
+    """Test cases for the async checkout and donate views"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        User = get_user_model()
+        self.organizer = User.objects.create_user(email='async-organizer@example.com', password='testpass123')
+        self.cause = Causes.objects.create(
+            name='Async Cause',
+            category=Category.objects.create(name='Async', description='Async causes'),
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status='ongoing',
+        )
+        self.paystack_response = {
+            'status': True,
+            'data': {'authorization_url': 'https://checkout.paystack.com/abc', 'reference': 'ref-async-1'},
+        }
+
+    def _post(self, view, path, data):
+        from asgiref.sync import async_to_sync
+        from rest_framework.test import APIRequestFactory
+
+        request = APIRequestFactory().post(path, data, format='json')
+        return async_to_sync(view)(request)
+
+    def test_donate_async_awaits_paystack(self):
+        from unittest.mock import AsyncMock
+        from payments.models import PaymentTransaction
+        from .views import donate_async
+
+        with patch('cart.views.AsyncPaystack.initialize_payment', new=AsyncMock(return_value=self.paystack_response)) as init:
+            response = self._post(donate_async, '/cart/donate/', {
+                'cause_id': str(self.cause.id),
+                'donation_amount': '40.00',
+                'email': 'donor@example.com',
+            })
+
+        self.assertEqual(response.status_code, 200)
+        init.assert_awaited_once_with('donor@example.com', 40.0)
+        payment = PaymentTransaction.objects.select_related('donation').get(transaction_id='ref-async-1')
+        self.assertEqual(response.data['donation_id'], payment.donation.id)
+        self.assertEqual(payment.donation.recipient_id, self.organizer)
+        self.assertFalse(Cart.objects.exists())
+
+    def test_checkout_async_reports_paystack_failure(self):
+        from unittest.mock import AsyncMock
+        from .views import checkout_async
+
+        cart = Cart.objects.create(status='active')
+        CartItem.objects.create(cart=cart, cause_id=self.cause.id, donation_amount=Decimal('15.00'), quantity=2)
+
+        failure = {'status': False, 'message': 'Payment initialization failed: circuit open'}
+        with patch('cart.views.AsyncPaystack.initialize_payment', new=AsyncMock(return_value=failure)):
+            response = self._post(checkout_async, '/cart/checkout/', {'cart_id': str(cart.id), 'email': 'donor@example.com'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], failure['message'])
+        cart.refresh_from_db()
+        self.assertEqual(cart.status, 'active')
+
+
+class BulkCheckoutTestCase(TestCase):
+    """Test cases for checkout creating a payment batch"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        User = get_user_model()
+        category = Category.objects.create(name='Bulk', description='Bulk causes')
+        self.causes = [
+            Causes.objects.create(
+                name=f'Bulk Cause {i}',
+                category=category,
+                organizer_id=User.objects.create_user(email=f'bulk-organizer{i}@example.com', password='testpass123'),
+                target_amount=Decimal('1000.00'),
+                status='ongoing',
+            )
+            for i in range(5)
+        ]
+
+    def _checkout(self, item_count, reference):
+        """Check out a cart of ``item_count`` causes; returns the response and the queries checkout ran."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIRequestFactory
+        from .views import checkout
+
+        cart = Cart.objects.create(status='active')
+        for cause in self.causes[:item_count]:
+            CartItem.objects.create(cart=cart, cause_id=cause.id, donation_amount=Decimal('10.00'), quantity=2)
+
+        initialized = {'status': True, 'data': {'authorization_url': 'https://checkout.paystack.com/x', 'reference': reference}}
+        with patch('cart.views.Paystack.initialize_payment', return_value=initialized):
+            request = APIRequestFactory().post('/cart/checkout/', {'cart_id': str(cart.id), 'email': 'donor@example.com'},
+                                               format='json')
+            with CaptureQueriesContext(connection) as queries:
+                response = checkout(request)
+        return response, queries
+
+    def test_checkout_queries_do_not_grow_with_cart_size(self):
+        one_item, one_item_queries = self._checkout(1, 'ref-bulk-1')
+        five_items, five_item_queries = self._checkout(5, 'ref-bulk-5')
+        self.assertEqual((one_item.status_code, five_items.status_code), (200, 200))
+        self.assertEqual(len(one_item_queries), len(five_item_queries))
+
+    def test_verification_completes_every_donation_in_the_batch(self):
+        from donations.models import Donation, OutboxEvent
+        from notifications.models import AdminNotification
+        from payments.models import PaymentTransaction
+        from payments.state import settle_payment
+
+        response, _ = self._checkout(3, 'ref-bulk-batch')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_amount'], Decimal('60.00'))
+
+        payment = PaymentTransaction.objects.select_related('batch').get(transaction_id='ref-bulk-batch')
+        donations = Donation.objects.filter(payment_batch=payment.batch)
+        self.assertEqual(AdminNotification.objects.filter(donation__in=donations).count(), 3)
+        self.assertEqual(
+            sorted(donations.values_list('recipient_id', flat=True)),
+            sorted(cause.organizer_id_id for cause in self.causes[:3]),
+        )
+
+        with patch('payments.state.send_donation_success_notification.delay') as notify, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(settle_payment('ref-bulk-batch', 'success'), 'completed')
+        self.assertEqual(set(donations.values_list('status', flat=True)), {'completed'})
+        self.assertEqual(OutboxEvent.objects.count(), 3)
+        self.assertEqual(notify.call_count, 3)
+        self.assertEqual({call.args[1] for call in notify.call_args_list}, {'donor@example.com'})
+        for cause in self.causes[:3]:
+            cause.refresh_from_db()
+            self.assertEqual(cause.donation_count, 1)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DonateFastPathTestCase(TestCase):
+    """Test cases for the direct donate endpoint"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        User = get_user_model()
+        self.organizer = User.objects.create_user(email='fast-organizer@example.com', password='testpass123')
+        self.donor = User.objects.create_user(email='fast-donor@example.com', password='testpass123')
+        self.cause = Causes.objects.create(
+            name='Fast Cause',
+            category=Category.objects.create(name='Fast', description='Fast causes'),
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status='ongoing',
+        )
+        self.paystack_response = {
+            'status': True,
+            'data': {'authorization_url': 'https://checkout.paystack.com/fast', 'reference': 'ref-fast-1'},
+        }
+
+    def _donate(self, data, user=None):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .views import donate
+
+        request = APIRequestFactory().post('/cart/donate/', data, format='json')
+        if user is not None:
+            force_authenticate(request, user=user)
+        with patch('cart.views.Paystack.initialize_payment', return_value=self.paystack_response) as init:
+            response = donate(request)
+        return response, init
+
+    def test_anonymous_donation_runs_a_constant_number_of_queries(self):
+        from payments.models import PaymentTransaction
+
+        # cause + organizer, then the donation, its admin notification and the
+        # payment, inserted in one savepoint
+        with self.assertNumQueries(6):
+            response, init = self._donate({
+                'cause_id': str(self.cause.id), 'donation_amount': '15.00', 'quantity': 2, 'email': 'donor@example.com',
+            })
+
+        self.assertEqual(response.status_code, 200)
+        init.assert_called_once_with('donor@example.com', Decimal('30.00'))
+        payment = PaymentTransaction.objects.select_related('donation').get(transaction_id='ref-fast-1')
+        self.assertEqual(response.data['donation_id'], payment.donation.id)
+        self.assertEqual((payment.donation.recipient_id, payment.donation.amount), (self.organizer, Decimal('30.00')))
+        self.assertFalse(Cart.objects.exists())
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_authenticated_donation_reuses_the_request_user(self):
+        from payments.models import PaymentTransaction
+
+        with self.assertNumQueries(6):
+            response, init = self._donate({'cause_id': str(self.cause.id), 'donation_amount': '20.00'}, user=self.donor)
+
+        self.assertEqual(response.status_code, 200)
+        init.assert_called_once_with('fast-donor@example.com', Decimal('20.00'))
+        payment = PaymentTransaction.objects.get(transaction_id='ref-fast-1')
+        self.assertEqual((payment.user_id, payment.email), (self.donor, 'fast-donor@example.com'))
+
+    def test_invalid_requests_write_nothing(self):
+        from donations.models import Donation
+
+        response, init = self._donate({'cause_id': str(uuid.uuid4()), 'donation_amount': '20.00', 'email': 'a@example.com'})
+        self.assertEqual(response.status_code, 400)
+        response, _ = self._donate({'cause_id': str(self.cause.id), 'donation_amount': '20.00'})
+        self.assertEqual(response.data, {'error': 'Email is required for checkout'})
+        init.assert_not_called()
+        self.assertFalse(Donation.objects.exists())
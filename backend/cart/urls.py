@@ -1,12 +1,20 @@
-from .views import (add_to_cart, update_cart_item, checkout, get_cart, remove_from_cart, delete_cart, donate)
+from django.conf import settings
+
+from .views import (add_to_cart, update_cart_item, checkout, get_cart, remove_from_cart, delete_cart, donate,
+                    checkout_async, donate_async)
 from django.urls import path
 
+if settings.PAYMENT_VIEWS_ASYNC:
+    checkout_view, donate_view = checkout_async, donate_async
+else:
+    checkout_view, donate_view = checkout, donate
+
 urlpatterns = [
     path('', get_cart, name='get_cart'),
     path('add/', add_to_cart, name='add_to_cart'),
     path('update/<uuid:item_id>/', update_cart_item, name='update_cart_item'),
     path('remove/<uuid:item_id>/', remove_from_cart, name='remove_from_cart'),
     path('delete/', delete_cart, name='delete_cart'),
-    path('checkout/', checkout, name='checkout'),
-    path('donate/', donate, name='donate'),
-]
\ No newline at end of file
+    path('checkout/', checkout_view, name='checkout'),
+    path('donate/', donate_view, name='donate'),
+]
@@ -1,4 +1,5 @@
 from functools import wraps
+from inspect import iscoroutinefunction
 
 from rest_framework import serializers
 from rest_framework import status
@@ -112,6 +113,15 @@ def create_user_cart(user_id):
     return cart
 
 def validate_request(view_func):
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            try:
+                return await view_func(request, *args, **kwargs)
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return async_wrapper
+
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
         try:
@@ -1,7 +1,10 @@
 import logging
 
-from payments.models import PaymentTransaction
-from payments.paystack import Paystack
+from django.db import transaction
+from payments.models import PaymentBatch, PaymentTransaction
+from adrf.decorators import api_view as async_api_view
+from asgiref.sync import sync_to_async
+from payments.paystack import AsyncPaystack, Paystack
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.generics import get_object_or_404
@@ -11,10 +14,10 @@ from users_n_auth.models import User
 
 from .decorators import extract_user_from_token
 from .models import Cart, CartItem
-from .serializers import CartSerializer, CartItemSerializer
-from .utils import (validate_user_id_with_service, validate_request, get_user_email_from_service,
-                    get_recipient_id_from_service, get_or_create_user_cart, create_user_cart)
+from .serializers import CartSerializer, CartItemSerializer, DonateSerializer
+from .utils import validate_user_id_with_service, validate_request, get_or_create_user_cart, create_user_cart
 from donations.models import Donation
+from notifications.services import NotificationService
 from causes.models import Causes
 from causes.serializers import CausesSerializer
 
@@ -262,13 +265,13 @@ def delete_cart(request):
 
 
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-@extract_user_from_token
-@validate_request
-def checkout(request):
-    import logging
-
+def prepare_checkout(request):
+    """
+    Everything checkout does before calling Paystack: resolve the cart and
+    create its pending donations, in a PaymentBatch, with a fixed number of
+    queries however many items the cart holds. Returns an error Response, or
+    the state complete_checkout needs.
+    """
     if is_authenticated(request):
         try:
             user = User.objects.get(id=request.user_id)
@@ -282,7 +285,9 @@ def checkout(request):
             return Response({"message": "No active cart found"}, status=status.HTTP_404_NOT_FOUND)
         except Cart.MultipleObjectsReturned:
             cart = Cart.objects.filter(user_id=user, status='active').first()
+        user_email = user.email
     else:
+        user = None
         cart_id = request.data.get('cart_id')
         if not cart_id:
             return Response({"error": "cart_id is required for anonymous users"}, status=status.HTTP_400_BAD_REQUEST)
@@ -290,69 +295,76 @@ def checkout(request):
             cart = Cart.objects.get(id=cart_id, user_id=None, status='active')
         except Cart.DoesNotExist:
             return Response({"message": "No active cart found"}, status=status.HTTP_404_NOT_FOUND)
+        user_email = request.data.get('email')
 
-    if not cart.items.exists():
+    items = list(cart.items.all())
+    if not items:
         return Response({"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST)
-
-    total_amount = sum(item.donation_amount * item.quantity for item in cart.items.all())
-    donations = []
-
-    for item in cart.items.all():
-        try:
-            recipient_uuid = get_recipient_id_from_service(item.cause_id, request)
-            recipient = User.objects.get(id=recipient_uuid)
-            cause = Causes.objects.get(id=item.cause_id)
-
-            donation = Donation.objects.create(
-                user_id=user if is_authenticated(request) else None,
-                cause_id=cause,
+    if not user_email:
+        return Response({"error": "Email is required for checkout"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Every cause and its organizer (the donation's recipient) in one query
+    causes = Causes.objects.select_related('organizer_id').in_bulk({item.cause_id for item in items})
+    for item in items:
+        cause = causes.get(item.cause_id)
+        if cause is None:
+            return Response({"error": "Cause not found."}, status=status.HTTP_400_BAD_REQUEST)
+        if cause.organizer_id is None:
+            return Response({"error": "Invalid organizer for this cause."}, status=status.HTTP_400_BAD_REQUEST)
+
+    total_amount = sum(item.donation_amount * item.quantity for item in items)
+    with transaction.atomic():
+        batch = PaymentBatch.objects.create(amount=total_amount)
+        donations = Donation.objects.bulk_create([
+            Donation(
+                user_id=user,
+                cause_id=causes[item.cause_id],
                 amount=item.donation_amount * item.quantity,
                 currency='GHS',
                 status='pending',
-                recipient_id=recipient
+                recipient_id=causes[item.cause_id].organizer_id,
+                payment_batch=batch,
             )
-            donations.append(donation)
-        except Exception as e:
-            logging.error(f"Error creating donation: {str(e)}")
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-    # Get user email - for authenticated users, get from their profile
-    if is_authenticated(request):
-        user_email = user.email
-    else:
-        user_email = request.data.get('email')
-        if not user_email:
-            return Response({"error": "Email is required for checkout"}, status=status.HTTP_400_BAD_REQUEST)
-
-    # Initialize payment with Paystack
-    try:
-        paystack_response = Paystack.initialize_payment(user_email, total_amount)
-    except Exception as e:
-        logging.error(f"Paystack initialization error: {str(e)}")
-        return Response({"error": "Payment initialization failed"}, status=status.HTTP_400_BAD_REQUEST)
-
+            for item in items
+        ])
+        NotificationService.notify_new_donations(donations)
+
+    return {
+        'cart': cart,
+        'batch': batch,
+        'donations': donations,
+        'user': user,
+        'user_email': user_email,
+        'total_amount': total_amount,
+    }
+
+
+def complete_checkout(prepared, paystack_response):
+    """Record the payment Paystack initialized for a prepared checkout and close the cart."""
     if paystack_response['status']:
         data = paystack_response['data']
         try:
             payment_transaction = PaymentTransaction.objects.create(
-                donation=donations[0],
-                user_id=user if is_authenticated(request) else None,
-                amount=total_amount,
+                donation=prepared['donations'][0],
+                batch=prepared['batch'],
+                user_id=prepared['user'],
+                amount=prepared['total_amount'],
                 currency='GHS',
                 transaction_id=data['reference'],
                 status='pending',
                 payment_method='Paystack',
-                email=user_email,
+                email=prepared['user_email'],
             )
 
             # Mark cart as completed
+            cart = prepared['cart']
             cart.status = 'completed'
-            cart.save()
+            cart.save(update_fields=['status', 'updated_at'])
 
             return Response({
                 'authorization_url': data['authorization_url'],
                 'reference': data['reference'],
-                'total_amount': total_amount,
+                'total_amount': prepared['total_amount'],
                 'payment_id': payment_transaction.id
             }, status=status.HTTP_200_OK)
         except Exception as e:
@@ -361,143 +373,134 @@ def checkout(request):
     else:
         return Response({"error": paystack_response.get('message', 'Payment initialization failed')}, status=status.HTTP_400_BAD_REQUEST)
 
-# Straight up "donate" skipping the whole cart process.
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 @extract_user_from_token
 @validate_request
-def donate(request):
-    import logging
-    logging.warning(f"DONATE ENDPOINT request.data: {request.data}")
-    cart_id = request.data.get('cart_id')
-    cause_id = request.data.get('cause_id')
-
-    # Validate cause_id is a valid UUID
-    import uuid
-    try:
-        uuid.UUID(str(cause_id))
-    except (ValueError, TypeError):
-        return Response({"error": "cause_id must be a valid UUID."}, status=status.HTTP_400_BAD_REQUEST)
-
-    serializer = CartItemSerializer(data=request.data)
-    if not serializer.is_valid():
-        logging.warning(f"CartItemSerializer errors: {serializer.errors}")
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-    logging.warning("Serializer valid. Proceeding to cart creation/retrieval.")
-
-    # Handle user authentication and cart creation
-    if is_authenticated(request):
-        validate_user_id_with_service(request.user_id, request)
-        try:
-            user = User.objects.get(id=request.user_id)
-            user_id = user  # Store the User instance
-        except User.DoesNotExist:
-            return Response({"error": "User not found"}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            cart, created = get_or_create_user_cart(user_id)
-        except Cart.DoesNotExist:
-            cart = create_user_cart(user_id)
-    else:
-        user_id = None  # For anonymous users
-        if cart_id:
-            try:
-                cart = Cart.objects.get(id=cart_id, user_id=None)
-            except Cart.DoesNotExist:
-                cart = create_user_cart(None)
-        else:
-            cart = create_user_cart(None)
-
-    logging.warning(f"Cart ready: {cart}. Proceeding to cart item creation/update.")
+def checkout(request):
+    prepared = prepare_checkout(request)
+    if isinstance(prepared, Response):
+        return prepared
 
-    # Create or update cart item
+    # Initialize payment with Paystack
     try:
-        existing_item = CartItem.objects.filter(
-            cart=cart,
-            cause_id=serializer.validated_data['cause_id']
-        ).first()
-
-        if existing_item:
-            existing_item.quantity += serializer.validated_data.get('quantity', 1)
-            existing_item.donation_amount = serializer.validated_data['donation_amount']
-            existing_item.save()
-            cart_item = existing_item
-        else:
-            cart_item = CartItem.objects.create(
-                cart=cart,
-                cause_id=serializer.validated_data['cause_id'],
-                quantity=serializer.validated_data.get('quantity', 1),
-                donation_amount=serializer.validated_data['donation_amount']
-            )
-        logging.warning(f"Cart item ready: {cart_item}")
+        paystack_response = Paystack.initialize_payment(prepared['user_email'], prepared['total_amount'])
     except Exception as e:
-        logging.warning(f"CartItem creation/update error: {e}")
-        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        logging.error(f"Paystack initialization error: {str(e)}")
+        return Response({"error": "Payment initialization failed"}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Calculate total amount
-    total_amount = float(cart_item.donation_amount) * cart_item.quantity
+    return complete_checkout(prepared, paystack_response)
 
-    # Get recipient and create donation
-    try:
-        recipient_uuid = get_recipient_id_from_service(cart_item.cause_id, request)
-        recipient = User.objects.get(id=recipient_uuid)
-        cause = Causes.objects.get(id=cart_item.cause_id)
-
-        # Create the donation with proper model instances
-        donation = Donation.objects.create(
-            user_id=None if user_id is None else User.objects.get(id=user_id.id),  # Convert User instance to ID and back
-            cause_id=cause,
-            amount=total_amount,
-            currency='GHS',
-            status='pending',
-            recipient_id=recipient
-        )
-    except Exception as e:
-        logging.error(f"Error creating donation: {str(e)}")
-        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Handle email for payment
-    if user_id:
-        try:
-            user_email = get_user_email_from_service(user_id.id if hasattr(user_id, 'id') else user_id, request)
-        except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-    else:
-        user_email = request.data.get('email')
-        if not user_email:
-            return Response({"error": "Email is required for checkout"}, status=status.HTTP_400_BAD_REQUEST)
+@async_api_view(['POST'])
+@permission_classes([AllowAny])
+@extract_user_from_token
+@validate_request
+async def checkout_async(request):
+    """checkout that awaits Paystack instead of blocking a worker thread."""
+    prepared = await sync_to_async(prepare_checkout)(request)
+    if isinstance(prepared, Response):
+        return prepared
 
-    # Initialize payment with Paystack
-    paystack_response = Paystack.initialize_payment(user_email, total_amount)
+    paystack_response = await AsyncPaystack.initialize_payment(prepared['user_email'], prepared['total_amount'])
+    return await sync_to_async(complete_checkout)(prepared, paystack_response)
 
+
+# Straight up "donate" skipping the whole cart process.
+def prepare_donation(request):
+    """
+    Everything donate does before calling Paystack: validate the request and
+    load the cause with its organizer in one query. Donate does not touch the
+    cart tables, and writes nothing until Paystack has initialized the
+    payment. Returns an error Response, or the state complete_donation needs.
+    """
+    serializer = DonateSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+
+    cause = Causes.objects.select_related('organizer_id').filter(id=data['cause_id']).first()
+    if cause is None:
+        return Response({"error": "Cause not found."}, status=status.HTTP_400_BAD_REQUEST)
+    if cause.organizer_id is None:
+        return Response({"error": "Invalid organizer for this cause."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # The user authentication already loaded from the bearer token
+    user = request.user if request.user.is_authenticated else None
+    user_email = user.email if user else data.get('email')
+    if not user_email:
+        return Response({"error": "Email is required for checkout"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return {
+        'cause': cause,
+        'user': user,
+        'user_email': user_email,
+        'total_amount': data['donation_amount'] * data['quantity'],
+    }
+
+
+def complete_donation(prepared, paystack_response):
+    """Record the donation and the payment Paystack initialized for it, in one transaction."""
     if paystack_response['status']:
         data = paystack_response['data']
-        # Create payment transaction with proper model instances
-        payment_transaction = PaymentTransaction.objects.create(
-            donation=donation,
-            user_id=None if user_id is None else User.objects.get(id=user_id.id),
-            amount=total_amount,
-            currency='GHS',
-            transaction_id=data['reference'],
-            status='pending',
-            payment_method='Paystack',
-            email=user_email,
-        )
-
-        # Cleanup cart
-        cart_item.delete()
-        if not cart.items.exists():
-            cart.delete()
+        with transaction.atomic():
+            donation = Donation.objects.create(
+                user_id=prepared['user'],
+                cause_id=prepared['cause'],
+                amount=prepared['total_amount'],
+                currency='GHS',
+                status='pending',
+                recipient_id=prepared['cause'].organizer_id,
+            )
+            payment_transaction = PaymentTransaction.objects.create(
+                donation=donation,
+                user_id=prepared['user'],
+                amount=prepared['total_amount'],
+                currency='GHS',
+                transaction_id=data['reference'],
+                status='pending',
+                payment_method='Paystack',
+                email=prepared['user_email'],
+            )
 
         return Response({
             'authorization_url': data['authorization_url'],
             'reference': data['reference'],
-            'total_amount': total_amount,
+            'total_amount': prepared['total_amount'],
             'payment_id': payment_transaction.id,
             'donation_id': donation.id
         }, status=status.HTTP_200_OK)
     else:
         return Response({"error": paystack_response['message']}, status=status.HTTP_400_BAD_REQUEST)
 
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@extract_user_from_token
+@validate_request
+def donate(request):
+    prepared = prepare_donation(request)
+    if isinstance(prepared, Response):
+        return prepared
+
+    # Initialize payment with Paystack
+    paystack_response = Paystack.initialize_payment(prepared['user_email'], prepared['total_amount'])
+    return complete_donation(prepared, paystack_response)
+
+
+@async_api_view(['POST'])
+@permission_classes([AllowAny])
+@extract_user_from_token
+@validate_request
+async def donate_async(request):
+    """donate that awaits Paystack instead of blocking a worker thread."""
+    prepared = await sync_to_async(prepare_donation)(request)
+    if isinstance(prepared, Response):
+        return prepared
+
+    paystack_response = await AsyncPaystack.initialize_payment(prepared['user_email'], prepared['total_amount'])
+    return await sync_to_async(complete_donation)(prepared, paystack_response)
+
+
 # Ensure that user_id, cart_id, and cause_id fields are indexed in Cart and CartItem models for optimal performance.
@@ -4,10 +4,10 @@ from .models import Category
 # Register your models here.
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug', 'description_preview')
+    list_display = ('name', 'slug', 'description_preview', 'cause_count', 'live_cause_count', 'total_raised')
     search_fields = ('name', 'description')
     prepopulated_fields = {'slug': ('name',)}
-    readonly_fields = ('id', 'slug')
+    readonly_fields = ('id', 'slug', 'cause_count', 'live_cause_count', 'total_raised')
     
     def description_preview(self, obj):
         return obj.description[:100] + '...' if len(obj.description) > 100 else obj.description
@@ -17,6 +17,9 @@ class CategoryAdmin(admin.ModelAdmin):
         ('Category Information', {
             'fields': ('name', 'description', 'slug')
         }),
+        ('Statistics', {
+            'fields': ('cause_count', 'live_cause_count', 'total_raised')
+        }),
         ('System Fields', {
             'fields': ('id',),
             'classes': ('collapse',)
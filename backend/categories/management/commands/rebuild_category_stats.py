@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from categories.stats import rebuild_category_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild cause_count, live_cause_count and total_raised on categories from the causes table'
+
+    def handle(self, *args, **options):
+        updated = rebuild_category_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {updated} categories'))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:57
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+HIDDEN_STATUSES = ('under_review', 'rejected')
+LIVE_STATUSES = ('approved', 'ongoing')
+
+
+def backfill_category_stats(apps, schema_editor):
+    Category = apps.get_model('categories', 'Category')
+    Causes = apps.get_model('causes', 'Causes')
+
+    totals = Causes.objects.exclude(status__in=HIDDEN_STATUSES).order_by().values('category_id').annotate(
+        cause_count=Count('pk'),
+        live_cause_count=Count('pk', filter=Q(status__in=LIVE_STATUSES)),
+        total_raised=Sum('current_amount'),
+    )
+    for row in totals:
+        Category.objects.filter(pk=row['category_id']).update(
+            cause_count=row['cause_count'],
+            live_cause_count=row['live_cause_count'],
+            total_raised=row['total_raised'] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('causes', '0009_causes_cover_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='cause_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='live_cause_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='total_raised',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.RunPython(backfill_category_stats, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,13 @@ class Category(models.Model):
     description = models.TextField()
     slug = models.SlugField(unique=True)
 
+    # Public cause statistics, maintained by categories.stats as causes are
+    # created, deleted or change status, category or amount raised.
+    # Rebuild with `manage.py rebuild_category_stats`.
+    cause_count = models.PositiveIntegerField(default=0, editable=False)
+    live_cause_count = models.PositiveIntegerField(default=0, editable=False)
+    total_raised = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+from .models import Category
+
+
+class CategoryCatalogueSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ['id', 'name', 'slug', 'description', 'cause_count', 'live_cause_count', 'total_raised']
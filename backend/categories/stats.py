@@ -0,0 +1,105 @@
+"""
+Incrementally maintained cause statistics stored on Category.
+
+A cause contributes to its category's counters while it is public: one to
+``cause_count``, one to ``live_cause_count`` while it accepts donations, and
+its ``current_amount`` to ``total_raised``. Writers snapshot the affected
+causes before and after a change and ``apply_cause_changes`` folds the
+difference into the categories with one F() update per category, inside the
+writer's transaction. The "before" snapshot locks the cause rows, so two
+writers on the same cause cannot both compute a delta from the same old
+values. ``rebuild_category_stats`` recomputes everything from the causes
+table for repairs/backfills.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Category
+
+CATALOGUE_CACHE_KEY = 'categories:catalogue'
+
+# Cause fields that feed the category statistics.
+TRACKED_FIELDS = {'status', 'category', 'category_id', 'current_amount'}
+SNAPSHOT_FIELDS = ('pk', 'category_id', 'status', 'current_amount')
+
+
+def snapshot_causes(queryset, lock=False):
+    """
+    The tracked values of the causes in ``queryset``, for apply_cause_changes.
+    With ``lock`` the rows are locked (in pk order) until the caller's
+    transaction ends; take the "before" snapshot that way.
+    """
+    if lock:
+        return list(queryset.select_for_update(of=('self',)).order_by('pk').values(*SNAPSHOT_FIELDS))
+    return list(queryset.order_by().values(*SNAPSHOT_FIELDS))
+
+
+def _contributions(rows):
+    from causes.models import Causes
+
+    totals = defaultdict(lambda: [0, 0, Decimal('0')])
+    for row in rows:
+        if row['status'] in Causes.HIDDEN_STATUSES:
+            continue
+        category = totals[row['category_id']]
+        category[0] += 1
+        category[1] += 1 if row['status'] in Causes.LIVE_STATUSES else 0
+        category[2] += Decimal(row['current_amount'] or 0)
+    return totals
+
+
+def apply_cause_changes(before, after):
+    """
+    Fold the difference between two cause snapshots into the category
+    counters. Returns the ids of the categories that changed.
+    """
+    old, new = _contributions(before), _contributions(after)
+    changed = []
+    for category_id in old.keys() | new.keys():
+        count, live, raised = (n - o for n, o in zip(new.get(category_id, (0, 0, 0)), old.get(category_id, (0, 0, 0))))
+        if not (count or live or raised):
+            continue
+        Category.objects.filter(pk=category_id).update(
+            cause_count=F('cause_count') + count,
+            live_cause_count=F('live_cause_count') + live,
+            total_raised=F('total_raised') + raised,
+        )
+        changed.append(category_id)
+
+    if changed:
+        invalidate_catalogue_cache()
+    return changed
+
+
+def rebuild_category_stats(queryset=None):
+    """Recompute the statistics columns from the causes table. Returns rows updated."""
+    from causes.models import Causes
+
+    if queryset is None:
+        queryset = Category.objects.all()
+
+    public = Causes.objects.filter(category=OuterRef('pk')).exclude(status__in=Causes.HIDDEN_STATUSES) \
+        .order_by().values('category')
+
+    updated = queryset.update(
+        cause_count=Coalesce(Subquery(public.annotate(n=Count('pk')).values('n')), 0),
+        live_cause_count=Coalesce(Subquery(
+            public.annotate(n=Count('pk', filter=Q(status__in=Causes.LIVE_STATUSES))).values('n')
+        ), 0),
+        total_raised=Coalesce(
+            Subquery(public.annotate(total=Sum('current_amount')).values('total')),
+            Value(Decimal('0')),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+    invalidate_catalogue_cache()
+    return updated
+
+
+def invalidate_catalogue_cache():
+    transaction.on_commit(lambda: cache.delete(CATALOGUE_CACHE_KEY))
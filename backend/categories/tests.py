@@ -1,5 +1,11 @@
+import io
 import uuid
-from django.test import TestCase
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -316,4 +322,110 @@ class CategoryPerformanceTestCase(TestCase):
             )
 
         # Verify it's the right type of exception
-        self.assertIn('duplicate key value violates unique constraint', str(context.exception))
\ No newline at end of file
+        self.assertIn('duplicate key value violates unique constraint', str(context.exception))
+
+
+class CategoryStatisticsTestCase(APITestCase):
+    """Test cases for the incrementally maintained category statistics"""
+
+    def setUp(self):
+        from causes.models import Causes
+
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='category-organizer@example.com',
+            password='testpass123',
+        )
+        self.education = Category.objects.create(name='Education', description='Education causes')
+        self.health = Category.objects.create(name='Health', description='Health causes')
+        self.cause = Causes.objects.create(
+            name='School books',
+            category=self.education,
+            organizer_id=self.organizer,
+            target_amount=Decimal('500.00'),
+            current_amount=Decimal('40.00'),
+            status='ongoing',
+        )
+
+    def _stats(self, category):
+        category.refresh_from_db()
+        return category.cause_count, category.live_cause_count, category.total_raised
+
+    def test_counts_follow_status_category_and_amount(self):
+        from causes.models import Causes
+
+        self.assertEqual(self._stats(self.education), (1, 1, Decimal('40.00')))
+
+        self.cause.status = 'completed'
+        self.cause.save()
+        self.assertEqual(self._stats(self.education), (1, 0, Decimal('40.00')))
+
+        Causes.objects.filter(pk=self.cause.pk).update(current_amount=Decimal('65.50'))
+        self.assertEqual(self._stats(self.education), (1, 0, Decimal('65.50')))
+
+        self.cause.refresh_from_db()
+        self.cause.category = self.health
+        self.cause.save()
+        self.assertEqual(self._stats(self.education), (0, 0, Decimal('0.00')))
+        self.assertEqual(self._stats(self.health), (1, 0, Decimal('65.50')))
+
+        Causes.objects.filter(pk=self.cause.pk).update(status='rejected')
+        self.assertEqual(self._stats(self.health), (0, 0, Decimal('0.00')))
+
+    def test_hidden_and_deleted_causes_are_not_counted(self):
+        from causes.models import Causes
+
+        pending = Causes.objects.create(
+            name='Pending review',
+            category=self.education,
+            organizer_id=self.organizer,
+            target_amount=Decimal('100.00'),
+        )
+        self.assertEqual(self._stats(self.education), (1, 1, Decimal('40.00')))
+
+        self.cause.delete()
+        pending.delete()
+        self.assertEqual(self._stats(self.education), (0, 0, Decimal('0.00')))
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_writers_lock_the_cause_before_snapshotting_it(self):
+        from causes.models import Causes
+
+        writes = [
+            lambda: self.cause.save(),
+            lambda: Causes.objects.filter(pk=self.cause.pk).update(status='paused'),
+            lambda: Causes.objects.add_to_totals({self.cause.pk: Decimal('5.00')}),
+        ]
+        for write in writes:
+            with CaptureQueriesContext(connection) as queries:
+                write()
+            snapshots = [query['sql'] for query in queries if query['sql'].startswith('SELECT "causes_causes"."id"')]
+            self.assertIn('FOR UPDATE', snapshots[0])
+
+    def test_rebuild_command_recomputes_from_causes(self):
+        Category.objects.filter(pk=self.education.pk).update(cause_count=7, live_cause_count=7, total_raised=1)
+
+        call_command('rebuild_category_stats', stdout=io.StringIO())
+        self.assertEqual(self._stats(self.education), (1, 1, Decimal('40.00')))
+        self.assertEqual(self._stats(self.health), (0, 0, Decimal('0.00')))
+
+    def test_catalogue_endpoint_is_cached_until_a_cause_changes(self):
+        from causes.models import Causes
+
+        response = self.client.get(reverse('category_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        education = next(item for item in response.data if item['slug'] == 'education')
+        self.assertEqual(education['cause_count'], 1)
+        self.assertEqual(education['live_cause_count'], 1)
+        self.assertEqual(education['total_raised'], '40.00')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('category_list'))
+        self.assertFalse([query for query in queries if 'FROM "categories_category"' in query['sql']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Causes.objects.filter(pk=self.cause.pk).update(status='completed')
+
+        response = self.client.get(reverse('category_list'))
+        education = next(item for item in response.data if item['slug'] == 'education')
+        self.assertEqual(education['live_cause_count'], 0)
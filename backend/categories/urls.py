@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import CategoryListView
+
+urlpatterns = [
+    path('', CategoryListView.as_view(), name='category_list'),
+]
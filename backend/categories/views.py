@@ -1,3 +1,29 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Category
+from .serializers import CategoryCatalogueSerializer
+from .stats import CATALOGUE_CACHE_KEY
+
 
 # Create your views here.
+class CategoryListView(APIView):
+    """
+    Every category with its public, live and raised totals: GET /api/categories/
+
+    The counters are stored on Category (see categories.stats), so building the
+    response is a single small query; it is cached until a category or one of
+    its causes changes.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        data = cache.get(CATALOGUE_CACHE_KEY)
+        if data is None:
+            serializer = CategoryCatalogueSerializer(Category.objects.order_by('name'), many=True)
+            data = list(serializer.data)
+            cache.set(CATALOGUE_CACHE_KEY, data, settings.CATEGORY_CATALOGUE_CACHE_TIMEOUT)
+        return Response(data)
@@ -4,6 +4,7 @@ Enhanced Admin Dashboard Views with Charts and Analytics
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
 from django.db.models import Count, Sum, Avg
+from django.db.models.functions import TruncDate, TruncMonth
 from django.utils import timezone
 from datetime import timedelta, datetime
 from django.http import JsonResponse
@@ -20,7 +21,8 @@ def custom_admin_dashboard(request):
     # Import models here to avoid circular imports
     from users_n_auth.models import User
     from causes.models import Causes
-    from donations.models import Donation
+    from causes.trending import trending_causes
+    from donations.models import DailyDonationRollup, Donation
     from categories.models import Category
     from payments.models import PaymentTransaction
     from withdrawal_transfer.models import WithdrawalRequest
@@ -54,14 +56,16 @@ def custom_admin_dashboard(request):
         'completed': Causes.objects.filter(status='completed').count(),
     }
     
-    # Donation analytics
-    donation_stats = Donation.objects.filter(status='completed').aggregate(
-        total_count=Count('id'),
+    # Donation analytics, summed from the daily rollups of completed donations
+    donation_stats = DailyDonationRollup.objects.filter(status='completed').aggregate(
+        total_count=Sum('donation_count'),
         total_amount=Sum('amount')
     )
-    if donation_stats['total_count'] > 0:
+    if donation_stats['total_count']:
         donation_stats['avg_amount'] = donation_stats['total_amount'] / donation_stats['total_count']
     else:
+        donation_stats['total_count'] = 0
+        donation_stats['total_amount'] = 0
         donation_stats['avg_amount'] = 0
     
     # Recent activity
@@ -72,9 +76,9 @@ def custom_admin_dashboard(request):
     }
     
     # Top performers
-    top_causes = Causes.objects.annotate(
-        donation_count=Count('donation')
-    ).order_by('-donation_count')[:5]
+    # Ranked by the refresh_trending_causes beat task; all-time donation count
+    # until it has run.
+    top_causes = list(trending_causes()[:5]) or Causes.objects.order_by('-donation_count')[:5]
     
     top_donors = User.objects.annotate(
         donation_count=Count('donation')
@@ -99,20 +103,20 @@ def donation_chart_data(request):
     """
     API endpoint for donation chart data
     """
-    from donations.models import Donation
+    from donations.models import DailyDonationRollup
     
     # Get last 6 months of data
     six_months_ago = timezone.now() - timedelta(days=180)
     
-    # Group donations by month
-    donations_by_month = Donation.objects.filter(
+    # Group the daily donation rollups by month
+    donations_by_month = DailyDonationRollup.objects.filter(
         status='completed',
-        donated_at__gte=six_months_ago
-    ).extra(
-        select={'month': "DATE_TRUNC('month', donated_at)"}
+        day__gte=six_months_ago.date()
+    ).annotate(
+        month=TruncMonth('day')
     ).values('month').annotate(
         total_amount=Sum('amount'),
-        count=Count('id')
+        count=Sum('donation_count')
     ).order_by('month')
     
     # Format data for Chart.js
@@ -140,12 +144,9 @@ def cause_progress_data(request):
     """
     from causes.models import Causes
     
-    causes = Causes.objects.annotate(
-        donation_count=Count('donation'),
-        total_donated=Sum('donation__amount')
-    ).filter(
+    causes = Causes.objects.filter(
         donation_count__gt=0
-    ).order_by('-total_donated')[:10]
+    ).only('name', 'target_amount', 'current_amount', 'donation_count').order_by('-current_amount')[:10]
     
     data = []
     for cause in causes:
@@ -167,27 +168,25 @@ def user_activity_data(request):
     API endpoint for user activity data
     """
     from users_n_auth.models import User
-    from donations.models import Donation
+    from donations.models import DailyDonationRollup
     
     # Get user registrations by day for last 30 days
     thirty_days_ago = timezone.now() - timedelta(days=30)
     
     user_registrations = User.objects.filter(
         date_joined__gte=thirty_days_ago
-    ).extra(
-        select={'day': "DATE_TRUNC('day', date_joined)"}
+    ).annotate(
+        day=TruncDate('date_joined')
     ).values('day').annotate(
         count=Count('id')
     ).order_by('day')
     
-    # Get donation activity by day for last 30 days
-    donation_activity = Donation.objects.filter(
-        donated_at__gte=thirty_days_ago,
+    # Get donation activity by day for last 30 days, from the daily rollups
+    donation_activity = DailyDonationRollup.objects.filter(
+        day__gte=thirty_days_ago.date(),
         status='completed'
-    ).extra(
-        select={'day': "DATE_TRUNC('day', donated_at)"}
     ).values('day').annotate(
-        count=Count('id'),
+        count=Sum('donation_count'),
         amount=Sum('amount')
     ).order_by('day')
     
@@ -206,9 +205,9 @@ def user_activity_data(request):
         labels.append(current_date.strftime('%b %d'))
         
         # Find matching data
-        reg_count = next((item['count'] for item in user_registrations if item['day'].date() == current_date), 0)
-        don_count = next((item['count'] for item in donation_activity if item['day'].date() == current_date), 0)
-        don_amount = next((float(item['amount'] or 0) for item in donation_activity if item['day'].date() == current_date), 0)
+        reg_count = next((item['count'] for item in user_registrations if item['day'] == current_date), 0)
+        don_count = next((item['count'] for item in donation_activity if item['day'] == current_date), 0)
+        don_amount = next((float(item['amount'] or 0) for item in donation_activity if item['day'] == current_date), 0)
         
         registrations.append(reg_count)
         donations.append(don_count)
@@ -0,0 +1,182 @@
+"""
+Keyset (cursor) pagination shared by the listing endpoints.
+
+Pages are addressed by an opaque cursor holding the (timestamp, id) of the
+row at the edge of the previous page. Every page is an indexed range scan of
+``page_size + 1`` rows, so page 500 costs the same as page 1 and no COUNT(*)
+is ever issued. Listings that want a total for display can ask for the query
+planner's row estimate with ``?estimate_total=1``.
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimated_count(queryset):
+    """
+    The query planner's estimate of the rows in ``queryset``, without running
+    it. Only PostgreSQL reports one; on other databases this returns None.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Paginate on ``(ordering_field, pk)``.
+
+    ``ordering_field`` must be a non-null datetime column; the primary key
+    breaks ties so rows sharing a timestamp are never skipped or repeated.
+    Clients may pass ``?ordering=<field>`` or ``?ordering=-<field>``; any
+    other value is refused with a 400, and no ``?ordering`` means
+    ``default_ordering``. With ``?estimate_total=1`` the response also carries
+    ``total_estimate`` (see estimated_count).
+    """
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering_field = 'created_at'
+    default_ordering = '-created_at'
+    ordering_query_param = 'ordering'
+    estimate_query_param = 'estimate_total'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        self.cursor = self.decode_cursor(request)
+        self.estimate_total = request.query_params.get(self.estimate_query_param) in ('1', 'true')
+        if self.estimate_total:
+            self.total_estimate = estimated_count(queryset)
+
+        descending = self.ordering.startswith('-')
+        reverse = bool(self.cursor and self.cursor['reverse'])
+        # Walking backwards from a cursor scans in the opposite direction.
+        scan_descending = descending != reverse
+
+        if self.cursor:
+            try:
+                queryset = queryset.filter(self._position_filter(scan_descending))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+
+        if scan_descending:
+            queryset = queryset.order_by(f'-{self.ordering_field}', '-pk')
+        else:
+            queryset = queryset.order_by(self.ordering_field, 'pk')
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.estimate_total:
+            response['total_estimate'] = self.total_estimate
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+                'total_estimate': {'type': 'integer', 'nullable': True},
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_query_param)
+        if not ordering:
+            return self.default_ordering
+        if ordering not in (self.ordering_field, f'-{self.ordering_field}'):
+            raise ParseError(f'Unsupported ordering {ordering!r}; use {self.ordering_field} or -{self.ordering_field}')
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        payload = {
+            'v': getattr(instance, self.ordering_field).isoformat(),
+            'id': str(instance.pk),
+        }
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('ascii')
+        ).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            value = parse_datetime(payload['v'])
+            pk = payload['id']
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return {'value': value, 'pk': pk, 'reverse': bool(payload.get('r'))}
+
+    def _position_filter(self, scan_descending):
+        value, pk = self.cursor['value'], self.cursor['pk']
+        op = 'lt' if scan_descending else 'gt'
+        return (
+            Q(**{f'{self.ordering_field}__{op}': value})
+            | Q(**{self.ordering_field: value, f'pk__{op}': pk})
+        )
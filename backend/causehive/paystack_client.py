@@ -0,0 +1,327 @@
+"""
+Shared HTTP client for the Paystack API.
+
+Every Paystack call goes through one process-wide ``PaystackClient`` (see
+``get_paystack_client``) so that:
+
+* connections are pooled and kept alive on a single ``requests.Session``;
+* each endpoint has its own connect/read timeout (``ENDPOINT_TIMEOUTS``), so a
+  slow Paystack cannot hold a worker indefinitely;
+* idempotent calls are retried a bounded number of times with full-jitter
+  exponential backoff on connection errors, timeouts and 429/5xx responses.
+  Non-idempotent calls are only retried when the connection could not be
+  established, i.e. when the request was never sent;
+* a circuit breaker fails fast with ``CircuitOpenError`` once Paystack has
+  failed ``PAYSTACK_BREAKER_FAILURE_THRESHOLD`` calls in a row, and lets a
+  single probe through after ``PAYSTACK_BREAKER_RESET_SECONDS``.
+
+Errors raised by the client subclass ``requests.RequestException``, so
+existing ``except requests.RequestException`` handlers keep working.
+
+``AsyncPaystackClient`` is the asyncio counterpart used by the async payment
+views. It is built on httpx, follows the same timeout and retry policy, and
+shares the process-wide circuit breaker with the sync client. Its errors are
+httpx exceptions or ``CircuitOpenError``.
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from functools import lru_cache
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+# endpoint -> read timeout in seconds. Calls made while a user waits get short
+# timeouts; transfers run in Celery and may take longer.
+ENDPOINT_TIMEOUTS = {
+    'transaction.initialize': 10.0,
+    'transaction.verify': 8.0,
+    'transfer.recipient': 15.0,
+    'transfer.initiate': 30.0,
+    'transfer.verify': 15.0,
+    'bank.list': 10.0,
+    'bank.resolve': 10.0,
+}
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class PaystackError(requests.RequestException):
+    pass
+
+
+class CircuitOpenError(PaystackError):
+    """Raised without contacting Paystack while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: calls go through and failures are counted. Open: calls are refused
+    until ``reset_timeout`` has passed. Half-open: one probe call is let
+    through; its outcome closes or re-opens the circuit. The state is per
+    process.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self):
+        """Whether a call may go out now. In half-open state only one caller gets True."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._probing = False
+
+    def release_probe(self):
+        """
+        Give up a half-open probe that ended without an outcome (cancelled, or
+        an error that says nothing about Paystack), so the next call can probe.
+        A no-op once the probe's outcome has been recorded.
+        """
+        with self._lock:
+            self._probing = False
+
+
+class BasePaystackClient:
+    """Timeout, retry and circuit-breaker policy shared by the sync and async clients."""
+
+    def __init__(self, base_url, secret_key, *, connect_timeout=3.05, default_read_timeout=10.0,
+                 max_retries=2, backoff=0.25, breaker=None):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {
+            'Authorization': f'Bearer {secret_key}',
+            'Content-Type': 'application/json',
+        }
+        self.connect_timeout = connect_timeout
+        self.default_read_timeout = default_read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+
+    def read_timeout(self, endpoint):
+        return ENDPOINT_TIMEOUTS.get(endpoint, self.default_read_timeout)
+
+    def retry_delay(self, attempt):
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    def start(self, method, endpoint, idempotent):
+        """Normalise the call's method and idempotency, refusing it if the circuit is open."""
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if not self.breaker.allow():
+            raise CircuitOpenError(f'Paystack is unavailable (circuit open), not calling {endpoint}')
+        return method, idempotent
+
+    def should_retry_status(self, status_code, idempotent, attempt):
+        """Whether to retry after a response; records the final outcome with the breaker otherwise."""
+        if status_code not in RETRY_STATUSES:
+            self.breaker.record_success()
+            return False
+        if not idempotent or attempt >= self.max_retries:
+            self.breaker.record_failure()
+            return False
+        return True
+
+    def should_retry_error(self, unsent, transient, idempotent, attempt):
+        """Whether to retry after a transport error; records a failure with the breaker otherwise."""
+        if (unsent or (idempotent and transient)) and attempt < self.max_retries:
+            return True
+        self.breaker.record_failure()
+        return False
+
+
+def request_unsent(exc):
+    """
+    Whether a requests error was raised while connecting, so the request never
+    went out: a connect timeout, or a refused/unresolvable connection
+    (httpx.ConnectTimeout and httpx.ConnectError in the async client).
+    """
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    if not isinstance(exc, requests.ConnectionError) or isinstance(exc, requests.ReadTimeout):
+        return False
+    reason = getattr(exc.args[0], 'reason', None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class PaystackClient(BasePaystackClient):
+    def __init__(self, base_url, secret_key, *, pool_size=10, sleep=time.sleep, **kwargs):
+        super().__init__(base_url, secret_key, **kwargs)
+        self.sleep = sleep
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(self.headers)
+
+    def timeout(self, endpoint):
+        return self.connect_timeout, self.read_timeout(endpoint)
+
+    def request(self, method, path, *, endpoint, idempotent=None, **kwargs):
+        """
+        Send a request to ``path`` (relative to the base URL) and return the
+        ``requests.Response``. ``endpoint`` selects the timeout; ``idempotent``
+        defaults to whether ``method`` is safe to repeat.
+        """
+        method, idempotent = self.start(method, endpoint, idempotent)
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = self.session.request(method, url, timeout=self.timeout(endpoint), **kwargs)
+                except requests.RequestException as exc:
+                    unsent = request_unsent(exc)
+                    transient = isinstance(exc, (requests.ConnectionError, requests.Timeout))
+                    if not self.should_retry_error(unsent, transient, idempotent, attempt):
+                        raise
+                else:
+                    if not self.should_retry_status(response.status_code, idempotent, attempt):
+                        return response
+                self.sleep(self.retry_delay(attempt))
+                attempt += 1
+        except BaseException:
+            # Interrupted, or failed in a way the breaker has not recorded
+            self.breaker.release_probe()
+            raise
+
+    def get(self, path, *, endpoint, **kwargs):
+        return self.request('GET', path, endpoint=endpoint, **kwargs)
+
+    def post(self, path, *, endpoint, **kwargs):
+        return self.request('POST', path, endpoint=endpoint, **kwargs)
+
+
+class AsyncPaystackClient(BasePaystackClient):
+    def __init__(self, base_url, secret_key, *, pool_size=10, sleep=asyncio.sleep, transport=None, **kwargs):
+        super().__init__(base_url, secret_key, **kwargs)
+        self.sleep = sleep
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=transport,
+        )
+
+    def timeout(self, endpoint):
+        return httpx.Timeout(self.read_timeout(endpoint), connect=self.connect_timeout)
+
+    async def request(self, method, path, *, endpoint, idempotent=None, **kwargs):
+        """Async counterpart of PaystackClient.request; returns an ``httpx.Response``."""
+        method, idempotent = self.start(method, endpoint, idempotent)
+        url = f"/{path.lstrip('/')}"
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = await self.client.request(method, url, timeout=self.timeout(endpoint), **kwargs)
+                except httpx.TransportError as exc:
+                    unsent = isinstance(exc, (httpx.ConnectTimeout, httpx.ConnectError))
+                    transient = isinstance(exc, (httpx.TimeoutException, httpx.NetworkError))
+                    if not self.should_retry_error(unsent, transient, idempotent, attempt):
+                        raise
+                else:
+                    if not self.should_retry_status(response.status_code, idempotent, attempt):
+                        return response
+                await self.sleep(self.retry_delay(attempt))
+                attempt += 1
+        except BaseException:
+            # Cancelled, or failed in a way the breaker has not recorded
+            self.breaker.release_probe()
+            raise
+
+    async def get(self, path, *, endpoint, **kwargs):
+        return await self.request('GET', path, endpoint=endpoint, **kwargs)
+
+    async def post(self, path, *, endpoint, **kwargs):
+        return await self.request('POST', path, endpoint=endpoint, **kwargs)
+
+
+def _client_options():
+    return {
+        'connect_timeout': settings.PAYSTACK_CONNECT_TIMEOUT,
+        'default_read_timeout': settings.PAYSTACK_READ_TIMEOUT,
+        'max_retries': settings.PAYSTACK_MAX_RETRIES,
+        'backoff': settings.PAYSTACK_RETRY_BACKOFF,
+        'pool_size': settings.PAYSTACK_POOL_SIZE,
+        'breaker': get_paystack_breaker(),
+    }
+
+
+@lru_cache(maxsize=None)
+def get_paystack_breaker():
+    """The process-wide circuit breaker shared by the sync and async clients."""
+    return CircuitBreaker(
+        failure_threshold=settings.PAYSTACK_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.PAYSTACK_BREAKER_RESET_SECONDS,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_paystack_client():
+    """The process-wide Paystack client."""
+    return PaystackClient(settings.PAYSTACK_BASE_URL, settings.PAYSTACK_SECRET_KEY, **_client_options())
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_paystack_client():
+    """
+    The async Paystack client for the running event loop. httpx connections
+    belong to the loop that opened them, so each loop gets its own pool; under
+    an ASGI server that is one client per process.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncPaystackClient(
+            settings.PAYSTACK_BASE_URL, settings.PAYSTACK_SECRET_KEY, **_client_options()
+        )
+    return client
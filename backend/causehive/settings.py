@@ -87,6 +87,14 @@ else:
     }
     SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 
+# Cause list/detail responses are invalidated on write (see causes/cache.py),
+# so they can stay cached far longer than the 5 minute default.
+CAUSE_RESPONSE_CACHE_TIMEOUT = env.int('CAUSE_RESPONSE_CACHE_TIMEOUT', default=60 * 60 * 6)
+# Upper bound on staleness of the category catalogue; writes also clear it.
+CATEGORY_CATALOGUE_CACHE_TIMEOUT = env.int('CATEGORY_CATALOGUE_CACHE_TIMEOUT', default=60 * 10)
+# Upper bound on staleness of a donor's cached statistics; completions also clear them.
+DONOR_SUMMARY_CACHE_TIMEOUT = env.int('DONOR_SUMMARY_CACHE_TIMEOUT', default=60 * 60)
+
 # # Service URLs for microservice communication
 # CAUSE_SERVICE_URL = env('CAUSE_SERVICE_URL', default='http://localhost:8001')
 
@@ -94,6 +102,21 @@ else:
 PAYSTACK_BASE_URL = env('PAYSTACK_BASE_URL', default='https://api.paystack.co')
 PAYSTACK_SECRET_KEY = env('PAYSTACK_SECRET_KEY')
 
+# Paystack HTTP client (see causehive/paystack_client.py)
+PAYSTACK_CONNECT_TIMEOUT = env.float('PAYSTACK_CONNECT_TIMEOUT', default=3.05)
+PAYSTACK_READ_TIMEOUT = env.float('PAYSTACK_READ_TIMEOUT', default=10.0)
+PAYSTACK_MAX_RETRIES = env.int('PAYSTACK_MAX_RETRIES', default=2)
+PAYSTACK_RETRY_BACKOFF = env.float('PAYSTACK_RETRY_BACKOFF', default=0.25)
+PAYSTACK_POOL_SIZE = env.int('PAYSTACK_POOL_SIZE', default=10)
+PAYSTACK_BREAKER_FAILURE_THRESHOLD = env.int('PAYSTACK_BREAKER_FAILURE_THRESHOLD', default=5)
+PAYSTACK_BREAKER_RESET_SECONDS = env.float('PAYSTACK_BREAKER_RESET_SECONDS', default=30.0)
+
+# Route checkout, donate, payment initiation and verification to their async
+# views, which await Paystack instead of blocking a worker. Enable when serving
+# through ASGI (daphne/uvicorn); under WSGI each async request gets its own
+# event loop and loses connection reuse.
+PAYMENT_VIEWS_ASYNC = env.bool('PAYMENT_VIEWS_ASYNC', default=False)
+
 # User and authentication settings
 AUTH_USER_MODEL = 'users_n_auth.User'
 
@@ -250,8 +273,8 @@ REST_FRAMEWORK = {
         'rest_framework.throttling.UserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '5/minute',
-        'user': '10/minute',
+        'anon': env('THROTTLE_ANON_RATE', default='5/minute'),
+        'user': env('THROTTLE_USER_RATE', default='10/minute'),
         'admin_action': '20/minute',
         'password_reset': '3/hour',
     },
@@ -319,14 +342,72 @@ else:
     CELERY_TASK_ALWAYS_EAGER = False
     CELERY_TASK_EAGER_PROPAGATES = True
 
+# Redis Streams carrying domain events (see causehive/streams.py)
+EVENT_STREAM_MAXLEN = env.int('EVENT_STREAM_MAXLEN', default=100_000)
+DONATION_EVENTS_STREAM = env('DONATION_EVENTS_STREAM', default='donation_events')
+DONATION_EVENTS_GROUP = env('DONATION_EVENTS_GROUP', default='cause-totals')
+# Applied donation event keys are kept this long, and for as long as their
+# stream entry is still in the stream (see causes/donation_events.py).
+DONATION_EVENT_KEY_RETENTION_DAYS = env.int('DONATION_EVENT_KEY_RETENTION_DAYS', default=7)
+
+# Transactional outbox relay (see donations/outbox.py)
+OUTBOX_RELAY_BATCH_SIZE = env.int('OUTBOX_RELAY_BATCH_SIZE', default=500)
+OUTBOX_RELAY_MAX_BATCHES = env.int('OUTBOX_RELAY_MAX_BATCHES', default=20)
+OUTBOX_RETENTION_DAYS = env.int('OUTBOX_RETENTION_DAYS', default=7)
+
+# Paystack webhook inbox (see payments/webhooks.py)
+WEBHOOK_BATCH_SIZE = env.int('WEBHOOK_BATCH_SIZE', default=100)
+WEBHOOK_MAX_BATCHES = env.int('WEBHOOK_MAX_BATCHES', default=20)
+WEBHOOK_MAX_ATTEMPTS = env.int('WEBHOOK_MAX_ATTEMPTS', default=5)
+WEBHOOK_RETENTION_DAYS = env.int('WEBHOOK_RETENTION_DAYS', default=30)
+
+# Reconciliation of stale pending payments (see payments/reconciliation.py)
+PAYMENT_RECONCILE_AFTER_MINUTES = env.int('PAYMENT_RECONCILE_AFTER_MINUTES', default=30)
+PAYMENT_RECONCILE_CHUNK_SIZE = env.int('PAYMENT_RECONCILE_CHUNK_SIZE', default=100)
+PAYMENT_RECONCILE_CONCURRENCY = env.int('PAYMENT_RECONCILE_CONCURRENCY', default=5)
+PAYMENT_RECONCILE_LIMIT = env.int('PAYMENT_RECONCILE_LIMIT', default=5000)
+
 # Celery beat schedule
 CELERY_BEAT_SCHEDULE = {
     'verify-pending-withdrawals': {
         'task': 'withdrawal_transfer.tasks.verify_pending_withdrawals',
         'schedule': 60.0,  # Run every 60 seconds
     },
+    'refresh-trending-causes': {
+        'task': 'causes.tasks.refresh_trending_causes',
+        'schedule': env.float('TRENDING_REFRESH_SECONDS', default=300.0),
+    },
+    'relay-outbox-events': {
+        'task': 'donations.tasks.relay_outbox_events',
+        'schedule': env.float('OUTBOX_RELAY_SECONDS', default=2.0),
+    },
+    'prune-outbox-events': {
+        'task': 'donations.tasks.prune_outbox_events',
+        'schedule': 60 * 60.0,
+    },
+    'process-paystack-webhooks': {
+        'task': 'payments.tasks.process_paystack_webhooks',
+        'schedule': env.float('WEBHOOK_PROCESS_SECONDS', default=2.0),
+    },
+    'prune-webhook-events': {
+        'task': 'payments.tasks.prune_webhook_events',
+        'schedule': 60 * 60.0,
+    },
+    'prune-applied-donation-events': {
+        'task': 'causes.tasks.prune_applied_donation_events',
+        'schedule': 60 * 60.0,
+    },
+    'reconcile-pending-payments': {
+        'task': 'payments.tasks.reconcile_pending_payments',
+        'schedule': env.float('PAYMENT_RECONCILE_SECONDS', default=10 * 60.0),
+    },
 }
 
+# Trending causes: donations older than the window are ignored and a donation's
+# weight halves every TRENDING_HALF_LIFE_HOURS.
+TRENDING_WINDOW_HOURS = env.int('TRENDING_WINDOW_HOURS', default=24 * 7)
+TRENDING_HALF_LIFE_HOURS = env.float('TRENDING_HALF_LIFE_HOURS', default=24.0)
+
 # Paystack Configuration (for donations)
 PAYSTACK_PUBLIC_KEY = env('PAYSTACK_PUBLIC_KEY', default='')
 
@@ -0,0 +1,100 @@
+"""
+Durable event streams on Redis Streams.
+
+Producers append with ``publish``; consumers read through a consumer group
+(``StreamConsumer``) so every entry is delivered to one consumer of the
+group, stays pending until it is acknowledged, and can be reclaimed from a
+consumer that died before acknowledging it. Entries are retained (capped at
+``EVENT_STREAM_MAXLEN``), so a consumer that was down simply catches up.
+"""
+import json
+import os
+import socket
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def _connection_pool():
+    return redis.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=int(settings.REDIS_PORT),
+        db=0,
+        decode_responses=True,
+        socket_connect_timeout=5,
+        health_check_interval=30,
+    )
+
+
+def get_redis():
+    """A Redis client sharing the process-wide connection pool."""
+    return redis.Redis(connection_pool=_connection_pool())
+
+
+def publish(stream, event, client=None):
+    """Append ``event`` (a JSON-serialisable dict) to ``stream``. Returns the entry id."""
+    client = client or get_redis()
+    return client.xadd(
+        stream,
+        {'event': json.dumps(event)},
+        maxlen=settings.EVENT_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+def default_consumer_name():
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+class StreamConsumer:
+    """One named consumer within a consumer group of a stream."""
+
+    def __init__(self, stream, group, consumer=None, client=None):
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or default_consumer_name()
+        self.client = client or get_redis()
+
+    def ensure_group(self, start_id='0'):
+        """Create the group (and the stream) if needed; new groups start at ``start_id``."""
+        try:
+            self.client.xgroup_create(self.stream, self.group, id=start_id, mkstream=True)
+        except redis.ResponseError as exc:
+            if 'BUSYGROUP' not in str(exc):
+                raise
+
+    def replay_from(self, entry_id):
+        """Move the group's cursor so entries after ``entry_id`` are delivered again."""
+        self.client.xgroup_setid(self.stream, self.group, entry_id)
+
+    def read(self, count, block_ms):
+        """Up to ``count`` entries never delivered to the group, blocking at most ``block_ms``."""
+        response = self.client.xreadgroup(
+            self.group, self.consumer, {self.stream: '>'}, count=count, block=block_ms,
+        )
+        return [entry for _, entries in response or [] for entry in entries]
+
+    def reclaim(self, min_idle_ms, count):
+        """
+        Take over up to ``count`` entries that another consumer received but
+        has not acknowledged for ``min_idle_ms``.
+        """
+        response = self.client.xautoclaim(
+            self.stream, self.group, self.consumer, min_idle_ms, start_id='0-0', count=count,
+        )
+        return [entry for entry in response[1] if entry[1] is not None]
+
+    def ack(self, entry_ids):
+        if entry_ids:
+            self.client.xack(self.stream, self.group, *entry_ids)
+
+    @staticmethod
+    def decode(entry):
+        """``(entry_id, event)`` for a raw entry; ``event`` is None if it can't be decoded."""
+        entry_id, fields = entry
+        try:
+            return entry_id, json.loads(fields['event'])
+        except (KeyError, TypeError, ValueError):
+            return entry_id, None
@@ -69,6 +69,10 @@ urlpatterns = [
     # Django admin
     path('admin/', admin.site.urls),
     
+    # Payment endpoints come before the router, whose payments/<pk>/ route
+    # would otherwise swallow payments/webhook/ and payments/initiate/
+    path('api/payments/', include('payments.urls')),
+
     # API endpoints
     path('api/', include(router.urls)),
     
@@ -78,13 +82,13 @@ urlpatterns = [
     
     # Cause service endpoints
     path('api/causes/', include('causes.urls')),
+    path('api/categories/', include('categories.urls')),
 
     # Notifications service endpoints
     path('api/notifications/', include('notifications.urls')),
     
     # Donation processing service endpoints
     path('api/donations/', include('donations.urls')),
-    path('api/payments/', include('payments.urls')),
     path('api/cart/', include('cart.urls')),
     path('api/withdrawals/', include('withdrawal_transfer.urls')),
     
@@ -20,7 +20,7 @@ class CausesAdmin(admin.ModelAdmin):
     list_filter = ('status', 'category', 'created_at', 'organizer_id')
     search_fields = ('name', 'description', 'organizer_id__email', 'organizer_id__first_name', 'organizer_id__last_name')
     list_editable = ('status',)
-    readonly_fields = ('id', 'slug', 'created_at', 'current_amount', 'progress_percentage', 'donation_count')
+    readonly_fields = ('id', 'slug', 'created_at', 'updated_at', 'current_amount', 'progress_percentage', 'donation_count', 'donor_count', 'last_donation_at')
     ordering = ('-created_at',)
     list_per_page = 25
     
@@ -73,11 +73,6 @@ class CausesAdmin(admin.ModelAdmin):
         return "N/A"
     progress_percentage.short_description = "Progress %"
     
-    def donation_count(self, obj):
-        return obj.donation_set.count()
-    donation_count.short_description = "Donations"
-    donation_count.admin_order_field = 'donation__count'
-    
     def approve_causes(self, request, queryset):
         causes_to_approve = queryset.filter(status__in=['under_review', 'rejected'])
 
@@ -155,7 +150,7 @@ class CausesAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         """Optimize queryset for better performance"""
-        return super().get_queryset(request).select_related('category', 'organizer_id').prefetch_related('donation_set')
+        return super().get_queryset(request).select_related('category', 'organizer_id')
     
     def changelist_view(self, request, extra_context=None):
         """Add extra context for the changelist view"""
@@ -181,13 +176,13 @@ class CausesAdmin(admin.ModelAdmin):
             'fields': ('name', 'category', 'description', 'organizer_id')
         }),
         ('Financial Details', {
-            'fields': ('target_amount', 'current_amount', 'progress_percentage', 'donation_count')
+            'fields': ('target_amount', 'current_amount', 'progress_percentage', 'donation_count', 'donor_count', 'last_donation_at')
         }),
         ('Status & Media', {
             'fields': ('status', 'cover_image', 'rejection_reason')
         }),
         ('System Fields', {
-            'fields': ('id', 'slug', 'created_at'),
+            'fields': ('id', 'slug', 'created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
@@ -202,4 +197,4 @@ class CausesAdmin(admin.ModelAdmin):
     cover_image_thumbnail.short_description = "Cover Image"
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('organizer_id', 'category').prefetch_related('donation_set')
+        return super().get_queryset(request).select_related('organizer_id', 'category')
@@ -0,0 +1,134 @@
+"""
+Generation-tagged response caching for the public cause endpoints.
+
+Cached responses live under a key prefix that embeds a generation counter.
+Bumping the counter moves readers onto a fresh namespace, so stale entries are
+never served and simply age out of the cache. The list namespace is shared by
+every cause; each cause also has its own detail namespace, so a donation to one
+cause leaves every other cached detail page warm.
+
+The responses are cached server-side only: a bump cannot reach browsers or
+CDNs, so clients are told to revalidate every time (cheaply, by ETag).
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import parse_http_date_safe, quote_etag
+from django.views.decorators.cache import cache_page
+
+LIST_GENERATION_KEY = 'causes:generation:list'
+DETAIL_GENERATION_KEY = 'causes:generation:detail:{}'
+
+
+def _get_generation(key):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, timeout=None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def _bump_generation(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key expired or was never read: any fresh value starts a new namespace.
+        cache.set(key, 2, timeout=None)
+
+
+def list_key_prefix():
+    return f'causes.list.{_get_generation(LIST_GENERATION_KEY)}'
+
+
+def detail_key_prefix(cause_id):
+    key = DETAIL_GENERATION_KEY.format(cause_id)
+    return f'causes.detail.{cause_id}.{_get_generation(key)}'
+
+
+def invalidate_cause_cache(*cause_ids):
+    """
+    Retire cached list responses and the detail responses of ``cause_ids``.
+
+    When called inside a transaction the bump waits for the commit, so a
+    concurrent reader can't re-cache the pre-commit row under the new namespace.
+    """
+    def bump():
+        _bump_generation(LIST_GENERATION_KEY)
+        for cause_id in cause_ids:
+            _bump_generation(DETAIL_GENERATION_KEY.format(cause_id))
+
+    transaction.on_commit(bump)
+
+
+def _revalidate_downstream(response):
+    # cache_page advertises its own timeout (max-age and Expires); drop it so
+    # downstream caches check back instead of serving stale totals.
+    if response.has_header('Expires'):
+        del response['Expires']
+    patch_cache_control(response, no_cache=True, max_age=0)
+    return response
+
+
+def cache_cause_list(view_func):
+    """Cache a list view under the current list generation."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        cached_view = cache_page(settings.CAUSE_RESPONSE_CACHE_TIMEOUT, key_prefix=list_key_prefix())(view_func)
+        return _revalidate_downstream(cached_view(request, *args, **kwargs))
+    return wrapper
+
+
+def cache_cause_detail(view_func):
+    """Cache a detail view under the generation of the cause in ``kwargs['id']``."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        prefix = detail_key_prefix(kwargs.get('id'))
+        cached_view = cache_page(settings.CAUSE_RESPONSE_CACHE_TIMEOUT, key_prefix=prefix)(view_func)
+        return _revalidate_downstream(cached_view(request, *args, **kwargs))
+    return wrapper
+
+
+def conditional_response(view_func):
+    """
+    Answer If-None-Match / If-Modified-Since from the validators of a response
+    served by cache_page. Apply it outside the response cache; fresh responses
+    have already been checked by the view.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD') or not getattr(response, 'is_rendered', True):
+            return response
+        last_modified = response.get('Last-Modified')
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=last_modified and parse_http_date_safe(last_modified),
+            response=response,
+        )
+    return wrapper
+
+
+def cause_validators(causes, *variant):
+    """
+    Return a strong ETag and a Last-Modified timestamp for a response built
+    from ``causes``.
+
+    Every cause write bumps ``updated_at``, so the (id, updated_at) pairs
+    identify the rendered data. ``variant`` holds whatever else shapes the
+    body (query string, media type, pagination links).
+    """
+    digest = hashlib.sha1()
+    for part in variant:
+        digest.update(f'{part}\n'.encode('utf-8'))
+    last_modified = None
+    for cause in causes:
+        digest.update(f'{cause.pk}:{cause.updated_at.isoformat()}\n'.encode('utf-8'))
+        if last_modified is None or cause.updated_at > last_modified:
+            last_modified = cause.updated_at
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return quote_etag(digest.hexdigest()), timestamp
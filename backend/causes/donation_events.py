@@ -0,0 +1,115 @@
+"""
+Applying donation.completed events to cause totals.
+
+Events are written to the transactional outbox (donations/outbox.py), relayed
+to the DONATION_EVENTS_STREAM Redis stream and consumed by
+``manage.py consume_donation_events`` through a consumer group.
+
+Events are applied in batches: amounts are summed per cause in memory and
+each cause then receives a single F()-based UPDATE (see
+CausesQuerySet.add_to_totals), so the cost of a batch grows with the number
+of distinct causes in it rather than with the number of events.
+
+Applied event keys are pruned once their entries can no longer be
+delivered: ``prune_applied_events`` drops keys applied before the oldest
+entry left in the (MAXLEN-capped) stream and before the retention period.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from causehive.streams import get_redis
+from donations.outbox import DONATION_COMPLETED
+
+from .models import AppliedDonationEvent, Causes
+
+logger = logging.getLogger(__name__)
+
+
+def aggregate_donation_events(events):
+    """Sum the amounts of donation.completed ``events`` per cause id, skipping malformed ones."""
+    totals = defaultdict(Decimal)
+    for event in events:
+        if event.get('event') != DONATION_COMPLETED:
+            continue
+        data = event.get('data') or {}
+        try:
+            cause_id = uuid.UUID(str(data['cause_id']))
+            amount = Decimal(str(data['amount']))
+        except (KeyError, ValueError, InvalidOperation):
+            logger.warning('Skipping malformed donation event: %r', event)
+            continue
+        totals[cause_id] += amount
+    return dict(totals)
+
+
+def apply_donation_events(events):
+    """
+    Apply a batch of decoded events in one transaction.
+
+    Returns ``(updated, missing)``: the cause ids whose totals changed and
+    those that no longer exist.
+    """
+    totals = aggregate_donation_events(events)
+    if not totals:
+        return [], []
+    updated = Causes.objects.add_to_totals(totals)
+    applied = set(updated)
+    return updated, [cause_id for cause_id in totals if cause_id not in applied]
+
+
+def event_key(entry_id, event):
+    """
+    The deduplication key of a stream entry: the event's own ``id`` when it
+    has one (outbox events keep it when the relay republishes them under a
+    new entry id), else the entry id.
+    """
+    if isinstance(event, dict) and event.get('id'):
+        return str(event['id'])
+    return entry_id
+
+
+def apply_stream_entries(entries):
+    """
+    Apply decoded ``(entry_id, event)`` stream entries exactly once.
+
+    Event keys (see ``event_key``) are recorded in the same transaction as the
+    totals; entries seen before are skipped, so redelivered, replayed or
+    republished entries are harmless. If two consumers race on the same entry,
+    one transaction fails on the primary key and its entries stay
+    unacknowledged for a later retry.
+
+    Returns ``(updated, missing, skipped)``.
+    """
+    keyed = {}
+    for entry_id, event in entries:
+        keyed.setdefault(event_key(entry_id, event), event)
+    with transaction.atomic():
+        seen = set(AppliedDonationEvent.objects.filter(entry_id__in=keyed).values_list('entry_id', flat=True))
+        fresh = {key: event for key, event in keyed.items() if key not in seen}
+        AppliedDonationEvent.objects.bulk_create([AppliedDonationEvent(entry_id=key) for key in fresh])
+        updated, missing = apply_donation_events([event for event in fresh.values() if event is not None])
+    return updated, missing, len(entries) - len(fresh)
+
+
+def prune_applied_events(client=None):
+    """
+    Delete the keys of applied events that can no longer be redelivered:
+    applied more than DONATION_EVENT_KEY_RETENTION_DAYS ago and before the
+    oldest entry still in the stream. Returns the number deleted.
+    """
+    client = client or get_redis()
+    cutoff = timezone.now() - timedelta(days=settings.DONATION_EVENT_KEY_RETENTION_DAYS)
+    oldest = client.xrange(settings.DONATION_EVENTS_STREAM, count=1)
+    if oldest:
+        # Entry ids start with the millisecond timestamp they were added at
+        added_ms = int(oldest[0][0].split('-')[0])
+        cutoff = min(cutoff, datetime.fromtimestamp(added_ms / 1000, tz=dt_timezone.utc))
+    deleted, _ = AppliedDonationEvent.objects.filter(applied_at__lt=cutoff).delete()
+    return deleted
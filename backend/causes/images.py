@@ -0,0 +1,120 @@
+"""
+Resized cover-image derivatives for causes.
+
+Uploads are stored untouched in ``Causes.cover_image``. The
+``generate_cover_image_derivatives`` task then renders fixed-size WebP and
+JPEG copies next to it and records their storage names in
+``Causes.cover_image_derivatives`` together with the source they were cut
+from, so a replaced upload is never served stale derivatives.
+"""
+import hashlib
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# name -> (width, height); images are centre-cropped to exactly this size.
+DERIVATIVE_SIZES = {
+    'thumb': (320, 180),
+    'card': (640, 360),
+    'hero': (1600, 900),
+}
+
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+DERIVATIVE_DIR = 'causes_images/derivatives'
+
+
+def derivative_names(cause, source_name):
+    """Storage names for every derivative of ``source_name``."""
+    digest = hashlib.sha1(source_name.encode('utf-8')).hexdigest()[:12]
+    base = posixpath.join(DERIVATIVE_DIR, str(cause.pk), digest)
+    return {
+        size: {ext: f'{base}/{size}.{ext}' for ext in DERIVATIVE_FORMATS}
+        for size in DERIVATIVE_SIZES
+    }
+
+
+def render_derivative(image, size, image_format, options):
+    """Return the encoded bytes of ``image`` cropped to ``size``, without any metadata."""
+    resized = ImageOps.fit(image, size, method=Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    # A freshly created image carries no EXIF/XMP, and none is passed to save().
+    resized.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def _load_source(field):
+    with field.open('rb') as source:
+        image = Image.open(source)
+        # Let the JPEG decoder downscale while decoding; the largest derivative
+        # still gets at least its full resolution.
+        image.draft('RGB', max(DERIVATIVE_SIZES.values()))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            background = Image.new('RGB', image.size, 'white')
+            rgba = image.convert('RGBA')
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            image = background
+        image.load()
+    return image
+
+
+def generate_cover_derivatives(cause):
+    """
+    Render and store the derivatives of ``cause.cover_image``.
+
+    Returns the mapping to store in ``cover_image_derivatives``, or None when
+    the cause has no cover image.
+    """
+    field = cause.cover_image
+    if not field:
+        return None
+
+    storage = field.storage
+    names = derivative_names(cause, field.name)
+    image = _load_source(field)
+
+    for size, formats in names.items():
+        for ext, name in formats.items():
+            image_format, options = DERIVATIVE_FORMATS[ext]
+            content = render_derivative(image, DERIVATIVE_SIZES[size], image_format, options)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(content))
+
+    return {'source': field.name, **names}
+
+
+def delete_cover_derivatives(storage, derivatives):
+    for size in DERIVATIVE_SIZES:
+        for name in (derivatives or {}).get(size, {}).values():
+            storage.delete(name)
+
+
+def cover_image_urls(cause, build_url):
+    """
+    Derivative URLs for ``cause`` as ``{size: {ext: url}}``.
+
+    Every entry points at the original upload until derivatives of the current
+    upload exist. Returns None when the cause has no cover image.
+    """
+    field = cause.cover_image
+    if not field:
+        return None
+
+    original = build_url(field.url)
+    derivatives = cause.cover_image_derivatives or {}
+    ready = derivatives.get('source') == field.name
+
+    urls = {}
+    for size in DERIVATIVE_SIZES:
+        urls[size] = {
+            ext: build_url(field.storage.url(derivatives[size][ext])) if ready else original
+            for ext in DERIVATIVE_FORMATS
+        }
+    return urls
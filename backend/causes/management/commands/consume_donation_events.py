@@ -1,34 +1,69 @@
+import time
+
 from django.conf import settings
 from django.core.management.base import BaseCommand
-import redis
-import json
-from causes.models import Causes
-from decimal import Decimal
+from django.db import IntegrityError
+
+from causehive.streams import StreamConsumer
+from causes.donation_events import apply_stream_entries
+
 
 class Command(BaseCommand):
     help = 'Consume donation events and updates current_amount in causes'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='Maximum number of events applied per transaction')
+        parser.add_argument('--max-wait', type=float, default=0.5,
+                            help='Seconds to block waiting for events while the stream is idle; a read '
+                                 'returns as soon as any event arrives, with up to --batch-size of them')
+        parser.add_argument('--consumer', default=None,
+                            help='Consumer name within the group (default: <hostname>-<pid>)')
+        parser.add_argument('--reclaim-idle', type=float, default=60.0,
+                            help='Take over entries left unacknowledged by another consumer for this many seconds')
+        parser.add_argument('--replay-from', default=None, metavar='ENTRY_ID',
+                            help="Redeliver every entry after this stream id ('0' for the whole stream); "
+                                 "entries that were already applied are skipped")
+
     def handle(self, *args, **options):
-        r = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0)
-        pubsub = r.pubsub()
-        pubsub.subscribe('donation_events')
-        print("Listening for donation events...")
-
-        for message in pubsub.listen():
-            if message['type'] == 'message':
-                event = json.loads(message['data'])
-                if event.get('event') == 'donation.completed':
-                    data = event['data']
-                    cause_id = data['cause_id']
-                    amount = data['amount']
-                    try:
-                        causes = Causes.objects.get(id=cause_id)
-                        causes.current_amount += Decimal(str(amount))
-
-                        if causes.current_amount >= causes.target_amount:
-                            causes.status = 'completed'
-
-                        causes.save()
-                        print(f"Updated cause {cause_id} by {amount}")
-                    except Causes.DoesNotExist:
-                        print(f"Cause {cause_id} not found")
\ No newline at end of file
+        consumer = StreamConsumer(
+            settings.DONATION_EVENTS_STREAM,
+            settings.DONATION_EVENTS_GROUP,
+            consumer=options['consumer'],
+        )
+        consumer.ensure_group()
+        if options['replay_from']:
+            consumer.replay_from(options['replay_from'])
+            self.stdout.write(f"Replaying donation events after {options['replay_from']}")
+
+        batch_size = options['batch_size']
+        reclaim_idle_ms = int(options['reclaim_idle'] * 1000)
+        self.stdout.write(f"Listening for donation events as {consumer.consumer}...")
+
+        next_reclaim = 0
+        while True:
+            if time.monotonic() >= next_reclaim:
+                self.process(consumer, consumer.reclaim(reclaim_idle_ms, batch_size))
+                next_reclaim = time.monotonic() + options['reclaim_idle'] / 2
+            self.process(consumer, consumer.read(batch_size, int(options['max_wait'] * 1000)))
+
+    def process(self, consumer, raw_entries):
+        if not raw_entries:
+            return
+        entries = [consumer.decode(entry) for entry in raw_entries]
+        for entry_id, event in entries:
+            if event is None:
+                self.stderr.write(f"Skipping undecodable event {entry_id}")
+
+        try:
+            updated, missing, skipped = apply_stream_entries(entries)
+        except IntegrityError:
+            # Another consumer applied some of these first; leave them pending
+            # and let the next reclaim sort out which are still outstanding.
+            self.stderr.write(f"Batch of {len(entries)} events raced another consumer; will retry")
+            return
+
+        consumer.ack([entry_id for entry_id, _ in entries])
+        self.stdout.write(f"Applied {len(entries) - skipped} events to {len(updated)} causes ({skipped} duplicates)")
+        for cause_id in missing:
+            self.stdout.write(f"Cause {cause_id} not found")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from causes.models import Causes
+from causes.stats import rebuild_cause_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild donation_count, donor_count and last_donation_at on causes from completed donations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cause', action='append', dest='cause_ids', default=[],
+                            help='Only rebuild the given cause id (repeatable)')
+
+    def handle(self, *args, **options):
+        queryset = Causes.objects.all()
+        if options['cause_ids']:
+            queryset = queryset.filter(id__in=options['cause_ids'])
+
+        updated = rebuild_cause_stats(queryset)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {updated} causes'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from causes.models import Causes
+from causes.tasks import generate_cover_image_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or outdated cover image derivatives for causes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cause', action='append', dest='cause_ids', default=[],
+                            help='Only process the given cause id (repeatable)')
+        parser.add_argument('--queue', action='store_true',
+                            help='Queue a Celery task per cause instead of rendering inline')
+
+    def handle(self, *args, **options):
+        queryset = Causes.objects.exclude(cover_image='').exclude(cover_image__isnull=True)
+        if options['cause_ids']:
+            queryset = queryset.filter(id__in=options['cause_ids'])
+
+        processed = 0
+        for cause_id in queryset.values_list('id', flat=True).iterator():
+            if options['queue']:
+                generate_cover_image_derivatives.delay(cause_id)
+            else:
+                generate_cover_image_derivatives(cause_id)
+            processed += 1
+
+        action = 'Queued' if options['queue'] else 'Processed'
+        self.stdout.write(self.style.SUCCESS(f'{action} cover images for {processed} causes'))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('causes', '0004_alter_causes_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='causes',
+            index=models.Index(fields=['created_at', 'id'], name='causes_caus_created_278053_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='causes',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='causes_caus_categor_49f647_idx'),
+        ),
+    ]
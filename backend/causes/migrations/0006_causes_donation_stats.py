@@ -0,0 +1,56 @@
+from django.db import migrations, models
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.utils.timezone
+
+
+def copy_created_at(apps, schema_editor):
+    Causes = apps.get_model('causes', 'Causes')
+    Causes.objects.update(updated_at=F('created_at'))
+
+
+def backfill_donation_stats(apps, schema_editor):
+    Causes = apps.get_model('causes', 'Causes')
+    Donation = apps.get_model('donations', 'Donation')
+
+    completed = Donation.objects.filter(cause_id=OuterRef('pk'), status='completed') \
+        .order_by().values('cause_id')
+    Causes.objects.update(
+        donation_count=Coalesce(Subquery(completed.annotate(n=Count('pk')).values('n')), 0),
+        donor_count=Coalesce(Subquery(completed.annotate(n=Count('user_id', distinct=True)).values('n')), 0),
+        last_donation_at=Subquery(completed.annotate(last=Max('donated_at')).values('last')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('causes', '0005_causes_keyset_indexes'),
+        ('donations', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='causes',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='causes',
+            name='donation_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='causes',
+            name='donor_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='causes',
+            name='last_donation_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_donation_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import migrations
+
+# The SQL is frozen here rather than taken from causes.search, so later
+# changes to the live module cannot change what this migration does.
+SEARCH_TABLE = 'causes_search'
+
+CREATE_SQL = {
+    'sqlite': [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "cause_id UNINDEXED, name, description, category, "
+        "tokenize='porter unicode61 remove_diacritics 2')",
+    ],
+    'postgresql': [
+        f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+        'cause_id uuid PRIMARY KEY REFERENCES {causes} (id) ON DELETE CASCADE, '
+        'document tsvector NOT NULL)',
+        f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin ON {SEARCH_TABLE} USING GIN (document)',
+    ],
+}
+
+BACKFILL_SQL = {
+    'sqlite': (
+        f'INSERT INTO {SEARCH_TABLE} (cause_id, name, description, category) '
+        "SELECT c.id, c.name, c.description, COALESCE(cat.name, '') "
+        'FROM {causes} c LEFT JOIN {categories} cat ON cat.id = c.category_id'
+    ),
+    'postgresql': (
+        f'INSERT INTO {SEARCH_TABLE} (cause_id, document) '
+        "SELECT c.id, setweight(to_tsvector('english', COALESCE(c.name, '')), 'A') || "
+        "setweight(to_tsvector('english', COALESCE(cat.name, '')), 'B') || "
+        "setweight(to_tsvector('english', COALESCE(c.description, '')), 'C') "
+        'FROM {causes} c LEFT JOIN {categories} cat ON cat.id = c.category_id '
+        'ON CONFLICT (cause_id) DO UPDATE SET document = EXCLUDED.document'
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in CREATE_SQL:
+        raise ImproperlyConfigured(f'Cause search is not supported on the {vendor} database backend.')
+    tables = {
+        'causes': apps.get_model('causes', 'Causes')._meta.db_table,
+        'categories': apps.get_model('categories', 'Category')._meta.db_table,
+    }
+    for sql in CREATE_SQL[vendor]:
+        schema_editor.execute(sql.format(**tables))
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(BACKFILL_SQL[vendor].format(**tables))
+
+
+def drop_search_index(apps, schema_editor):
+    schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('causes', '0006_causes_donation_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('causes', '0007_causes_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CauseTrendingScore',
+            fields=[
+                ('cause', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='causes.causes')),
+                ('score', models.FloatField(db_index=True)),
+                ('recent_donation_count', models.PositiveIntegerField(default=0)),
+                ('recent_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('causes', '0008_causes_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='causes',
+            name='cover_image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
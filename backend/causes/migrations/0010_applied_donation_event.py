@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('causes', '0009_causes_cover_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppliedDonationEvent',
+            fields=[
+                ('entry_id', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('applied_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -1,8 +1,78 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
 from django.utils.text import slugify
 
+from .cache import invalidate_cause_cache
+
+
+class CausesQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # Bulk updates (admin actions, donation totals) bypass post_save, so
+        # retire the cached responses of the affected causes and keep the
+        # category statistics in step here.
+        from categories.stats import TRACKED_FIELDS, apply_cause_changes, snapshot_causes
+
+        kwargs.setdefault('updated_at', timezone.now())
+        with transaction.atomic():
+            tracked = bool(TRACKED_FIELDS.intersection(kwargs))
+            if tracked:
+                before = snapshot_causes(self, lock=True)
+                cause_ids = [row['pk'] for row in before]
+            else:
+                cause_ids = list(self.values_list('pk', flat=True))
+
+            updated = super().update(**kwargs)
+            if updated and tracked:
+                apply_cause_changes(before, snapshot_causes(Causes.objects.filter(pk__in=cause_ids)))
+
+        if updated:
+            invalidate_cause_cache(*cause_ids)
+            from .search import INDEXED_FIELDS, schedule_reindex
+            if INDEXED_FIELDS.intersection(kwargs):
+                schedule_reindex(*cause_ids)
+        return updated
+
+    def add_to_totals(self, amounts):
+        """
+        Add ``{cause_id: amount}`` to current_amount, flipping a cause to
+        completed in the same statement once it reaches its target.
+
+        Issues one UPDATE per cause (in id order, so concurrent callers lock
+        rows in the same order) plus one snapshot before and after for the
+        category statistics. Returns the ids of the causes that exist.
+        """
+        from categories.stats import apply_cause_changes, snapshot_causes
+
+        cause_ids = sorted(amounts, key=str)
+        now = timezone.now()
+        with transaction.atomic():
+            before = snapshot_causes(self.filter(pk__in=cause_ids), lock=True)
+            updated = []
+            for cause_id in cause_ids:
+                new_total = F('current_amount') + Value(amounts[cause_id])
+                # QuerySet.update itself: the bookkeeping in update() above is
+                # done once for the whole batch instead of once per cause.
+                rows = super(CausesQuerySet, self.filter(pk=cause_id)).update(
+                    current_amount=new_total,
+                    status=Case(
+                        When(GreaterThanOrEqual(new_total, F('target_amount')), then=Value('completed')),
+                        default=F('status'),
+                    ),
+                    updated_at=now,
+                )
+                if rows:
+                    updated.append(cause_id)
+            if updated:
+                apply_cause_changes(before, snapshot_causes(Causes.objects.filter(pk__in=updated)))
+
+        if updated:
+            invalidate_cause_cache(*updated)
+        return updated
+
 
 # Create your models here.
 class Causes(models.Model):
@@ -15,6 +85,10 @@ class Causes(models.Model):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
+    # Statuses never shown on public listings or search
+    HIDDEN_STATUSES = ('under_review', 'rejected')
+    # Statuses of causes currently accepting donations
+    LIVE_STATUSES = ('approved', 'ongoing')
 
     name = models.CharField(max_length=255, unique=True)
     category = models.ForeignKey('categories.Category', on_delete=models.CASCADE, related_name='causes')
@@ -26,16 +100,62 @@ class Causes(models.Model):
     rejection_reason = models.TextField(blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='under_review', db_index=True)
     cover_image = models.ImageField(upload_to='causes_images/', blank=True, null=True)
+    # Resized copies of cover_image, written by the generate_cover_image_derivatives task
+    cover_image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     slug = models.SlugField(unique=True, blank=True)
 
+    # Denormalised donation statistics, maintained by causes.stats when a
+    # donation completes. Rebuild with `manage.py rebuild_cause_stats`.
+    donation_count = models.PositiveIntegerField(default=0, editable=False)
+    donor_count = models.PositiveIntegerField(default=0, editable=False)
+    last_donation_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = CausesQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        # One transaction from pre_save to post_save, so the row locked by the
+        # category statistics snapshot stays locked until the delta is applied
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
     class Meta:
-        verbose_name_plural = "Causes"
\ No newline at end of file
+        verbose_name_plural = "Causes"
+        indexes = [
+            models.Index(fields=['created_at', 'id']),  # Keyset pagination of listings
+            models.Index(fields=['category', 'created_at', 'id']),
+        ]
+
+
+class CauseTrendingScore(models.Model):
+    """
+    Time-decayed donation velocity per cause, rewritten by the
+    ``refresh_trending_causes`` beat task (see causes.trending).
+    """
+    cause = models.OneToOneField(Causes, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField(db_index=True)
+    recent_donation_count = models.PositiveIntegerField(default=0)
+    recent_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.cause_id}: {self.score:.3f}'
+
+
+class AppliedDonationEvent(models.Model):
+    """
+    Stream entries already folded into cause totals. Written in the same
+    transaction as the totals, so a redelivered entry is recognised and
+    skipped instead of being counted twice.
+    """
+    entry_id = models.CharField(max_length=64, primary_key=True)
+    applied_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.entry_id
@@ -0,0 +1,272 @@
+"""
+Full-text search over cause name, description and category name.
+
+Two storage engines sit behind one interface:
+
+- SQLite: an FTS5 virtual table ranked with bm25().
+- PostgreSQL: a side table holding a weighted tsvector behind a GIN index,
+  ranked with ts_rank_cd().
+
+Both are kept in sync from causes.signals and CausesQuerySet.update(), and
+the ``causes_search`` table is created by migration 0007. Scores are
+normalised so that higher is always better, which lets callers page through
+results with a ``(score, cause_id)`` keyset cursor.
+"""
+import html
+import re
+from dataclasses import dataclass
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+
+from categories.models import Category
+
+from .models import Causes
+
+SEARCH_TABLE = 'causes_search'
+
+# Fields whose change requires re-indexing a cause.
+INDEXED_FIELDS = {'name', 'description', 'category', 'category_id'}
+
+_HIGHLIGHT_START = '\x02'
+_HIGHLIGHT_END = '\x03'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    cause_id: str
+    score: float
+    title_highlight: str = ''
+    description_highlight: str = ''
+
+
+def tokenize_query(query):
+    """Split user input into plain word tokens, dropping any query syntax."""
+    return _TOKEN_RE.findall(query or '')[:16]
+
+
+def render_highlight(text):
+    """Escape indexed text and turn the engine's match markers into <mark> tags."""
+    escaped = html.escape(text or '')
+    return escaped.replace(_HIGHLIGHT_START, '<mark>').replace(_HIGHLIGHT_END, '</mark>')
+
+
+def _db_ids(cause_ids):
+    pk = Causes._meta.pk
+    return [pk.get_db_prep_value(pk.to_python(cause_id), connection) for cause_id in cause_ids]
+
+
+def _placeholders(values):
+    return ', '.join(['%s'] * len(values))
+
+
+class BaseSearchBackend:
+    causes_table = Causes._meta.db_table
+    category_table = Category._meta.db_table
+
+    def index_causes(self, cause_ids):
+        raise NotImplementedError
+
+    def remove_causes(self, cause_ids):
+        if not cause_ids:
+            return
+        ids = _db_ids(cause_ids)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE cause_id IN ({_placeholders(ids)})',
+                ids,
+            )
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def search(self, query, limit, after=None):
+        """
+        Return up to ``limit`` SearchHits for ``query`` among public causes,
+        best first. ``after`` is the ``(score, cause_id)`` of the last hit of
+        the previous page.
+        """
+        tokens = tokenize_query(query)
+        if not tokens:
+            return []
+
+        params = [self.build_query(tokens), *Causes.HIDDEN_STATUSES]
+        position = ''
+        if after is not None:
+            score, cause_id = after
+            db_id = _db_ids([cause_id])[0]
+            position = 'WHERE score < %s OR (score = %s AND cause_id > %s)'
+            params += [score, score, db_id]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT cause_id, score FROM ({self.ranked_sql()}) ranked '
+                f'{position} ORDER BY score DESC, cause_id LIMIT %s',
+                params + [limit],
+            )
+            rows = cursor.fetchall()
+
+        hits = [SearchHit(cause_id=str(Causes._meta.pk.to_python(row[0])), score=row[1]) for row in rows]
+        self.attach_highlights(tokens, hits)
+        return hits
+
+    def attach_highlights(self, tokens, hits):
+        if not hits:
+            return
+        ids = _db_ids([hit.cause_id for hit in hits])
+        with connection.cursor() as cursor:
+            cursor.execute(self.highlight_sql(len(ids)), [self.build_query(tokens), *ids])
+            highlights = {
+                str(Causes._meta.pk.to_python(cause_id)): (title, description)
+                for cause_id, title, description in cursor.fetchall()
+            }
+        for hit in hits:
+            title, description = highlights.get(hit.cause_id, ('', ''))
+            hit.title_highlight = render_highlight(title)
+            hit.description_highlight = render_highlight(description)
+
+    def build_query(self, tokens):
+        raise NotImplementedError
+
+    def ranked_sql(self):
+        raise NotImplementedError
+
+    def highlight_sql(self, id_count):
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    create_sql = (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "cause_id UNINDEXED, name, description, category, "
+        "tokenize='porter unicode61 remove_diacritics 2')"
+    )
+    drop_sql = f'DROP TABLE IF EXISTS {SEARCH_TABLE}'
+
+    # bm25 column weights: cause_id, name, description, category
+    rank_expression = f'-bm25({SEARCH_TABLE}, 0.0, 10.0, 1.0, 4.0)'
+
+    def _insert_sql(self, where=''):
+        return (
+            f'INSERT INTO {SEARCH_TABLE} (cause_id, name, description, category) '
+            f'SELECT c.id, c.name, c.description, COALESCE(cat.name, \'\') '
+            f'FROM {self.causes_table} c LEFT JOIN {self.category_table} cat ON cat.id = c.category_id {where}'
+        )
+
+    def index_causes(self, cause_ids):
+        if not cause_ids:
+            return
+        ids = _db_ids(cause_ids)
+        with transaction.atomic():
+            self.remove_causes(cause_ids)
+            with connection.cursor() as cursor:
+                cursor.execute(self._insert_sql(f'WHERE c.id IN ({_placeholders(ids)})'), ids)
+
+    def rebuild(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            cursor.execute(self._insert_sql())
+
+    def build_query(self, tokens):
+        # Quote every token so FTS5 operators in user input are inert; prefix
+        # match so results appear while the user is still typing.
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def ranked_sql(self):
+        return (
+            f'SELECT {SEARCH_TABLE}.cause_id AS cause_id, {self.rank_expression} AS score '
+            f'FROM {SEARCH_TABLE} JOIN {self.causes_table} c ON c.id = {SEARCH_TABLE}.cause_id '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND c.status NOT IN ({_placeholders(Causes.HIDDEN_STATUSES)})'
+        )
+
+    def highlight_sql(self, id_count):
+        return (
+            f"SELECT cause_id, "
+            f"highlight({SEARCH_TABLE}, 1, char(2), char(3)), "
+            f"snippet({SEARCH_TABLE}, 2, char(2), char(3), '…', 32) "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+            f"AND cause_id IN ({_placeholders(range(id_count))})"
+        )
+
+
+class PostgresTSVectorBackend(BaseSearchBackend):
+    create_sql = (
+        f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+        f'cause_id uuid PRIMARY KEY REFERENCES {Causes._meta.db_table} (id) ON DELETE CASCADE, '
+        'document tsvector NOT NULL); '
+        f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin ON {SEARCH_TABLE} USING GIN (document)'
+    )
+    drop_sql = f'DROP TABLE IF EXISTS {SEARCH_TABLE}'
+
+    # Open-ended SQL string expression; each use appends its own options and
+    # closes the literal. chr() keeps the control-character markers out of the
+    # statement text.
+    headline_options = "'StartSel=' || chr(2) || ', StopSel=' || chr(3) || '"
+    document_expression = (
+        "setweight(to_tsvector('english', COALESCE(c.name, '')), 'A') || "
+        "setweight(to_tsvector('english', COALESCE(cat.name, '')), 'B') || "
+        "setweight(to_tsvector('english', COALESCE(c.description, '')), 'C')"
+    )
+
+    def _upsert_sql(self, where=''):
+        return (
+            f'INSERT INTO {SEARCH_TABLE} (cause_id, document) '
+            f'SELECT c.id, {self.document_expression} '
+            f'FROM {self.causes_table} c LEFT JOIN {self.category_table} cat ON cat.id = c.category_id {where} '
+            'ON CONFLICT (cause_id) DO UPDATE SET document = EXCLUDED.document'
+        )
+
+    def index_causes(self, cause_ids):
+        if not cause_ids:
+            return
+        ids = _db_ids(cause_ids)
+        with connection.cursor() as cursor:
+            cursor.execute(self._upsert_sql(f'WHERE c.id IN ({_placeholders(ids)})'), ids)
+
+    def rebuild(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            cursor.execute(self._upsert_sql())
+
+    def build_query(self, tokens):
+        return ' & '.join(f'{token}:*' for token in tokens)
+
+    def ranked_sql(self):
+        return (
+            f'SELECT s.cause_id AS cause_id, ts_rank_cd(s.document, q)::float8 AS score '
+            f"FROM {SEARCH_TABLE} s JOIN {self.causes_table} c ON c.id = s.cause_id, to_tsquery('english', %s) q "
+            f'WHERE s.document @@ q AND c.status NOT IN ({_placeholders(Causes.HIDDEN_STATUSES)})'
+        )
+
+    def highlight_sql(self, id_count):
+        return (
+            f"SELECT c.id, "
+            f"ts_headline('english', c.name, q, {self.headline_options}, HighlightAll=true'), "
+            f"ts_headline('english', c.description, q, {self.headline_options}, MaxWords=35, MinWords=15') "
+            f"FROM {self.causes_table} c, to_tsquery('english', %s) q "
+            f"WHERE c.id IN ({_placeholders(range(id_count))})"
+        )
+
+
+_BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'postgresql': PostgresTSVectorBackend,
+}
+
+
+def get_search_backend(vendor=None):
+    vendor = vendor or connection.vendor
+    try:
+        return _BACKENDS[vendor]()
+    except KeyError:
+        raise ImproperlyConfigured(f'Cause search is not supported on the {vendor} database backend.')
+
+
+def schedule_reindex(*cause_ids):
+    """Re-index ``cause_ids`` once the surrounding transaction commits."""
+    transaction.on_commit(lambda: get_search_backend().index_causes(cause_ids))
+
+
+def schedule_removal(*cause_ids):
+    transaction.on_commit(lambda: get_search_backend().remove_causes(cause_ids))
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
+from .images import cover_image_urls
 from .models import Causes
 from categories.models import Category
 from .utils import validate_organizer_id_with_service
@@ -9,7 +10,6 @@ from .utils import validate_organizer_id_with_service
 class CategorySerializer(serializers.ModelSerializer):
     icon = serializers.SerializerMethodField()
     color = serializers.SerializerMethodField()
-    cause_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Category
@@ -21,26 +21,37 @@ class CategorySerializer(serializers.ModelSerializer):
     def get_color(self, obj):
         return getattr(obj, 'color', None)
 
-    def get_cause_count(self, obj):
-        return getattr(obj, 'cause_count', 0)
+
+# What a cause card needs: no description, creator or placeholder fields.
+COMPACT_FIELDS = (
+    'id',
+    'title',
+    'status',
+    'category',
+    'target_amount',
+    'current_amount',
+    'progress_percentage',
+    'featured_image_variants',
+    'donation_count',
+    'created_at',
+)
 
 
 class CausesSerializer(serializers.ModelSerializer):
     organizer_id = serializers.UUIDField(source='organizer_id.id', read_only=True)
     title = serializers.CharField(source='name', required=False)
     featured_image = serializers.ImageField(source='cover_image', allow_null=True, required=False)
+    featured_image_variants = serializers.SerializerMethodField()
     progress_percentage = serializers.SerializerMethodField()
     creator = serializers.SerializerMethodField()
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(source='category', queryset=Category.objects.all(), write_only=True, required=False, allow_null=True)
     category_data = serializers.DictField(write_only=True, required=False)
-    donation_count = serializers.SerializerMethodField()
     is_featured = serializers.SerializerMethodField()
     deadline = serializers.SerializerMethodField()
     gallery = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
     updates = serializers.SerializerMethodField()
-    updated_at = serializers.SerializerMethodField()
 
     class Meta:
         model = Causes
@@ -60,7 +71,10 @@ class CausesSerializer(serializers.ModelSerializer):
             'updated_at',
             'deadline',
             'featured_image',
+            'featured_image_variants',
             'donation_count',
+            'donor_count',
+            'last_donation_at',
             'is_featured',
             'organizer_id',
             'gallery',
@@ -76,6 +90,62 @@ class CausesSerializer(serializers.ModelSerializer):
             'rejection_reason': {'required': False},
         }
 
+    # Named field subsets selectable with ?view=
+    representations = {
+        'compact': COMPACT_FIELDS,
+    }
+    write_only_fields = ('category_id', 'category_data')
+    # Model columns each output field reads; fields not listed read the column
+    # of the same name, and placeholder fields read none.
+    field_columns = {
+        'title': ('name',),
+        'progress_percentage': ('target_amount', 'current_amount'),
+        'creator': ('organizer_id',),
+        'featured_image': ('cover_image',),
+        'featured_image_variants': ('cover_image', 'cover_image_derivatives'),
+        'is_featured': (),
+        'deadline': (),
+        'gallery': (),
+        'tags': (),
+        'updates': (),
+    }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, params):
+        """
+        Resolve ?view=, ?fields= and ?omit= into the output fields to render,
+        or None for the full representation. Unknown names are ignored.
+        """
+        view, fields, omit = params.get('view'), params.get('fields'), params.get('omit')
+        if not (view or fields or omit):
+            return None
+
+        readable = [name for name in cls.Meta.fields if name not in cls.write_only_fields]
+        selected = list(cls.representations.get(view, readable))
+        if fields:
+            requested = {name.strip() for name in fields.split(',')}
+            selected = [name for name in readable if name in requested]
+        if omit:
+            omitted = {name.strip() for name in omit.split(',')}
+            selected = [name for name in selected if name not in omitted]
+        if 'id' not in selected:
+            selected.insert(0, 'id')
+        return tuple(selected)
+
+    @classmethod
+    def columns_for(cls, fields):
+        """Model columns needed to render ``fields``."""
+        columns = {'id'}
+        for name in fields:
+            columns.update(cls.field_columns.get(name, (name,)))
+        return columns
+
     def validate_organizer_id(self, value):
         try:
             validate_organizer_id_with_service(value)
@@ -120,6 +190,10 @@ class CausesSerializer(serializers.ModelSerializer):
         except ZeroDivisionError:
             return 0
 
+    def get_featured_image_variants(self, obj):
+        request = self.context.get('request')
+        return cover_image_urls(obj, request.build_absolute_uri if request else str)
+
     def get_creator(self, obj):
         user = getattr(obj, 'organizer_id', None)
         if not user:
@@ -142,9 +216,6 @@ class CausesSerializer(serializers.ModelSerializer):
             'profile_picture': profile_picture,
         }
 
-    def get_donation_count(self, obj):
-        return getattr(obj, 'donation_count', 0)
-
     def get_is_featured(self, obj):
         return getattr(obj, 'is_featured', False)
 
@@ -163,15 +234,10 @@ class CausesSerializer(serializers.ModelSerializer):
         updates = getattr(obj, 'updates', None)
         return updates if isinstance(updates, list) else []
 
-    def get_updated_at(self, obj):
-        return getattr(obj, 'updated_at', None) or obj.created_at
-
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        category = instance.category if hasattr(instance, 'category') else None
-        if category:
-            data['category'] = CategorySerializer(category).data
-        else:
+        # The nested CategorySerializer has already rendered the category.
+        if 'category' in data and data['category'] is None:
             data['category'] = {
                 'id': '',
                 'name': '',
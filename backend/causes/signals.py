@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from categories.models import Category
+from categories.stats import TRACKED_FIELDS, apply_cause_changes, invalidate_catalogue_cache, snapshot_causes
+
+from .cache import invalidate_cause_cache
+from .models import Causes
+from .search import INDEXED_FIELDS, schedule_reindex, schedule_removal
+from .tasks import generate_cover_image_derivatives
+
+
+@receiver(post_save, sender=Causes)
+@receiver(post_delete, sender=Causes)
+def invalidate_cached_cause_responses(sender, instance, **kwargs):
+    invalidate_cause_cache(instance.pk)
+
+
+@receiver(post_save, sender=Causes)
+def index_cause_for_search(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or INDEXED_FIELDS.intersection(update_fields):
+        schedule_reindex(instance.pk)
+
+
+@receiver(post_delete, sender=Causes)
+def remove_cause_from_search(sender, instance, **kwargs):
+    schedule_removal(instance.pk)
+
+
+@receiver(post_save, sender=Causes)
+def queue_cover_image_derivatives(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'cover_image' not in update_fields:
+        return
+    if not instance.cover_image or instance.cover_image_derivatives.get('source') == instance.cover_image.name:
+        return
+    # robust: a broker outage must not fail the upload; the serializer falls
+    # back to the original image until derivatives exist.
+    transaction.on_commit(lambda: generate_cover_image_derivatives.delay(instance.pk), robust=True)
+
+
+def _tracks_category_stats(kwargs):
+    update_fields = kwargs.get('update_fields')
+    return update_fields is None or bool(TRACKED_FIELDS.intersection(update_fields))
+
+
+@receiver(pre_save, sender=Causes)
+@receiver(pre_delete, sender=Causes)
+def snapshot_cause_for_category_stats(sender, instance, **kwargs):
+    if kwargs.get('signal') is pre_save and not _tracks_category_stats(kwargs):
+        return
+    if instance._state.adding:
+        instance._category_stats_before = []
+    else:
+        instance._category_stats_before = snapshot_causes(Causes.objects.filter(pk=instance.pk), lock=True)
+
+
+@receiver(post_save, sender=Causes)
+def update_category_stats_on_save(sender, instance, **kwargs):
+    if not _tracks_category_stats(kwargs):
+        return
+    before = getattr(instance, '_category_stats_before', [])
+    apply_cause_changes(before, snapshot_causes(Causes.objects.filter(pk=instance.pk)))
+
+
+@receiver(post_delete, sender=Causes)
+def update_category_stats_on_delete(sender, instance, **kwargs):
+    apply_cause_changes(getattr(instance, '_category_stats_before', []), [])
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_causes(sender, instance, created, **kwargs):
+    if not created:
+        # Causes embed their category, so a rename must change their
+        # updated_at (and with it their ETags and cached responses) too.
+        instance.causes.update(updated_at=timezone.now())
+        schedule_reindex(*instance.causes.values_list('pk', flat=True))
+    invalidate_catalogue_cache()
+
+
+@receiver(post_delete, sender=Category)
+def drop_category_from_catalogue(sender, instance, **kwargs):
+    invalidate_catalogue_cache()
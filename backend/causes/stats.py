@@ -0,0 +1,69 @@
+"""
+Incrementally maintained donation statistics stored on Causes.
+
+``record_completed_donation`` runs inside the transaction that flips a
+donation to completed, so the counters never drift from the donations table.
+``rebuild_cause_stats`` recomputes them from scratch for repairs/backfills.
+
+Whether a donation brings a new donor depends on the donor's other completed
+donations, so ``lock_donors`` first locks the donor's user row: completions
+for one donor then run one at a time and each sees the ones before it.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Case, Count, DateTimeField, F, Max, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Causes
+
+
+def lock_donors(user_ids):
+    """
+    Lock the users in ``user_ids`` until the transaction ends, in id order so
+    concurrent callers cannot deadlock. Anonymous donations (None) are skipped.
+    """
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    if ids:
+        list(get_user_model().objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk', flat=True))
+
+
+def record_completed_donation(donation, still_pending=()):
+    """
+    Fold a newly completed donation into its cause's counters. Donations in
+    ``still_pending`` were completed in the same UPDATE but are not recorded
+    yet, so they do not count as earlier donations from the same donor.
+    """
+    from donations.models import Donation
+
+    lock_donors([donation.user_id_id])
+    first_from_donor = donation.user_id_id is not None and not Donation.objects.filter(
+        cause_id=donation.cause_id_id,
+        user_id=donation.user_id_id,
+        status='completed',
+    ).exclude(pk=donation.pk).exclude(pk__in=still_pending).exists()
+
+    return Causes.objects.filter(pk=donation.cause_id_id).update(
+        donation_count=F('donation_count') + 1,
+        donor_count=F('donor_count') + (1 if first_from_donor else 0),
+        last_donation_at=Case(
+            When(last_donation_at__gte=donation.donated_at, then=F('last_donation_at')),
+            default=Value(donation.donated_at),
+            output_field=DateTimeField(),
+        ),
+    )
+
+
+def rebuild_cause_stats(queryset=None):
+    """Recompute the statistics columns from completed donations. Returns rows updated."""
+    from donations.models import Donation
+
+    if queryset is None:
+        queryset = Causes.objects.all()
+
+    completed = Donation.objects.filter(cause_id=OuterRef('pk'), status='completed') \
+        .order_by().values('cause_id')
+
+    return queryset.update(
+        donation_count=Coalesce(Subquery(completed.annotate(n=Count('pk')).values('n')), 0),
+        donor_count=Coalesce(Subquery(completed.annotate(n=Count('user_id', distinct=True)).values('n')), 0),
+        last_donation_at=Subquery(completed.annotate(last=Max('donated_at')).values('last')),
+    )
@@ -0,0 +1,43 @@
+from causehive.celery import app
+
+from .donation_events import prune_applied_events
+from .images import delete_cover_derivatives, generate_cover_derivatives
+from .models import Causes
+from .trending import refresh_trending_scores
+
+
+@app.task
+def refresh_trending_causes():
+    """Rematerialise the trending causes ranking. Scheduled by celery beat."""
+    return refresh_trending_scores()
+
+
+@app.task
+def prune_applied_donation_events():
+    """Forget applied donation event keys whose entries can no longer be redelivered."""
+    return prune_applied_events()
+
+
+@app.task
+def generate_cover_image_derivatives(cause_id):
+    """Render the thumb/card/hero derivatives of a cause's current cover image."""
+    try:
+        cause = Causes.objects.only('id', 'cover_image', 'cover_image_derivatives').get(pk=cause_id)
+    except Causes.DoesNotExist:
+        return
+
+    previous = cause.cover_image_derivatives or {}
+    if not cause.cover_image or previous.get('source') == cause.cover_image.name:
+        return
+
+    derivatives = generate_cover_derivatives(cause)
+    storage = cause.cover_image.storage
+
+    # Only record them if the cover wasn't replaced while we were rendering;
+    # the task queued for the newer upload will produce its own.
+    updated = Causes.objects.filter(pk=cause.pk, cover_image=cause.cover_image.name) \
+        .update(cover_image_derivatives=derivatives)
+    if updated:
+        delete_cover_derivatives(storage, previous)
+    else:
+        delete_cover_derivatives(storage, derivatives)
@@ -1,13 +1,18 @@
 import uuid
 from unittest.mock import patch, MagicMock
+from datetime import timedelta
 from decimal import Decimal
-from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings, skipUnlessDBFeature
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from PIL import Image
 import io
+import time
 
 from .models import Causes
 from .serializers import CausesSerializer
@@ -639,4 +644,796 @@ class IntegrationTestCase(APITestCase):
 
         # Verify cause was created with new category
         cause = Causes.objects.get(name='Cause with New Category')
-        self.assertEqual(cause.category, new_category)
\ No newline at end of file
+        self.assertEqual(cause.category, new_category)
+
+class CauseKeysetPaginationTestCase(APITestCase):
+    """Test cases for cursor pagination of the public cause listings"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='organizer@example.com',
+            password='testpass123',
+            first_name='Org',
+            last_name='Anizer',
+        )
+        self.category = Category.objects.create(name='Health', description='Health causes')
+        self.other_category = Category.objects.create(name='Water', description='Water causes')
+        self.causes = [
+            Causes.objects.create(
+                name=f'Cause {i}',
+                category=self.category if i % 2 == 0 else self.other_category,
+                organizer_id=self.organizer,
+                target_amount=Decimal('100.00'),
+                status='ongoing',
+            )
+            for i in range(5)
+        ]
+        Causes.objects.create(
+            name='Hidden Cause',
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('100.00'),
+            status='under_review',
+        )
+        # Identical timestamps force the id tie-breaker to do its job.
+        Causes.objects.update(created_at=timezone.now())
+
+    def _walk(self, url, params):
+        names = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            names.extend(item['title'] for item in response.data['results'])
+            if not response.data['next']:
+                return names, response
+            response = self.client.get(response.data['next'])
+
+    def test_pages_cover_every_live_cause_once(self):
+        names, _ = self._walk(reverse('cause_list_create'), {'page_size': 2})
+        self.assertEqual(sorted(names), sorted(c.name for c in self.causes))
+
+    def test_ascending_ordering_reverses_descending(self):
+        desc, _ = self._walk(reverse('cause_list'), {'page_size': 2})
+        asc, _ = self._walk(reverse('cause_list'), {'page_size': 2, 'ordering': 'created_at'})
+        self.assertEqual(desc, list(reversed(asc)))
+
+    def test_previous_link_returns_prior_page(self):
+        url = reverse('cause_list_create')
+        first = self.client.get(url, {'page_size': 2})
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']],
+        )
+
+    def test_category_and_status_filters(self):
+        response = self.client.get(reverse('cause_list_create'), {
+            'category': str(self.other_category.id),
+            'status': 'live',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = self.client.get(reverse('cause_list_create'), {'category': self.category.slug})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('cause_list_create'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CauseResponseCacheInvalidationTestCase(APITestCase):
+    """Test cases for generation-based invalidation of cached cause responses"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='cache-organizer@example.com',
+            password='testpass123',
+            first_name='Cache',
+            last_name='Organizer',
+        )
+        self.category = Category.objects.create(name='Education', description='Education causes')
+        self.cause = Causes.objects.create(
+            name='Cached Cause',
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status='ongoing',
+        )
+        self.other_cause = Causes.objects.create(
+            name='Other Cached Cause',
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status='ongoing',
+        )
+
+    def _detail(self, cause):
+        return self.client.get(reverse('cause_detail', kwargs={'id': cause.id}))
+
+    def test_queryset_update_invalidates_detail(self):
+        self.assertEqual(Decimal(self._detail(self.cause).data['current_amount']), Decimal('0.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Causes.objects.filter(id=self.cause.id).update(current_amount=Decimal('250.00'))
+
+        self.assertEqual(Decimal(self._detail(self.cause).data['current_amount']), Decimal('250.00'))
+
+    def test_update_leaves_other_cause_generations_alone(self):
+        from .cache import detail_key_prefix, list_key_prefix
+
+        other_prefix = detail_key_prefix(self.other_cause.id)
+        list_prefix = list_key_prefix()
+        with self.captureOnCommitCallbacks(execute=True):
+            Causes.objects.filter(id=self.cause.id).update(status='completed')
+
+        self.assertEqual(detail_key_prefix(self.other_cause.id), other_prefix)
+        self.assertNotEqual(list_key_prefix(), list_prefix)
+
+    def test_save_invalidates_list(self):
+        response = self.client.get(reverse('cause_list'))
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.other_cause.status = 'under_review'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_cause.save()
+
+        response = self.client.get(reverse('cause_list'))
+        self.assertEqual([item['id'] for item in response.data['results']], [str(self.cause.id)])
+
+
+class CauseStatisticsTestCase(TestCase):
+    """Test cases for the denormalised donation statistics on Causes"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.organizer = User.objects.create_user(email='stats-organizer@example.com', password='testpass123')
+        self.donor = User.objects.create_user(email='donor@example.com', password='testpass123')
+        self.category = Category.objects.create(name='Relief', description='Relief causes')
+        self.cause = Causes.objects.create(
+            name='Stats Cause',
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status='ongoing',
+        )
+
+    def _donation(self, user=None, amount='10.00'):
+        from donations.models import Donation
+        return Donation.objects.create(
+            user_id=user,
+            cause_id=self.cause,
+            recipient_id=self.organizer,
+            amount=Decimal(amount),
+        )
+
+    def test_mark_as_completed_updates_counters(self):
+        first = self._donation(self.donor)
+        second = self._donation(self.donor)
+        anonymous = self._donation(None)
+
+        self.assertTrue(first.mark_as_completed())
+        self.assertTrue(second.mark_as_completed())
+        self.assertTrue(anonymous.mark_as_completed())
+
+        self.cause.refresh_from_db()
+        self.assertEqual(self.cause.donation_count, 3)
+        self.assertEqual(self.cause.donor_count, 1)
+        self.assertEqual(self.cause.last_donation_at, anonymous.donated_at)
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_donor_is_locked_before_counting_new_donors(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        donation = self._donation(self.donor)
+        with CaptureQueriesContext(connection) as queries:
+            donation.mark_as_completed()
+
+        sql = [query['sql'] for query in queries.captured_queries]
+        user_table = get_user_model()._meta.db_table
+        lock = next(i for i, q in enumerate(sql) if 'FOR UPDATE' in q and user_table in q)
+        donation_table = donation._meta.db_table
+        count = next(i for i, q in enumerate(sql) if q.startswith('SELECT 1 AS') and donation_table in q)
+        self.assertLess(lock, count)
+
+    def test_mark_as_completed_is_idempotent(self):
+        donation = self._donation(self.donor)
+        self.assertTrue(donation.mark_as_completed())
+        self.assertFalse(donation.mark_as_completed())
+
+        self.cause.refresh_from_db()
+        self.assertEqual(self.cause.donation_count, 1)
+
+    def test_rebuild_command_recomputes_from_donations(self):
+        from django.core.management import call_command
+
+        self._donation(self.donor).mark_as_completed()
+        self._donation(None).mark_as_completed()
+        self._donation(self.donor)  # pending, must not be counted
+        Causes.objects.filter(id=self.cause.id).update(donation_count=99, donor_count=99, last_donation_at=None)
+
+        call_command('rebuild_cause_stats', stdout=io.StringIO())
+
+        self.cause.refresh_from_db()
+        self.assertEqual(self.cause.donation_count, 2)
+        self.assertEqual(self.cause.donor_count, 1)
+        self.assertIsNotNone(self.cause.last_donation_at)
+
+    def test_serializer_reads_stored_counters(self):
+        self._donation(self.donor).mark_as_completed()
+        self.cause.refresh_from_db()
+
+        data = CausesSerializer(self.cause).data
+        self.assertEqual(data['donation_count'], 1)
+        self.assertEqual(data['donor_count'], 1)
+        self.assertIsNotNone(data['updated_at'])
+
+
+class CauseSearchTestCase(APITestCase):
+    """Test cases for the full-text cause search endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='search-organizer@example.com',
+            password='testpass123',
+        )
+        self.water = Category.objects.create(name='Water', description='Water causes')
+        self.schools = Category.objects.create(name='Schools', description='School causes')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.well = self._cause('Clean wells for Tamale', self.water, 'Drilling boreholes in the north.')
+            self.books = self._cause('Library books', self.schools, 'Books and clean water bottles for pupils.')
+            self.hidden = self._cause('Secret water project', self.water, 'Pending approval.', status='under_review')
+
+    def _cause(self, name, category, description, status='ongoing'):
+        return Causes.objects.create(
+            name=name,
+            category=category,
+            description=description,
+            organizer_id=self.organizer,
+            target_amount=Decimal('500.00'),
+            status=status,
+        )
+
+    def _search(self, **params):
+        return self.client.get(reverse('cause_search'), params)
+
+    def test_ranks_title_matches_first_and_hides_unpublished(self):
+        response = self._search(q='clean')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [str(self.well.id), str(self.books.id)])
+
+        response = self._search(q='water')
+        ids = [item['id'] for item in response.data['results']]
+        self.assertNotIn(str(self.hidden.id), ids)
+        self.assertIn(str(self.well.id), ids)  # matched through its category name
+
+    def test_highlights_are_escaped_and_marked(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._cause('Clinic <script>', self.water, 'Rural clinic.')
+
+        item = self._search(q='clinic').data['results'][0]
+        self.assertEqual(item['search']['title'], '<mark>Clinic</mark> &lt;script&gt;')
+
+    def test_prefix_and_operator_safe_queries(self):
+        self.assertEqual(len(self._search(q='tama').data['results']), 1)
+        self.assertEqual(self._search(q='"books" OR NEAR(').status_code, status.HTTP_200_OK)
+
+    def test_cursor_pagination(self):
+        first = self._search(q='clean', page_size=1)
+        self.assertEqual(len(first.data['results']), 1)
+        self.assertIsNotNone(first.data['next'])
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual([item['id'] for item in second.data['results']], [str(self.books.id)])
+        self.assertIsNone(second.data['next'])
+
+    def test_invalid_cursor_returns_404(self):
+        import base64
+        import json
+
+        numeric_id = base64.urlsafe_b64encode(json.dumps({'s': 1.0, 'id': 5}).encode()).decode()
+        for cursor in ('not-a-cursor', numeric_id):
+            response = self._search(q='clean', cursor=cursor)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_index_follows_cause_and_category_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.books.name = 'Solar lamps'
+            self.books.save()
+        self.assertEqual(len(self._search(q='library').data['results']), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.schools.name = 'Lighting'
+            self.schools.save()
+        ids = [item['id'] for item in self._search(q='lighting').data['results']]
+        self.assertEqual(ids, [str(self.books.id)])
+
+    def test_missing_query_is_rejected(self):
+        self.assertEqual(self._search().status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CauseTrendingTestCase(APITestCase):
+    """Test cases for the materialised trending causes ranking"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='trending-organizer@example.com',
+            password='testpass123',
+        )
+        self.category = Category.objects.create(name='Health', description='Health causes')
+        self.steady = self._cause('Steady cause')
+        self.rising = self._cause('Rising cause')
+        self.hidden = self._cause('Hidden cause', status='under_review')
+
+    def _cause(self, name, status='ongoing'):
+        return Causes.objects.create(
+            name=name,
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status=status,
+        )
+
+    def _donations(self, cause, count, hours_ago, status='completed'):
+        from donations.models import Donation
+
+        for _ in range(count):
+            donation = Donation.objects.create(
+                cause_id=cause,
+                recipient_id=self.organizer,
+                amount=Decimal('10.00'),
+                status=status,
+            )
+            Donation.objects.filter(pk=donation.pk).update(
+                donated_at=timezone.now() - timedelta(hours=hours_ago),
+            )
+
+    def test_recent_donations_outrank_older_ones(self):
+        from .trending import refresh_trending_scores
+
+        self._donations(self.steady, 4, hours_ago=120)
+        self._donations(self.rising, 2, hours_ago=1)
+        self._donations(self.rising, 5, hours_ago=1, status='pending')
+        self._donations(self.steady, 10, hours_ago=24 * 30)  # outside the window
+
+        self.assertEqual(refresh_trending_scores(), 2)
+
+        steady = self.steady.trending
+        self.assertEqual(steady.recent_donation_count, 4)
+        self.assertEqual(steady.recent_amount, Decimal('40.00'))
+        self.assertGreater(self.rising.trending.score, steady.score)
+
+    def test_refresh_drops_causes_without_recent_donations(self):
+        from .models import CauseTrendingScore
+        from .trending import refresh_trending_scores
+
+        self._donations(self.steady, 1, hours_ago=1)
+        refresh_trending_scores()
+        self.assertTrue(CauseTrendingScore.objects.filter(cause=self.steady).exists())
+
+        later = timezone.now() + timedelta(days=30)
+        self.assertEqual(refresh_trending_scores(now=later), 0)
+        self.assertFalse(CauseTrendingScore.objects.exists())
+
+    def test_endpoint_lists_public_causes_by_score(self):
+        from .tasks import refresh_trending_causes
+
+        self._donations(self.steady, 1, hours_ago=2)
+        self._donations(self.rising, 3, hours_ago=1)
+        self._donations(self.hidden, 9, hours_ago=1)
+        refresh_trending_causes()
+
+        response = self.client.get(reverse('cause_trending'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [str(self.rising.id), str(self.steady.id)])
+        self.assertEqual(response.data['results'][0]['trending']['recent_donation_count'], 3)
+
+        response = self.client.get(reverse('cause_trending'), {'limit': 1})
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class CoverImageDerivativesTestCase(TestCase):
+    """Test cases for the cover image derivative pipeline"""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.organizer = get_user_model().objects.create_user(
+            email='images-organizer@example.com',
+            password='testpass123',
+        )
+        self.category = Category.objects.create(name='Arts', description='Arts causes')
+
+    def _upload(self, name='cover.jpg'):
+        image = Image.new('RGB', (2400, 1200), 'navy')
+        exif = Image.Exif()
+        exif[0x0110] = 'TestCam 3000'  # Model
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', exif=exif.tobytes())
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def _cause(self):
+        return Causes.objects.create(
+            name='Mural project',
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('800.00'),
+            status='ongoing',
+            cover_image=self._upload(),
+        )
+
+    def test_upload_queues_task_once(self):
+        with patch('causes.signals.generate_cover_image_derivatives.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                cause = self._cause()
+            delay.assert_called_once_with(cause.pk)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                cause.description = 'Painting the market walls'
+                cause.save(update_fields=['description'])
+            delay.assert_called_once()
+
+    def test_serializer_falls_back_to_original_until_rendered(self):
+        from .tasks import generate_cover_image_derivatives
+
+        cause = self._cause()
+        variants = CausesSerializer(cause).data['featured_image_variants']
+        self.assertEqual(variants['thumb']['webp'], cause.cover_image.url)
+
+        generate_cover_image_derivatives(cause.pk)
+        cause.refresh_from_db()
+        variants = CausesSerializer(cause).data['featured_image_variants']
+        self.assertEqual(set(variants), {'thumb', 'card', 'hero'})
+        self.assertTrue(variants['card']['webp'].endswith('/card.webp'))
+        self.assertTrue(variants['card']['jpeg'].endswith('/card.jpeg'))
+
+    def test_derivatives_are_resized_and_stripped(self):
+        from .images import DERIVATIVE_SIZES
+        from .tasks import generate_cover_image_derivatives
+
+        cause = self._cause()
+        generate_cover_image_derivatives(cause.pk)
+        cause.refresh_from_db()
+
+        storage = cause.cover_image.storage
+        for size, dimensions in DERIVATIVE_SIZES.items():
+            for name in cause.cover_image_derivatives[size].values():
+                with storage.open(name) as handle:
+                    rendered = Image.open(handle)
+                    self.assertEqual(rendered.size, dimensions)
+                    self.assertEqual(len(rendered.getexif()), 0)
+
+    def test_replacing_cover_removes_old_derivatives(self):
+        from .tasks import generate_cover_image_derivatives
+
+        cause = self._cause()
+        generate_cover_image_derivatives(cause.pk)
+        cause.refresh_from_db()
+        old_thumb = cause.cover_image_derivatives['thumb']['jpeg']
+
+        cause.cover_image = self._upload('new-cover.jpg')
+        cause.save()
+        self.assertEqual(
+            CausesSerializer(cause).data['featured_image_variants']['thumb']['jpeg'],
+            cause.cover_image.url,
+        )
+
+        generate_cover_image_derivatives(cause.pk)
+        cause.refresh_from_db()
+        self.assertFalse(cause.cover_image.storage.exists(old_thumb))
+        self.assertNotEqual(cause.cover_image_derivatives['thumb']['jpeg'], old_thumb)
+
+
+class CauseSparseFieldsetTestCase(APITestCase):
+    """Test cases for ?view=, ?fields= and ?omit= on the cause endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='fields-organizer@example.com',
+            password='testpass123',
+        )
+        self.category = Category.objects.create(name='Food', description='Food causes')
+        self.cause = Causes.objects.create(
+            name='Community kitchen',
+            description='A very long description ' * 50,
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('400.00'),
+            current_amount=Decimal('100.00'),
+            status='ongoing',
+        )
+
+    def test_compact_view_renders_card_fields_only(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .serializers import COMPACT_FIELDS
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('cause_list'), {'view': 'compact'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        item = response.data['results'][0]
+        self.assertEqual(set(item), set(COMPACT_FIELDS))
+        self.assertEqual(item['progress_percentage'], 25)
+        self.assertEqual(item['category']['name'], 'Food')
+
+        select = next(query['sql'] for query in queries if 'FROM "causes_causes"' in query['sql'])
+        self.assertNotIn('"causes_causes"."description"', select)
+        self.assertNotIn('users_n_auth_user', select)
+
+    def test_fields_and_omit(self):
+        response = self.client.get(reverse('cause_list'), {'fields': 'title,current_amount,bogus'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'current_amount'})
+
+        response = self.client.get(reverse('cause_detail', args=[self.cause.id]), {'omit': 'description,creator'})
+        self.assertNotIn('description', response.data)
+        self.assertNotIn('creator', response.data)
+        self.assertIn('title', response.data)
+
+    def test_full_representation_by_default(self):
+        response = self.client.get(reverse('cause_retrieve_update', args=[self.cause.id]))
+        self.assertIn('description', response.data)
+        self.assertIn('creator', response.data)
+        self.assertEqual(response.data['category']['id'], str(self.category.id))
+
+
+class CauseBatchLookupTestCase(APITestCase):
+    """Test cases for the batch cause lookup endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='batch-organizer@example.com',
+            password='testpass123',
+        )
+        self.category = Category.objects.create(name='Shelter', description='Shelter causes')
+        self.first = self._cause('Roof repairs')
+        self.second = self._cause('Blankets')
+        self.hidden = self._cause('Unreviewed', status='under_review')
+
+    def _cause(self, name, status='ongoing'):
+        return Causes.objects.create(
+            name=name,
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('300.00'),
+            status=status,
+        )
+
+    def test_get_resolves_ids_in_one_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        unknown = uuid.uuid4()
+        ids = f'{self.first.id},{self.second.id},{unknown},{self.hidden.id},not-a-uuid'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('cause_batch'), {'ids': ids, 'view': 'compact'})
+        cause_queries = [query for query in queries if 'FROM "causes_causes"' in query['sql']]
+        self.assertEqual(len(cause_queries), 1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results']), {str(self.first.id), str(self.second.id)})
+        self.assertEqual(response.data['results'][str(self.first.id)]['title'], 'Roof repairs')
+        self.assertEqual(response.data['missing'], [str(unknown), str(self.hidden.id), 'not-a-uuid'])
+
+    def test_post_body_variant(self):
+        response = self.client.post(reverse('cause_batch'), {'ids': [str(self.second.id)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results']), [str(self.second.id)])
+        self.assertEqual(response.data['missing'], [])
+
+    def test_rejects_empty_and_oversized_requests(self):
+        from .views import CauseBatchView
+
+        self.assertEqual(self.client.get(reverse('cause_batch')).status_code, status.HTTP_400_BAD_REQUEST)
+
+        ids = [str(uuid.uuid4()) for _ in range(CauseBatchView.max_ids + 1)]
+        response = self.client.post(reverse('cause_batch'), {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CauseConditionalGetTestCase(APITestCase):
+    """Test cases for ETag / Last-Modified handling on the cause endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = get_user_model().objects.create_user(
+            email='etag-organizer@example.com',
+            password='testpass123',
+        )
+        self.category = Category.objects.create(name='Sports', description='Sports causes')
+        self.cause = Causes.objects.create(
+            name='Football pitch',
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal('900.00'),
+            status='ongoing',
+        )
+        self.url = reverse('cause_retrieve_update', args=[self.cause.id])
+
+    def test_detail_answers_if_none_match_without_serializing(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response)
+
+        with patch.object(CausesSerializer, 'to_representation') as to_representation:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_with_cause_category_and_fields(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertNotEqual(self.client.get(self.url, {'view': 'compact'})['ETag'], etag)
+
+        Causes.objects.filter(pk=self.cause.pk).update(current_amount=Decimal('50.00'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        self.category.name = 'Athletics'
+        self.category.save()
+        self.assertNotEqual(self.client.get(self.url)['ETag'], etag)
+
+    def test_list_is_validated_by_etag_only(self):
+        url = reverse('cause_list_create')
+        first = self.client.get(url)
+        self.assertNotIn('Last-Modified', first)
+
+        # An older cause replacing a hidden one leaves the newest updated_at unchanged
+        Causes.objects.filter(pk=self.cause.pk).update(status='rejected')
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_cached_list_and_detail_responses_honour_validators(self):
+        for url in (reverse('cause_list'), reverse('cause_detail', args=[self.cause.id])):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_responses_are_not_cached_downstream(self):
+        for url in (reverse('cause_list'), reverse('cause_detail', args=[self.cause.id])):
+            for response in (self.client.get(url), self.client.get(url)):  # fresh, then from the cache
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn('no-cache', response['Cache-Control'])
+                self.assertIn('max-age=0', response['Cache-Control'])
+                self.assertNotIn('Expires', response)
+
+
+class DonationEventConsumerTestCase(TestCase):
+    """Test cases for batched application of donation events"""
+
+    def setUp(self):
+        self.organizer = get_user_model().objects.create_user(
+            email='events-organizer@example.com',
+            password='testpass123',
+        )
+        self.category = Category.objects.create(name='Animals', description='Animal causes')
+        self.shelter = self._cause('Dog shelter', '100.00')
+        self.clinic = self._cause('Vet clinic', '1000.00')
+
+    def _cause(self, name, target):
+        return Causes.objects.create(
+            name=name,
+            category=self.category,
+            organizer_id=self.organizer,
+            target_amount=Decimal(target),
+            status='ongoing',
+        )
+
+    def _event(self, cause_id, amount):
+        return {'event': 'donation.completed', 'data': {'cause_id': str(cause_id), 'amount': amount}}
+
+    def test_batch_is_aggregated_into_one_update_per_cause(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .donation_events import apply_donation_events
+
+        unknown = uuid.uuid4()
+        events = [self._event(self.shelter.id, 30.0) for _ in range(4)] + [
+            self._event(self.clinic.id, 12.5),
+            self._event(self.clinic.id, 7.5),
+            self._event(unknown, 5),
+            {'event': 'donation.completed', 'data': {'cause_id': 'nope', 'amount': 1}},
+            {'event': 'something.else'},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            updated, missing = apply_donation_events(events)
+
+        cause_updates = [q for q in queries if q['sql'].startswith('UPDATE "causes_causes"')]
+        self.assertEqual(len(cause_updates), 3)
+        self.assertEqual(set(updated), {self.shelter.id, self.clinic.id})
+        self.assertEqual(missing, [unknown])
+
+        self.shelter.refresh_from_db()
+        self.clinic.refresh_from_db()
+        self.assertEqual(self.shelter.current_amount, Decimal('120.00'))
+        self.assertEqual(self.shelter.status, 'completed')
+        self.assertEqual(self.clinic.current_amount, Decimal('20.00'))
+        self.assertEqual(self.clinic.status, 'ongoing')
+
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.total_raised, Decimal('140.00'))
+        self.assertEqual(self.category.live_cause_count, 1)
+
+    def test_successive_batches_accumulate(self):
+        from .donation_events import apply_donation_events
+
+        apply_donation_events([self._event(self.clinic.id, '10.10')])
+        apply_donation_events([self._event(self.clinic.id, '0.90')])
+
+        self.clinic.refresh_from_db()
+        self.assertEqual(self.clinic.current_amount, Decimal('11.00'))
+
+    def test_stream_entries_are_applied_once(self):
+        from .donation_events import apply_stream_entries
+
+        entries = [
+            ('1-0', self._event(self.clinic.id, '5.00')),
+            ('1-1', self._event(self.clinic.id, '5.00')),
+            ('1-2', None),  # undecodable entries are recorded and dropped
+        ]
+        self.assertEqual(apply_stream_entries(entries), ([self.clinic.id], [], 0))
+
+        # Redelivery after a crash, or a replay, overlaps the applied entries.
+        updated, missing, skipped = apply_stream_entries(entries + [('1-3', self._event(self.clinic.id, '1.00'))])
+        self.assertEqual(skipped, 3)
+
+        self.clinic.refresh_from_db()
+        self.assertEqual(self.clinic.current_amount, Decimal('11.00'))
+
+    def test_republished_outbox_events_are_applied_once(self):
+        from .donation_events import apply_stream_entries
+
+        event = dict(self._event(self.clinic.id, '5.00'), id='outbox-7')
+        apply_stream_entries([('1-0', event)])
+        # The relay published the row again under a new entry id.
+        self.assertEqual(apply_stream_entries([('2-0', dict(event)), ('2-1', dict(event))]), ([], [], 2))
+
+        self.clinic.refresh_from_db()
+        self.assertEqual(self.clinic.current_amount, Decimal('5.00'))
+
+    @override_settings(DONATION_EVENT_KEY_RETENTION_DAYS=7)
+    def test_prune_keeps_keys_of_entries_still_in_the_stream(self):
+        from .donation_events import prune_applied_events
+        from .models import AppliedDonationEvent
+
+        now = timezone.now()
+        for key, days_ago in (('old', 30), ('week', 10), ('recent', 1)):
+            AppliedDonationEvent.objects.create(entry_id=key)
+            AppliedDonationEvent.objects.filter(entry_id=key).update(applied_at=now - timedelta(days=days_ago))
+
+        client = MagicMock()
+        # The oldest entry left in the stream was added 20 days ago
+        client.xrange.return_value = [(f'{int((now - timedelta(days=20)).timestamp() * 1000)}-0', {})]
+        self.assertEqual(prune_applied_events(client), 1)
+
+        client.xrange.return_value = []
+        self.assertEqual(prune_applied_events(client), 1)
+        self.assertEqual(list(AppliedDonationEvent.objects.values_list('entry_id', flat=True)), ['recent'])
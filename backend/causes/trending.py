@@ -0,0 +1,87 @@
+"""
+Trending causes, ranked by time-decayed donation velocity.
+
+Every completed donation inside the window contributes ``0.5 ** (age / half_life)``
+to its cause's score, so a burst of recent donations outranks a larger but
+older total. Donations are aggregated per cause and hour in the database and
+only the hourly buckets are decayed in Python, so the work per refresh is
+bounded by causes x window hours rather than by donation volume.
+
+The scores are materialised into CauseTrendingScore by the
+``refresh_trending_causes`` beat task; readers only ever touch that table.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import Causes, CauseTrendingScore
+
+
+def compute_trending_scores(now=None, window_hours=None, half_life_hours=None):
+    """Return ``{cause_id: (score, donation_count, amount)}`` for causes with recent donations."""
+    from donations.models import Donation
+
+    now = now or timezone.now()
+    window_hours = window_hours or settings.TRENDING_WINDOW_HOURS
+    half_life_hours = half_life_hours or settings.TRENDING_HALF_LIFE_HOURS
+
+    buckets = Donation.objects.filter(
+        status='completed',
+        donated_at__gte=now - timedelta(hours=window_hours),
+        donated_at__lte=now,
+    ).annotate(hour=TruncHour('donated_at')).order_by().values('cause_id', 'hour').annotate(
+        donations=Count('pk'),
+        amount=Sum('amount'),
+    )
+
+    scores = {}
+    for bucket in buckets:
+        # Age is measured to the middle of the hour bucket.
+        age_hours = max((now - bucket['hour']).total_seconds() / 3600 - 0.5, 0)
+        weight = 0.5 ** (age_hours / half_life_hours)
+        score, donations, amount = scores.get(bucket['cause_id'], (0.0, 0, Decimal('0')))
+        scores[bucket['cause_id']] = (
+            score + bucket['donations'] * weight,
+            donations + bucket['donations'],
+            amount + (bucket['amount'] or 0),
+        )
+    return scores
+
+
+def refresh_trending_scores(now=None):
+    """Recompute and store trending scores, dropping causes that fell out of the window."""
+    now = now or timezone.now()
+    rows = [
+        CauseTrendingScore(
+            cause_id=cause_id,
+            score=score,
+            recent_donation_count=donations,
+            recent_amount=amount,
+            computed_at=now,
+        )
+        for cause_id, (score, donations, amount) in compute_trending_scores(now).items()
+    ]
+
+    with transaction.atomic():
+        CauseTrendingScore.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['cause'],
+            update_fields=['score', 'recent_donation_count', 'recent_amount', 'computed_at'],
+        )
+        CauseTrendingScore.objects.exclude(computed_at=now).delete()
+    return len(rows)
+
+
+def trending_causes():
+    """Public causes with a trending score, best first."""
+    return Causes.objects.filter(trending__isnull=False) \
+        .exclude(status__in=Causes.HIDDEN_STATUSES) \
+        .select_related('trending') \
+        .order_by('-trending__score', 'pk')
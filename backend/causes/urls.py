@@ -8,6 +8,9 @@ from .views import (
     AdminCauseUpdateView,
     CauseListCreateView,
     CauseRetrieveUpdateView,
+    CauseSearchView,
+    CauseBatchView,
+    CauseTrendingView,
 )
 
 urlpatterns = [
@@ -15,6 +18,9 @@ urlpatterns = [
     path('<uuid:id>/', CauseRetrieveUpdateView.as_view(), name='cause_retrieve_update'),
     path('create/', CauseCreateView.as_view(), name='cause_create'),
     path('list/', CauseListView.as_view(), name='cause_list'),
+    path('search/', CauseSearchView.as_view(), name='cause_search'),
+    path('batch/', CauseBatchView.as_view(), name='cause_batch'),
+    path('trending/', CauseTrendingView.as_view(), name='cause_trending'),
     path('delete/<uuid:id>/', CauseDeleteView.as_view(), name='cause_delete'),
     path('details/<uuid:id>/', CauseDetailView.as_view(), name='cause_detail'),
     # path('admin/causes/', AdminCauseListView.as_view(), name='cause_admin_list'),
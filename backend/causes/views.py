@@ -1,3 +1,8 @@
+import base64
+import binascii
+import json
+import uuid
+
 from django.shortcuts import render
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -6,12 +11,157 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from django.views.decorators.cache import cache_page
+from rest_framework.pagination import _positive_int
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+
+from causehive.pagination import KeysetCursorPagination
 
+from .cache import cache_cause_detail, cache_cause_list, cause_validators, conditional_response
 from .models import Causes
 from .permissions import IsAdminService
+from .search import get_search_backend
 from .serializers import CausesSerializer
+from .trending import trending_causes
+
+
+HIDDEN_STATUSES = list(Causes.HIDDEN_STATUSES)
+
+# Columns read by CausesSerializer; anything left out would be lazily fetched per row.
+CAUSE_FIELDS = (
+    'id',
+    'name',
+    'description',
+    'category',
+    'organizer_id',
+    'status',
+    'created_at',
+    'updated_at',
+    'target_amount',
+    'current_amount',
+    'cover_image',
+    'cover_image_derivatives',
+    'rejection_reason',
+    'donation_count',
+    'donor_count',
+    'last_donation_at',
+)
+
+TRENDING_FIELDS = (
+    'trending__score',
+    'trending__recent_donation_count',
+    'trending__recent_amount',
+    'trending__computed_at',
+)
+
+# Status values the frontend sends that do not map 1:1 onto Causes.status
+STATUS_ALIASES = {
+    'live': list(Causes.LIVE_STATUSES),
+}
+
+
+def cause_queryset(fields=None, queryset=None, extra_columns=()):
+    """
+    Causes with only the columns needed to render ``fields`` (every serialized
+    field when None), plus the keyset pagination columns.
+    """
+    if fields is None:
+        columns = set(CAUSE_FIELDS)
+    else:
+        columns = CausesSerializer.columns_for(fields) | {'created_at', 'updated_at'}
+    related = [name for name in ('organizer_id', 'category') if name in columns]
+    if queryset is None:
+        queryset = Causes.objects.all()
+    return queryset.select_related(*related).only(*columns, *extra_columns)
+
+
+class SparseFieldsetMixin:
+    """Let GET requests choose output fields with ?view=compact, ?fields= and ?omit=."""
+
+    def get_requested_fields(self):
+        if self.request.method != 'GET':
+            return None
+        return CausesSerializer.requested_fields(self.request.query_params)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Emit ETag / Last-Modified on list and retrieve responses, and answer a
+    matching If-None-Match / If-Modified-Since with 304 before serializing.
+
+    Lists get an ETag only: when a cause leaves a page (deleted, rejected,
+    paused) and an older one takes its place, the newest updated_at on the
+    page does not move, so a Last-Modified date would vouch for a stale list.
+    """
+
+    def get_validators(self, causes, *variant):
+        request = self.request
+        return cause_validators(causes, request.get_full_path(), request.accepted_media_type, *variant)
+
+    def conditional(self, causes, render, *variant, dated=True):
+        etag, last_modified = self.get_validators(causes, *variant)
+        if not dated:
+            last_modified = None
+        not_modified = get_conditional_response(self.request._request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = render()
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional([instance], lambda: Response(self.get_serializer(instance).data))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            causes = list(queryset)
+            return self.conditional(causes, lambda: Response(self.get_serializer(causes, many=True).data), dated=False)
+
+        return self.conditional(
+            page,
+            lambda: self.get_paginated_response(self.get_serializer(page, many=True).data),
+            self.paginator.get_next_link(),
+            self.paginator.get_previous_link(),
+            dated=False,
+        )
+
+
+class CauseCursorPagination(KeysetCursorPagination):
+    page_size = 20
+    max_page_size = 100
+    ordering_field = 'created_at'
+    default_ordering = '-created_at'
+
+
+def filter_public_causes(queryset, params):
+    """Apply the public listing filters (?status=, ?category=) to a queryset."""
+    queryset = queryset.exclude(status__in=HIDDEN_STATUSES)
+
+    status_param = params.get('status')
+    if status_param:
+        statuses = STATUS_ALIASES.get(status_param, [status_param])
+        queryset = queryset.filter(status__in=statuses)
+
+    category = params.get('category')
+    if category:
+        try:
+            queryset = queryset.filter(category_id=uuid.UUID(str(category)))
+        except ValueError:
+            queryset = queryset.filter(category__slug=category)
+    return queryset
 
 
 # Create your views here.
@@ -23,59 +173,186 @@ class CauseCreateView(generics.CreateAPIView):
     def perform_create(self, serializer):
         serializer.save(organizer_id=self.request.user)
 
-class CauseListView(generics.ListAPIView):
+class CauseListView(ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = CausesSerializer
     permission_classes = [AllowAny]
+    pagination_class = CauseCursorPagination
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
+    @method_decorator(conditional_response)
+    @method_decorator(cache_cause_list)  # Invalidated whenever any cause changes
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
 
     def get_queryset(self):
-        # Optimize queryset: select_related/prefetch_related if organizer/category exist
-        return Causes.objects.exclude(status__in=['under_review', 'rejected']) \
-            .select_related('organizer_id', 'category') \
-            .only(
-                'id',
-                'name',
-                'description',
-                'category',
-                'organizer_id',
-                'status',
-                'created_at',
-                'target_amount',
-                'current_amount',
-                'cover_image',
-                'rejection_reason',
-            )
+        queryset = cause_queryset(self.get_requested_fields())
+        return filter_public_causes(queryset, self.request.query_params)
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        if not queryset.exists():
-            return Response({"message": "There are no active causes to display.", "results": []}, status=status.HTTP_200_OK)
-        return super().list(request, *args, **kwargs)
-
-class CauseDetailView(generics.RetrieveAPIView):
-    queryset = Causes.objects.select_related('organizer_id', 'category').only(
-        'id',
-        'name',
-        'description',
-        'category',
-        'organizer_id',
-        'status',
-        'created_at',
-        'target_amount',
-        'current_amount',
-        'cover_image',
-        'rejection_reason',
-    )
+class CauseDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
     serializer_class = CausesSerializer
     lookup_field = 'id'
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
+    def get_queryset(self):
+        return cause_queryset(self.get_requested_fields())
+
+    @method_decorator(conditional_response)
+    @method_decorator(cache_cause_detail)  # Invalidated whenever this cause changes
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
 
+class CauseSearchView(APIView):
+    """
+    Ranked full-text search over public causes: GET /api/causes/search/?q=
+
+    Results are ordered by relevance and paged with an opaque ``cursor`` that
+    encodes the (score, id) of the last hit, so deep pages cost the same as
+    the first.
+    """
+    permission_classes = [AllowAny]
+    page_size = 20
+    max_page_size = 50
+
+    @method_decorator(cache_cause_list)  # Shares the list generation
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'The q parameter is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page_size = _positive_int(request.query_params.get('page_size', self.page_size), strict=True, cutoff=self.max_page_size)
+        except ValueError:
+            page_size = self.page_size
+
+        try:
+            after = self._decode_cursor(request.query_params.get('cursor'))
+        except ValueError:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_404_NOT_FOUND)
+
+        hits = get_search_backend().search(query, page_size + 1, after=after)
+        has_more = len(hits) > page_size
+        hits = hits[:page_size]
+
+        fields = CausesSerializer.requested_fields(request.query_params)
+        causes = cause_queryset(fields).in_bulk([hit.cause_id for hit in hits])
+        matched = [(hit, causes[uuid.UUID(hit.cause_id)]) for hit in hits if uuid.UUID(hit.cause_id) in causes]
+        serializer = CausesSerializer([cause for _, cause in matched], many=True, fields=fields, context={'request': request})
+
+        results = []
+        for (hit, _), item in zip(matched, serializer.data):
+            item['search'] = {
+                'score': hit.score,
+                'title': hit.title_highlight,
+                'description': hit.description_highlight,
+            }
+            results.append(item)
+
+        next_link = None
+        if has_more and hits:
+            next_link = replace_query_param(
+                request.build_absolute_uri(), 'cursor', self._encode_cursor(hits[-1])
+            )
+        return Response({'next': next_link, 'results': results})
+
+    @staticmethod
+    def _encode_cursor(hit):
+        payload = json.dumps({'s': hit.score, 'id': hit.cause_id}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(token):
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            return float(payload['s']), str(uuid.UUID(payload['id']))
+        except (TypeError, KeyError, AttributeError, UnicodeEncodeError, binascii.Error) as exc:
+            raise ValueError('Invalid cursor') from exc
+
+class CauseBatchView(APIView):
+    """
+    Resolve many causes in one query.
+
+    GET /api/causes/batch/?ids=<uuid>,<uuid>,... or POST {"ids": [...]}.
+    Responds with the causes keyed by id; ids that are malformed, unknown or
+    not public are listed under ``missing``.
+    """
+    permission_classes = [AllowAny]
+    max_ids = 100
+
+    @method_decorator(cache_cause_list)  # GET only; shares the list generation
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def get(self, request):
+        ids = [value for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        return self.resolve(request, ids)
+
+    def post(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list):
+            return Response({'error': 'ids must be a list of cause ids.'}, status=status.HTTP_400_BAD_REQUEST)
+        return self.resolve(request, ids)
+
+    def resolve(self, request, ids):
+        requested = list(dict.fromkeys(str(value).strip() for value in ids))
+        if not requested:
+            return Response({'error': 'At least one id is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(requested) > self.max_ids:
+            return Response({'error': f'At most {self.max_ids} ids per request.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        valid = {}
+        for value in requested:
+            try:
+                valid[value] = uuid.UUID(value)
+            except ValueError:
+                pass
+
+        fields = CausesSerializer.requested_fields(request.query_params)
+        queryset = cause_queryset(fields).exclude(status__in=HIDDEN_STATUSES)
+        causes = queryset.in_bulk(list(valid.values()))
+
+        found = [causes[valid[value]] for value in requested if valid.get(value) in causes]
+        serializer = CausesSerializer(found, many=True, fields=fields, context={'request': request})
+        return Response({
+            'results': {item['id']: item for item in serializer.data},
+            'missing': [value for value in requested if valid.get(value) not in causes],
+        })
+
+class CauseTrendingView(APIView):
+    """
+    Public causes ranked by recent donation velocity: GET /api/causes/trending/
+
+    Reads the scores materialised by the refresh_trending_causes beat task, so
+    serving it is a single indexed join. Accepts the public listing filters.
+    """
+    permission_classes = [AllowAny]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = _positive_int(request.query_params.get('limit', self.default_limit), strict=True, cutoff=self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+
+        fields = CausesSerializer.requested_fields(request.query_params)
+        queryset = cause_queryset(fields, trending_causes(), extra_columns=TRENDING_FIELDS)
+        causes = list(filter_public_causes(queryset, request.query_params)[:limit])
+        serializer = CausesSerializer(causes, many=True, fields=fields, context={'request': request})
+
+        results = []
+        for cause, item in zip(causes, serializer.data):
+            item['trending'] = {
+                'score': cause.trending.score,
+                'recent_donation_count': cause.trending.recent_donation_count,
+                'recent_amount': str(cause.trending.recent_amount),
+                'computed_at': cause.trending.computed_at,
+            }
+            results.append(item)
+        return Response({'results': results})
+
 class CauseDeleteView(generics.DestroyAPIView):
     queryset = Causes.objects.all()
     serializer_class = CausesSerializer
@@ -87,8 +364,8 @@ class AdminCauseListView(generics.ListAPIView):
     permission_classes = [IsAdminService]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'created_at', 'organizer_id']
-    search_fields = ['title', 'category', 'description']
-    ordering_fields = ['created_at', 'title']
+    search_fields = ['name', 'description', 'category__name']
+    ordering_fields = ['created_at', 'name']
 
 class AdminCauseUpdateView(generics.UpdateAPIView):
     queryset = Causes.objects.all()
@@ -119,26 +396,15 @@ class AdminCauseApproveView(generics.UpdateAPIView):
             return Response({'error': 'Cause not found'}, status=404)
 
 
-class CauseListCreateView(generics.ListCreateAPIView):
+class CauseListCreateView(ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     serializer_class = CausesSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CauseCursorPagination
 
     def get_queryset(self):
-        base = Causes.objects.select_related('organizer_id', 'category').only(
-            'id',
-            'name',
-            'description',
-            'category',
-            'organizer_id',
-            'status',
-            'created_at',
-            'target_amount',
-            'current_amount',
-            'cover_image',
-            'rejection_reason',
-        )
+        base = cause_queryset(self.get_requested_fields())
         if self.request.method == 'GET':
-            return base.exclude(status__in=['under_review', 'rejected'])
+            return filter_public_causes(base, self.request.query_params)
         return base
 
     def perform_create(self, serializer):
@@ -147,25 +413,13 @@ class CauseListCreateView(generics.ListCreateAPIView):
         serializer.save(organizer_id=self.request.user)
 
 
-class CauseRetrieveUpdateView(generics.RetrieveUpdateAPIView):
+class CauseRetrieveUpdateView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = CausesSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     lookup_field = 'id'
 
     def get_queryset(self):
-        return Causes.objects.select_related('organizer_id', 'category').only(
-            'id',
-            'name',
-            'description',
-            'category',
-            'organizer_id',
-            'status',
-            'created_at',
-            'target_amount',
-            'current_amount',
-            'cover_image',
-            'rejection_reason',
-        )
+        return cause_queryset(self.get_requested_fields())
 
     def perform_update(self, serializer):
         instance = serializer.instance
@@ -0,0 +1,17 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from donations.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily donation rollups from the donations table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat, default=None,
+                            help='Only rebuild days from this date on (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups(since=options['since'])
+        self.stdout.write(f'Wrote {rows} daily donation rollups')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from donations.summaries import rebuild_donor_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild every donor's donation summary from the donations table"
+
+    def handle(self, *args, **options):
+        rows = rebuild_donor_summaries()
+        self.stdout.write(f'Wrote {rows} donor summaries')
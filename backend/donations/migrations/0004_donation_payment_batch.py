@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0003_outbox_event'),
+        ('payments', '0007_payment_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='payment_batch',
+            field=models.ForeignKey(blank=True, default=None, help_text='The checkout this donation was paid for in', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donations', to='payments.paymentbatch'),
+        ),
+    ]
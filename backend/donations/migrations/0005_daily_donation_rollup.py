@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    from donations.rollups import rebuild_rollups
+
+    rebuild_rollups(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('causes', '0010_applied_donation_event'),
+        ('donations', '0004_donation_payment_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyDonationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('donation_count', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('new_donor_count', models.PositiveIntegerField(default=0, help_text="Donations that were their donor's first completed one")),
+                ('cause_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='causes.causes')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'day'], name='donation_rollup_status_day')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'cause_id', 'status'), name='unique_daily_donation_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
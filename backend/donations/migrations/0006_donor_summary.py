@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_donor_summaries(apps, schema_editor):
+    from donations.summaries import rebuild_donor_summaries
+
+    rebuild_donor_summaries(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0005_daily_donation_rollup'),
+        ('users_n_auth', '0005_user_is_verified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonorSummary',
+            fields=[
+                ('user_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='donation_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('donation_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cause_count', models.PositiveIntegerField(default=0)),
+                ('first_donation_at', models.DateTimeField(blank=True, null=True)),
+                ('last_donation_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_donor_summaries, migrations.RunPython.noop),
+    ]
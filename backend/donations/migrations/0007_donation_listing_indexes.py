@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('causes', '0010_applied_donation_event'),
+        ('donations', '0006_donor_summary'),
+        ('payments', '0007_payment_batch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donated_at', 'id'], name='donations_d_donated_a63aef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['user_id', 'donated_at', 'id'], name='donations_d_user_id_4fbcde_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['status', 'donated_at', 'id'], name='donations_d_status_258f9f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['cause_id', 'donated_at', 'id'], name='donations_d_cause_i_912e06_idx'),
+        ),
+    ]
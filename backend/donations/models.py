@@ -1,6 +1,7 @@
 import uuid
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 
 # Create your models here.
 class Donation(models.Model):
@@ -18,4 +19,139 @@ class Donation(models.Model):
         ('failed', 'Failed')
     ], default='pending', db_index=True)
     recipient_id = models.ForeignKey('users_n_auth.User', db_index=True, editable=False, on_delete=models.CASCADE, related_name='donations_received', help_text='References the recipient user ID')
-    transaction_id = models.CharField(max_length=255, unique=True, null=True, blank=True)  # Unique transaction ID from payment gateway
\ No newline at end of file
+    transaction_id = models.CharField(max_length=255, unique=True, null=True, blank=True)  # Unique transaction ID from payment gateway
+    payment_batch = models.ForeignKey('payments.PaymentBatch', null=True, blank=True, default=None,
+                                      on_delete=models.SET_NULL, related_name='donations',
+                                      help_text='The checkout this donation was paid for in')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['donated_at', 'id']),  # Keyset pagination of the admin listing
+            models.Index(fields=['user_id', 'donated_at', 'id']),  # A donor's own listing
+            models.Index(fields=['status', 'donated_at', 'id']),
+            models.Index(fields=['cause_id', 'donated_at', 'id']),
+        ]
+
+    def mark_as_completed(self):
+        """
+        Mark the donation completed, fold it into its cause's statistics, the
+        daily rollups and its donor's summary and queue its donation.completed
+        event, all in one transaction. Returns False if it was already
+        completed.
+        """
+        from causes.stats import record_completed_donation
+
+        from . import rollups, summaries
+        from .outbox import donation_completed_event, enqueue_event
+
+        with transaction.atomic():
+            updated = Donation.objects.filter(pk=self.pk).exclude(status='completed').update(status='completed')
+            self.status = 'completed'
+            if not updated:
+                return False
+            record_completed_donation(self)
+            rollups.record_completion(self)
+            summaries.record_completion(self)
+            enqueue_event(settings.DONATION_EVENTS_STREAM, donation_completed_event(self))
+        return True
+
+    @classmethod
+    def complete_pending(cls, donations):
+        """
+        mark_as_completed for many donations at once: the pending donations in
+        ``donations`` are completed with one conditional UPDATE, then folded
+        into their causes' statistics, the daily rollups and their donors'
+        summaries and queued as donation.completed events.
+        Returns the donations this call completed.
+        """
+        from causes.stats import lock_donors, record_completed_donation
+
+        from . import rollups, summaries
+        from .outbox import donation_completed_event, enqueue_events
+
+        with transaction.atomic():
+            won = list(donations.filter(status='pending').select_for_update(of=('self',)).order_by('pk'))
+            if not won:
+                return []
+            cls.objects.filter(pk__in=[donation.pk for donation in won], status='pending').update(status='completed')
+            # All donors up front, in order, rather than one by one in the loop
+            lock_donors(donation.user_id_id for donation in won)
+            for i, donation in enumerate(won):
+                donation.status = 'completed'
+                # Count each donation as if the ones after it were still pending,
+                # as completing them one by one would
+                still_pending = [later.pk for later in won[i + 1:]]
+                record_completed_donation(donation, still_pending=still_pending)
+                rollups.record_completion(donation, still_pending=still_pending)
+                summaries.record_completion(donation, still_pending=still_pending)
+            enqueue_events(settings.DONATION_EVENTS_STREAM, [donation_completed_event(donation) for donation in won])
+        return won
+
+
+class DailyDonationRollup(models.Model):
+    """
+    Settled donations per day, cause and status: how many there were, how
+    much they came to and how many were a donor's first completed donation.
+    Maintained as donations settle (see donations/rollups.py), so admin
+    statistics read a few hundred rows instead of the donations table.
+    """
+    day = models.DateField()
+    cause_id = models.ForeignKey('causes.Causes', on_delete=models.CASCADE, related_name='daily_rollups')
+    status = models.CharField(max_length=20)
+    donation_count = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    new_donor_count = models.PositiveIntegerField(default=0, help_text="Donations that were their donor's first completed one")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'cause_id', 'status'], name='unique_daily_donation_rollup'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'day'], name='donation_rollup_status_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.cause_id_id} {self.status}: {self.donation_count}"
+
+
+class DonorSummary(models.Model):
+    """
+    A donor's completed donations: how many, their total, how many causes
+    they went to and when the first and last were made. Maintained as
+    donations complete (see donations/summaries.py) for the statistics
+    endpoint.
+    """
+    user_id = models.OneToOneField('users_n_auth.User', primary_key=True, on_delete=models.CASCADE,
+                                   related_name='donation_summary')
+    donation_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cause_count = models.PositiveIntegerField(default=0)
+    first_donation_at = models.DateTimeField(null=True, blank=True)
+    last_donation_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user_id_id}: {self.donation_count} donations"
+
+
+class OutboxEvent(models.Model):
+    """
+    A domain event waiting to be published to its stream.
+
+    Rows are written in the same transaction as the change they describe (see
+    donations/outbox.py), so an event exists if and only if that change
+    committed. The relay publishes pending rows in id order and stamps
+    ``delivered_at``.
+    """
+    id = models.BigAutoField(primary_key=True)
+    stream = models.CharField(max_length=100)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(delivered_at__isnull=True), name='outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payload.get('event')} #{self.pk}"
@@ -0,0 +1,81 @@
+"""
+Transactional outbox for domain events.
+
+Code that changes state calls ``enqueue_event`` inside its transaction, which
+costs one INSERT into OutboxEvent and commits or rolls back together with the
+change. ``relay_outbox_events`` (a periodic Celery task) drains pending rows in
+batches: each batch is locked with SKIP LOCKED so concurrent relays split the
+work, published to Redis in one pipeline and marked delivered with a single
+UPDATE.
+
+Delivery is at least once - a relay that dies after publishing but before its
+transaction commits republishes the batch - so every published event carries
+``id`` (``outbox-<row id>``) for consumers to deduplicate on.
+"""
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from causehive.streams import get_redis
+
+from .models import OutboxEvent
+
+DONATION_COMPLETED = 'donation.completed'
+
+
+def enqueue_event(stream, event):
+    """Queue ``event`` (a JSON-serialisable dict) for ``stream`` in the current transaction."""
+    return OutboxEvent.objects.create(stream=stream, payload=event)
+
+
+def enqueue_events(stream, events):
+    """enqueue_event for several events, in one INSERT."""
+    return OutboxEvent.objects.bulk_create([OutboxEvent(stream=stream, payload=event) for event in events])
+
+
+def donation_completed_event(donation):
+    return {
+        'event': DONATION_COMPLETED,
+        'data': {
+            'cause_id': str(donation.cause_id_id),
+            'amount': str(donation.amount),
+            'donation_id': str(donation.pk),
+        },
+    }
+
+
+def event_id(row):
+    return f'outbox-{row.pk}'
+
+
+def relay_pending_events(batch_size, client=None):
+    """Publish up to ``batch_size`` pending events in id order. Returns how many were delivered."""
+    with transaction.atomic():
+        rows = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(delivered_at__isnull=True)
+            .order_by('id')[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        pipe = (client or get_redis()).pipeline(transaction=False)
+        for row in rows:
+            pipe.xadd(
+                row.stream,
+                {'event': json.dumps({**row.payload, 'id': event_id(row)})},
+                maxlen=settings.EVENT_STREAM_MAXLEN,
+                approximate=True,
+            )
+        pipe.execute()
+
+        OutboxEvent.objects.filter(pk__in=[row.pk for row in rows]).update(delivered_at=timezone.now())
+    return len(rows)
+
+
+def prune_delivered_events(older_than):
+    """Delete events delivered before ``older_than``. Returns the number deleted."""
+    deleted, _ = OutboxEvent.objects.filter(delivered_at__lt=older_than).delete()
+    return deleted
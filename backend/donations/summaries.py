@@ -0,0 +1,131 @@
+"""
+Per-donor donation summaries.
+
+DonorSummary keeps, per user, the count and total of their completed
+donations, the number of causes they went to and the first/last donation
+times. ``record_completion`` folds each completed donation in, inside the
+transaction that completes it, and clears the donor's cached summary once
+that transaction commits. It locks the donor first (causes.stats.lock_donors)
+so concurrent completions for one donor cannot both count a new cause.
+
+``get_donor_summary`` serves the statistics endpoint: one cache read keyed
+on the user id, falling back to the user's single summary row.
+``rebuild_donor_summaries`` recomputes the rows from the donations table; the
+migration that adds the table runs it, and so does
+``manage.py backfill_donor_summaries`` for repairs.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DateTimeField, F, Max, Min, Sum, Value, When
+
+from causes.stats import lock_donors
+
+from .models import Donation, DonorSummary
+
+SUMMARY_FIELDS = ('donation_count', 'total_amount', 'cause_count', 'first_donation_at', 'last_donation_at')
+
+
+def summary_cache_key(user_id):
+    return f'donations:summary:{user_id}'
+
+
+def invalidate_donor_summaries(user_ids):
+    keys = [summary_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def record_completion(donation, still_pending=()):
+    """
+    Fold a newly completed donation into its donor's summary. ``still_pending``
+    is as for causes.stats.record_completed_donation.
+    """
+    if donation.user_id_id is None:
+        return
+
+    lock_donors([donation.user_id_id])
+    new_cause = not Donation.objects.filter(
+        user_id=donation.user_id_id,
+        cause_id=donation.cause_id_id,
+        status='completed',
+    ).exclude(pk=donation.pk).exclude(pk__in=still_pending).exists()
+
+    summary = DonorSummary.objects.filter(user_id=donation.user_id_id)
+    changes = {
+        'donation_count': F('donation_count') + 1,
+        'total_amount': F('total_amount') + donation.amount,
+        'cause_count': F('cause_count') + (1 if new_cause else 0),
+        'first_donation_at': Case(
+            When(first_donation_at__lte=donation.donated_at, then=F('first_donation_at')),
+            default=Value(donation.donated_at),
+            output_field=DateTimeField(),
+        ),
+        'last_donation_at': Case(
+            When(last_donation_at__gte=donation.donated_at, then=F('last_donation_at')),
+            default=Value(donation.donated_at),
+            output_field=DateTimeField(),
+        ),
+    }
+    if not summary.update(**changes):
+        try:
+            with transaction.atomic():
+                DonorSummary.objects.create(
+                    user_id_id=donation.user_id_id,
+                    donation_count=1,
+                    total_amount=donation.amount,
+                    cause_count=1,
+                    first_donation_at=donation.donated_at,
+                    last_donation_at=donation.donated_at,
+                )
+        except IntegrityError:
+            # Another transaction created the row first
+            summary.update(**changes)
+    invalidate_donor_summaries([donation.user_id_id])
+
+
+def get_donor_summary(user_id):
+    """The summary of ``user_id``'s completed donations, as a dict of SUMMARY_FIELDS."""
+    key = summary_cache_key(user_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = DonorSummary.objects.filter(user_id=user_id).values(*SUMMARY_FIELDS).first() or {
+            'donation_count': 0,
+            'total_amount': 0,
+            'cause_count': 0,
+            'first_donation_at': None,
+            'last_donation_at': None,
+        }
+        cache.set(key, summary, settings.DONOR_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def rebuild_donor_summaries(apps=None):
+    """
+    Recompute every donor's summary from completed donations. Returns the
+    number of rows written. ``apps`` is the historical app registry when
+    called from a migration; nothing is cached yet then, so no cache entries
+    are cleared.
+    """
+    Summary = apps.get_model('donations', 'DonorSummary') if apps else DonorSummary
+    Donations = apps.get_model('donations', 'Donation') if apps else Donation
+    grouped = Donations.objects.filter(status='completed', user_id__isnull=False).order_by() \
+        .values('user_id').annotate(
+            donation_count=Count('pk'),
+            total_amount=Sum('amount'),
+            cause_count=Count('cause_id', distinct=True),
+            first_donation_at=Min('donated_at'),
+            last_donation_at=Max('donated_at'),
+        )
+    summaries = [
+        Summary(user_id_id=row['user_id'], **{field: row[field] for field in SUMMARY_FIELDS})
+        for row in grouped
+    ]
+
+    with transaction.atomic():
+        user_ids = set(Summary.objects.values_list('user_id', flat=True))
+        user_ids.update(summary.user_id_id for summary in summaries)
+        Summary.objects.all().delete()
+        Summary.objects.bulk_create(summaries, batch_size=1000)
+        if apps is None:
+            invalidate_donor_summaries(user_ids)
+    return len(summaries)
@@ -1,22 +1,30 @@
-import json
-import redis
+from datetime import timedelta
+
 from django.conf import settings
+from django.utils import timezone
 
 from causehive.celery import app
 from donations.email_utils import send_donation_successful_email
 from donations.models import Donation
+from donations.outbox import prune_delivered_events, relay_pending_events
+
+
+@app.task
+def relay_outbox_events():
+    """Publish pending outbox events batch by batch until the outbox is drained."""
+    batch_size = settings.OUTBOX_RELAY_BATCH_SIZE
+    relayed = 0
+    for _ in range(settings.OUTBOX_RELAY_MAX_BATCHES):
+        delivered = relay_pending_events(batch_size)
+        relayed += delivered
+        if delivered < batch_size:
+            break
+    return relayed
+
 
 @app.task
-def publish_donation_completed_event(cause_id, amount):
-    r = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0)
-    event = {
-        "event": "donation.completed",
-        "data": {
-            "cause_id": str(cause_id),
-            "amount": float(amount)
-        }
-    }
-    r.publish('donation_events', json.dumps(event))
+def prune_outbox_events():
+    return prune_delivered_events(timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS))
 
 
 @app.task
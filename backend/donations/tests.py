@@ -2,7 +2,7 @@
 import uuid
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
-from django.test import TestCase, override_settings
+from django.test import TestCase, override_settings, skipUnlessDBFeature
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -407,4 +407,348 @@ class DonationIntegrationTestCase(APITestCase):
                 mock_aggregate.return_value = {'amount__sum': Decimal('150.00')}
                 stats_response = self.client.get('/api/donations/statistics/')
                 self.assertEqual(stats_response.status_code, status.HTTP_200_OK)
-                self.assertEqual(stats_response.data['total_donations'], 1)
\ No newline at end of file
+                self.assertEqual(stats_response.data['total_donations'], 1)
+
+class OutboxTestCase(TestCase):
+    """Test cases for the transactional outbox"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        User = get_user_model()
+        self.organizer = User.objects.create_user(email='outbox-organizer@example.com', password='testpass123')
+        self.cause = Causes.objects.create(
+            name='Outbox Cause',
+            category=Category.objects.create(name='Outbox', description='Outbox causes'),
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status='ongoing',
+        )
+
+    def _donation(self, amount='25.00'):
+        return Donation.objects.create(cause_id=self.cause, recipient_id=self.organizer, amount=Decimal(amount))
+
+    def test_completion_queues_one_event(self):
+        from .models import OutboxEvent
+
+        donation = self._donation()
+        self.assertTrue(donation.mark_as_completed())
+        self.assertFalse(donation.mark_as_completed())
+
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.delivered_at)
+        self.assertEqual(event.payload, {
+            'event': 'donation.completed',
+            'data': {'cause_id': str(self.cause.id), 'amount': '25.00', 'donation_id': str(donation.id)},
+        })
+
+    def test_rolled_back_completion_queues_nothing(self):
+        from django.db import transaction
+        from .models import OutboxEvent
+
+        donation = self._donation()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                donation.mark_as_completed()
+                raise RuntimeError('payment save failed')
+
+        self.assertFalse(OutboxEvent.objects.exists())
+        donation.refresh_from_db()
+        self.assertEqual(donation.status, 'pending')
+
+    @override_settings(OUTBOX_RELAY_BATCH_SIZE=2)
+    def test_relay_publishes_in_batches_and_marks_delivered(self):
+        import json
+        from .models import OutboxEvent
+        from .tasks import relay_outbox_events
+
+        donations = [self._donation() for _ in range(3)]
+        for donation in donations:
+            donation.mark_as_completed()
+
+        client = MagicMock()
+        with patch('donations.outbox.get_redis', return_value=client):
+            self.assertEqual(relay_outbox_events(), 3)
+            self.assertEqual(relay_outbox_events(), 0)
+
+        pipe = client.pipeline.return_value
+        self.assertEqual(pipe.execute.call_count, 2)
+        published = [json.loads(call.args[1]['event']) for call in pipe.xadd.call_args_list]
+        self.assertEqual([event['data']['donation_id'] for event in published], [str(d.id) for d in donations])
+        self.assertEqual([event['id'] for event in published], [f'outbox-{pk}' for pk in OutboxEvent.objects.order_by('id').values_list('pk', flat=True)])
+        self.assertFalse(OutboxEvent.objects.filter(delivered_at__isnull=True).exists())
+
+    def test_failed_publish_leaves_events_pending(self):
+        from .models import OutboxEvent
+        from .tasks import relay_outbox_events
+
+        self._donation().mark_as_completed()
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = ConnectionError('redis is down')
+        with patch('donations.outbox.get_redis', return_value=client):
+            with self.assertRaises(ConnectionError):
+                relay_outbox_events()
+
+        self.assertTrue(OutboxEvent.objects.filter(delivered_at__isnull=True).exists())
+
+
+class DailyRollupTestCase(TestCase):
+    """Test cases for the daily donation rollups"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        User = get_user_model()
+        self.organizer = User.objects.create_user(email='rollup-organizer@example.com', password='testpass123')
+        self.donors = [
+            User.objects.create_user(email=f'rollup-donor{i}@example.com', password='testpass123') for i in range(2)
+        ]
+        category = Category.objects.create(name='Rollups', description='Rollup causes')
+        self.causes = [
+            Causes.objects.create(name=f'Rollup Cause {i}', category=category, organizer_id=self.organizer,
+                                  target_amount=Decimal('1000.00'), status='ongoing')
+            for i in range(2)
+        ]
+
+    def _donation(self, cause, user, amount, days_ago):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        donation = Donation.objects.create(cause_id=cause, user_id=user, recipient_id=self.organizer,
+                                           amount=Decimal(amount))
+        Donation.objects.filter(pk=donation.pk).update(donated_at=timezone.now() - timedelta(days=days_ago))
+        donation.refresh_from_db()
+        return donation
+
+    def _rollups(self):
+        from .models import DailyDonationRollup
+
+        return sorted(DailyDonationRollup.objects.values_list(
+            'day', 'cause_id', 'status', 'donation_count', 'amount', 'new_donor_count',
+        ))
+
+    def _settle_some(self):
+        from payments.state import fail_donations
+
+        first, second = self.causes
+        self._donation(first, self.donors[0], '10.00', 3).mark_as_completed()
+        self._donation(first, self.donors[0], '15.00', 3).mark_as_completed()
+        self._donation(second, None, '5.00', 3).mark_as_completed()
+        batch = [self._donation(first, self.donors[1], '20.00', 1), self._donation(second, self.donors[1], '30.00', 1)]
+        Donation.complete_pending(Donation.objects.filter(pk__in=[d.pk for d in batch]))
+        failed = self._donation(second, self.donors[0], '40.00', 1)
+        fail_donations(Donation.objects.filter(pk=failed.pk))
+        self._donation(second, self.donors[0], '50.00', 0)  # still pending
+
+    def test_incremental_rollups_match_backfill(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        self._settle_some()
+        incremental = self._rollups()
+        self.assertEqual(len(incremental), 5)
+        self.assertEqual(sum(row[3] for row in incremental if row[2] == 'completed'), 5)
+        self.assertEqual(sum(row[5] for row in incremental), 2)
+
+        call_command('backfill_donation_rollups', stdout=StringIO())
+        self.assertEqual(self._rollups(), incremental)
+
+    def test_new_donor_credit_moves_only_where_it_is_held(self):
+        from .models import DailyDonationRollup
+
+        self._donation(self.causes[0], self.donors[0], '10.00', 1).mark_as_completed()
+        # A row that never got the credit, e.g. written before a backfill
+        DailyDonationRollup.objects.update(new_donor_count=0)
+
+        self._donation(self.causes[1], self.donors[0], '20.00', 3).mark_as_completed()
+        self.assertEqual(sorted(DailyDonationRollup.objects.values_list('cause_id', 'new_donor_count')),
+                         sorted([(self.causes[0].pk, 0), (self.causes[1].pk, 1)]))
+
+    @override_settings(ADMIN_SERVICE_API_KEY='test-key')
+    def test_admin_statistics_read_rollups(self):
+        from rest_framework.test import APIRequestFactory
+        from .views import AdminDonationStatisticsView
+
+        self._settle_some()
+        request = APIRequestFactory().get('/', HTTP_X_ADMIN_SERVICE_API_KEY='test-key')
+        response = AdminDonationStatisticsView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_donations'], 5)
+        self.assertEqual(response.data['total_amount'], Decimal('80.00'))
+        self.assertEqual(response.data['total_users'], 2)
+        self.assertEqual(response.data['total_causes'], 2)
+
+    def test_admin_dashboard_reads_rollups(self):
+        self._settle_some()
+        Donation.objects.update(amount=Decimal('0.01'))  # the dashboard must not read donations
+        admin = get_user_model().objects.create_superuser(email='rollup-admin@example.com', password='testpass123')
+        self.client.force_login(admin)
+
+        response = self.client.get('/admin/dashboard/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.context['donation_stats']
+        self.assertEqual((stats['total_count'], stats['total_amount']), (5, Decimal('80.00')))
+        self.assertEqual(stats['avg_amount'], Decimal('16.00'))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DonorSummaryTestCase(APITestCase):
+    """Test cases for the per-donor statistics"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        cache.clear()
+        User = get_user_model()
+        self.organizer = User.objects.create_user(email='summary-organizer@example.com', password='testpass123')
+        self.donors = [
+            User.objects.create_user(email=f'summary-donor{i}@example.com', password='testpass123') for i in range(2)
+        ]
+        category = Category.objects.create(name='Summaries', description='Summary causes')
+        self.causes = [
+            Causes.objects.create(name=f'Summary Cause {i}', category=category, organizer_id=self.organizer,
+                                  target_amount=Decimal('1000.00'), status='ongoing')
+            for i in range(2)
+        ]
+
+    def _donation(self, cause, user, amount):
+        return Donation.objects.create(cause_id=cause, user_id=user, recipient_id=self.organizer,
+                                       amount=Decimal(amount))
+
+    def _statistics(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/donations/statistics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_statistics_are_per_donor_and_invalidated_on_completion(self):
+        first, second = self.causes
+        with self.captureOnCommitCallbacks(execute=True):
+            self._donation(first, self.donors[0], '10.00').mark_as_completed()
+            self._donation(first, self.donors[0], '15.00').mark_as_completed()
+        self._donation(second, self.donors[0], '99.00')  # pending, not counted
+
+        stats = self._statistics(self.donors[0])
+        self.assertEqual(stats['total_donations'], 2)
+        self.assertEqual(stats['total_amount'], Decimal('25.00'))
+        self.assertEqual(stats['causes_supported'], 1)
+        self.assertEqual(self._statistics(self.donors[1])['total_donations'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            batch = [self._donation(second, self.donors[0], '5.00'), self._donation(second, self.donors[1], '7.00')]
+            Donation.complete_pending(Donation.objects.filter(pk__in=[d.pk for d in batch]))
+
+        stats = self._statistics(self.donors[0])
+        self.assertEqual(stats['total_donations'], 3)
+        self.assertEqual(stats['causes_supported'], 2)
+        self.assertEqual(stats['last_donation_at'], batch[0].donated_at)
+        self.assertEqual(self._statistics(self.donors[1])['total_amount'], Decimal('7.00'))
+
+    def test_cached_statistics_skip_the_database(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._statistics(self.donors[0])
+        with CaptureQueriesContext(connection) as queries:
+            self._statistics(self.donors[0])
+        self.assertFalse([q for q in queries.captured_queries if 'donorsummary' in q['sql']])
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_donor_is_locked_before_counting_new_causes(self):
+        from django.db import connection, transaction
+        from django.test.utils import CaptureQueriesContext
+        from .summaries import record_completion
+
+        donation = self._donation(self.causes[0], self.donors[0], '10.00')
+        Donation.objects.filter(pk=donation.pk).update(status='completed')
+        with transaction.atomic(), CaptureQueriesContext(connection) as queries:
+            record_completion(donation)
+
+        sql = [query['sql'] for query in queries.captured_queries]
+        lock = next(i for i, q in enumerate(sql) if 'FOR UPDATE' in q and get_user_model()._meta.db_table in q)
+        count = next(i for i, q in enumerate(sql) if q.startswith('SELECT 1 AS') and Donation._meta.db_table in q)
+        self.assertLess(lock, count)
+
+    def test_backfill_matches_incremental(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from .models import DonorSummary
+
+        for cause, user, amount in [(self.causes[0], self.donors[0], '10.00'), (self.causes[1], self.donors[0], '20.00'),
+                                    (self.causes[1], self.donors[1], '30.00'), (self.causes[1], None, '40.00')]:
+            self._donation(cause, user, amount).mark_as_completed()
+        fields = ('user_id', 'donation_count', 'total_amount', 'cause_count', 'first_donation_at', 'last_donation_at')
+        incremental = sorted(DonorSummary.objects.values_list(*fields))
+
+        call_command('backfill_donor_summaries', stdout=StringIO())
+        self.assertEqual(sorted(DonorSummary.objects.values_list(*fields)), incremental)
+
+
+class DonationKeysetPaginationTestCase(APITestCase):
+    """Test cases for cursor pagination of the donation listings"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+        from django.utils import timezone
+
+        User = get_user_model()
+        self.organizer = User.objects.create_user(email='listing-organizer@example.com', password='testpass123')
+        self.donor = User.objects.create_user(email='listing-donor@example.com', password='testpass123')
+        self.cause = Causes.objects.create(
+            name='Listing Cause',
+            category=Category.objects.create(name='Listings', description='Listing causes'),
+            organizer_id=self.organizer,
+            target_amount=Decimal('1000.00'),
+            status='ongoing',
+        )
+        self.donations = [
+            Donation.objects.create(cause_id=self.cause, user_id=self.donor, recipient_id=self.organizer,
+                                    amount=Decimal('10.00'), status='completed' if i % 2 else 'pending')
+            for i in range(5)
+        ]
+        Donation.objects.create(cause_id=self.cause, user_id=self.organizer, recipient_id=self.organizer,
+                                amount=Decimal('10.00'))
+        # Identical timestamps force the id tie-breaker to do its job.
+        Donation.objects.update(donated_at=timezone.now())
+        self.client.force_authenticate(user=self.donor)
+
+    def _walk(self, params):
+        ids = []
+        response = self.client.get('/api/donations/', params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_pages_cover_the_donors_donations_once(self):
+        ids = self._walk({'page_size': 2})
+        self.assertEqual(sorted(ids), sorted(str(d.id) for d in self.donations))
+        self.assertEqual(ids, list(reversed(self._walk({'page_size': 2, 'ordering': 'donated_at'}))))
+
+    def test_status_filter(self):
+        self.assertEqual(len(self._walk({'page_size': 1, 'status': 'completed'})), 2)
+
+    def test_unsupported_ordering_is_rejected(self):
+        for ordering in ('amount', '-amount', 'donated_at,amount'):
+            response = self.client.get('/api/donations/', {'ordering': ordering})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('donated_at', response.data['detail'])
+
+    def test_estimated_total_on_request(self):
+        from django.db import connection
+
+        response = self.client.get('/api/donations/', {'page_size': 2})
+        self.assertNotIn('total_estimate', response.data)
+
+        response = self.client.get('/api/donations/', {'page_size': 2, 'estimate_total': '1'})
+        if connection.vendor == 'postgresql':
+            self.assertIsInstance(response.data['total_estimate'], int)
+        else:
+            self.assertIsNone(response.data['total_estimate'])
@@ -1,35 +1,34 @@
 from django.db.models import Sum, Count
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
 from rest_framework.response import Response
 from rest_framework import viewsets, permissions, generics
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.status import HTTP_201_CREATED
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import SearchFilter
 from rest_framework.views import APIView
 
+from causehive.pagination import KeysetCursorPagination
+
 from .permissions import IsAdminService
-from .models import Donation
+from .models import DailyDonationRollup, Donation
 from .serializers import DonationSerializer
+from .summaries import get_donor_summary
 
-class DonationPagination(PageNumberPagination):
+class DonationCursorPagination(KeysetCursorPagination):
     page_size = 10
-    page_size_query_param = 'page_size'
     max_page_size = 100
+    ordering_field = 'donated_at'
+    default_ordering = '-donated_at'
 
 # Create your views here.
 class DonationViewSet(viewsets.ModelViewSet):
     queryset = Donation.objects.all()  # Base queryset for router
     serializer_class = DonationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DonationPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = DonationCursorPagination  # Orders by ?ordering=[-]donated_at
+    filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['status', 'cause_id']
     search_fields = ['cause_id__name']
-    ordering_fields = ['donated_at', 'amount']
-    ordering = ['-donated_at']
 
     def get_queryset(self):
         """
@@ -61,35 +60,43 @@ class DonationViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=HTTP_201_CREATED)
 
     @action(detail=False, methods=['get'])
-    @method_decorator(cache_page(60))  # Cache statistics for 1 minute
     def statistics(self, request):
-        queryset = self.get_queryset()
-        total_donations = queryset.count()
-        total_amount = queryset.aggregate(Sum('amount'))['amount__sum'] or 0
+        """The authenticated donor's completed donations, from their cached DonorSummary."""
+        summary = get_donor_summary(request.user.id)
         return Response({
-            'total_amount': total_amount,
-            'total_donations': total_donations,
+            'total_amount': summary['total_amount'],
+            'total_donations': summary['donation_count'],
+            'causes_supported': summary['cause_count'],
+            'first_donation_at': summary['first_donation_at'],
+            'last_donation_at': summary['last_donation_at'],
         })
 
 class AdminDonationListView(generics.ListAPIView):
     queryset = Donation.objects.select_related('user_id', 'cause_id', 'recipient_id').all()
     serializer_class = DonationSerializer
     permission_classes = [IsAdminService]
-    pagination_class = DonationPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = DonationCursorPagination  # Orders by ?ordering=[-]donated_at
+    filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['user_id', 'cause_id', 'status', 'donated_at']
     search_fields = ['user_id__email', 'cause_id__name', 'transaction_id']
-    ordering_fields = ['donated_at', 'amount']
-    ordering = ['-donated_at']
 
 class AdminDonationStatisticsView(APIView):
+    """Totals over completed donations (pending and failed ones are not counted)."""
     permission_classes = [IsAdminService]
 
     def get(self, request):
-        total_donations = Donation.objects.count()
-        total_amount = Donation.objects.aggregate(Sum('amount'))['amount__sum'] or 0
-        total_users = Donation.objects.values('user_id').distinct().count()
-        total_causes = Donation.objects.values('cause_id').distinct().count()
+        # Completed donations, summed from the daily rollups
+        rollups = DailyDonationRollup.objects.filter(status='completed')
+        totals = rollups.aggregate(
+            total_donations=Sum('donation_count'),
+            total_amount=Sum('amount'),
+            total_users=Sum('new_donor_count'),
+            total_causes=Count('cause_id', distinct=True),
+        )
+        total_donations = totals['total_donations'] or 0
+        total_amount = totals['total_amount'] or 0
+        total_users = totals['total_users'] or 0
+        total_causes = totals['total_causes']
 
         return Response({
             'total_donations': total_donations,
@@ -58,10 +58,10 @@ class NotificationService:
         )
     
     @staticmethod
-    def notify_new_donation(donation):
-        """Notify when a new donation is made"""
+    def new_donation_notification(donation):
+        """The (unsaved) notification for a new donation"""
         donor_name = donation.user_id.get_full_name() if donation.user_id else "Anonymous"
-        return NotificationService.create_notification(
+        return AdminNotification(
             title=f"New Donation: GHS {donation.amount:,.2f}",
             message=f"New donation of GHS {donation.amount:,.2f} received for '{donation.cause_id.name}' by {donor_name}",
             notification_type='new_donation',
@@ -70,6 +70,20 @@ class NotificationService:
             user=donation.user_id,
             donation=donation
         )
+
+    @staticmethod
+    def notify_new_donation(donation):
+        """Notify when a new donation is made"""
+        notification = NotificationService.new_donation_notification(donation)
+        notification.save()
+        return notification
+
+    @staticmethod
+    def notify_new_donations(donations):
+        """notify_new_donation for donations created with bulk_create, which sends no post_save"""
+        return AdminNotification.objects.bulk_create(
+            [NotificationService.new_donation_notification(donation) for donation in donations]
+        )
     
     @staticmethod
     def notify_withdrawal_request(withdrawal):
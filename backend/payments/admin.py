@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PaymentTransaction
+from .models import PaymentTransaction, PaystackWebhookEvent
 
 # Register your models here.
 @admin.register(PaymentTransaction)
@@ -35,3 +35,11 @@ class PaymentTransactionAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('user_id', 'donation__cause_id')
+
+
+@admin.register(PaystackWebhookEvent)
+class PaystackWebhookEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'event', 'reference', 'received_at', 'processed_at', 'attempts')
+    list_filter = ('event', 'processed_at')
+    search_fields = ('reference', 'event_key')
+    readonly_fields = ('event_key', 'event', 'reference', 'payload', 'received_at', 'processed_at', 'attempts', 'last_error')
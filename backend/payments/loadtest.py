@@ -0,0 +1,177 @@
+"""
+End-to-end load test of the payment flows.
+
+``manage.py payment_load_test`` drives a running CauseHive server over HTTP,
+normally with PAYSTACK_BASE_URL pointing at ``manage.py paystack_simulator``:
+
+* donate   - POST /api/cart/donate/ (anonymous donor)
+* checkout - POST /api/cart/add/ (setup, not timed), then POST /api/cart/checkout/
+* verify   - GET /api/payments/verify/<reference>/ for references the
+             donate/checkout flows created
+* webhook  - POST /api/payments/webhook/ with a signed charge.success event
+             for those references
+
+Each flow runs to completion before the next starts, with ``concurrency``
+requests in flight, and reports p50/p95/p99 latency and throughput.
+"""
+import json
+import math
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import requests
+
+from .simulator import sign
+
+FLOWS = ('donate', 'checkout', 'verify', 'webhook')
+REPLAY_FLOWS = ('verify', 'webhook')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list; None when it is empty."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class FlowResult:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.statuses = Counter()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, status, latency):
+        with self._lock:
+            self.statuses[status] += 1
+            if isinstance(status, int) and 200 <= status < 300:
+                self.latencies.append(latency)
+
+    @property
+    def requests(self):
+        return sum(self.statuses.values())
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+
+        def to_ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        return {
+            'flow': self.name,
+            'requests': self.requests,
+            'ok': len(latencies),
+            'errors': self.requests - len(latencies),
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            'p50_ms': to_ms(percentile(latencies, 50)),
+            'p95_ms': to_ms(percentile(latencies, 95)),
+            'p99_ms': to_ms(percentile(latencies, 99)),
+            'throughput_rps': round(self.requests / self.elapsed, 2) if self.elapsed else None,
+        }
+
+
+class PaymentLoadTest:
+    def __init__(self, base_url, cause_ids, secret_key, *, concurrency=10, amount='10.00', timeout=30.0):
+        self.base_url = base_url.rstrip('/')
+        self.cause_ids = [str(cause_id) for cause_id in cause_ids]
+        self.secret_key = secret_key
+        self.concurrency = concurrency
+        self.amount = amount
+        self.timeout = timeout
+        self.references = []
+        self._references_lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def run(self, flows, requests_per_flow):
+        results = []
+        for name in flows:
+            if name in REPLAY_FLOWS:
+                calls = [(reference,) for reference in self.references[:requests_per_flow]]
+            else:
+                calls = [(i,) for i in range(requests_per_flow)]
+            results.append(self.run_flow(name, getattr(self, name), calls))
+        return results
+
+    def run_flow(self, name, call, calls):
+        result = FlowResult(name)
+
+        def timed(args):
+            try:
+                status, latency = call(*args)
+            except requests.RequestException as exc:
+                status, latency = type(exc).__name__, None
+            result.record(status, latency)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(timed, calls))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _timed(self, method, path, **kwargs):
+        started = time.perf_counter()
+        response = self.session.request(method, f'{self.base_url}{path}', timeout=self.timeout, **kwargs)
+        return response, time.perf_counter() - started
+
+    def _keep_reference(self, response):
+        try:
+            reference = response.json().get('reference')
+        except ValueError:
+            return
+        if reference:
+            with self._references_lock:
+                self.references.append(reference)
+
+    def _cause(self, i):
+        return self.cause_ids[i % len(self.cause_ids)]
+
+    def donate(self, i):
+        response, latency = self._timed('POST', '/api/cart/donate/', json={
+            'cause_id': self._cause(i),
+            'donation_amount': self.amount,
+            'email': f'loadtest+donate{i}@example.com',
+        })
+        self._keep_reference(response)
+        return response.status_code, latency
+
+    def checkout(self, i):
+        added = self.session.post(f'{self.base_url}/api/cart/add/', timeout=self.timeout, json={
+            'cause_id': self._cause(i),
+            'donation_amount': self.amount,
+        })
+        if added.status_code != 201:
+            return f'add {added.status_code}', None
+
+        response, latency = self._timed('POST', '/api/cart/checkout/', json={
+            'cart_id': added.json()['cart_id'],
+            'email': f'loadtest+checkout{i}@example.com',
+        })
+        self._keep_reference(response)
+        return response.status_code, latency
+
+    def verify(self, reference):
+        response, latency = self._timed('GET', f'/api/payments/verify/{reference}/')
+        return response.status_code, latency
+
+    def webhook(self, reference):
+        body = json.dumps({
+            'event': 'charge.success',
+            'data': {'reference': reference, 'status': 'success', 'currency': 'GHS',
+                     'amount': int(Decimal(self.amount) * 100)},
+        }).encode()
+        response, latency = self._timed('POST', '/api/payments/webhook/', data=body, headers={
+            'Content-Type': 'application/json',
+            'x-paystack-signature': sign(body, self.secret_key),
+        })
+        return response.status_code, latency
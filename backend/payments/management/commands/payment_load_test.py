@@ -0,0 +1,67 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from causes.models import Causes
+from payments.loadtest import FLOWS, REPLAY_FLOWS, PaymentLoadTest
+
+
+class Command(BaseCommand):
+    help = ('Load test the donate, checkout, verify and webhook flows of a running server '
+            '(use with manage.py paystack_simulator)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000',
+                            help='Root URL of the CauseHive server under test')
+        parser.add_argument('--flows', default=','.join(FLOWS),
+                            help=f"Comma-separated flows to run, in order (default: {','.join(FLOWS)})")
+        parser.add_argument('--requests', type=int, default=100, help='Requests per flow')
+        parser.add_argument('--concurrency', type=int, default=10, help='Requests in flight per flow')
+        parser.add_argument('--cause', action='append', dest='cause_ids', default=[],
+                            help='Donate to this cause id (repeatable; default: up to 20 live causes)')
+        parser.add_argument('--amount', default='10.00', help='Amount of each donation')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        flows = [flow.strip() for flow in options['flows'].split(',') if flow.strip()]
+        unknown = set(flows) - set(FLOWS)
+        if unknown:
+            raise CommandError(f"Unknown flows: {', '.join(sorted(unknown))}")
+        if set(flows) & set(REPLAY_FLOWS) and not set(flows) - set(REPLAY_FLOWS):
+            raise CommandError('verify and webhook replay references created by the donate or checkout flows')
+
+        cause_ids = options['cause_ids'] or list(
+            Causes.objects.filter(status__in=Causes.LIVE_STATUSES).values_list('id', flat=True)[:20]
+        )
+        if not cause_ids:
+            raise CommandError('No live causes to donate to; pass --cause')
+
+        load_test = PaymentLoadTest(
+            options['base_url'],
+            cause_ids,
+            settings.PAYSTACK_SECRET_KEY,
+            concurrency=options['concurrency'],
+            amount=options['amount'],
+            timeout=options['timeout'],
+        )
+        summaries = [result.summary() for result in load_test.run(flows, options['requests'])]
+
+        if options['json']:
+            self.stdout.write(json.dumps(summaries, indent=2))
+            return
+
+        header = f"{'flow':<10}{'requests':>10}{'ok':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for summary in summaries:
+            cells = [summary[key] if summary[key] is not None else '-'
+                     for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps')]
+            self.stdout.write(
+                f"{summary['flow']:<10}{summary['requests']:>10}{summary['ok']:>8}{summary['errors']:>8}"
+                + ''.join(f'{cell:>10}' for cell in cells)
+            )
+        for summary in summaries:
+            if summary['errors']:
+                self.stdout.write(self.style.WARNING(f"{summary['flow']} responses: {summary['statuses']}"))
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payments.simulator import PaystackSimulator
+
+
+class Command(BaseCommand):
+    help = 'Run a local Paystack-compatible API for development and load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8100)
+        parser.add_argument('--latency-ms', type=float, default=0.0,
+                            help='Base response delay in milliseconds')
+        parser.add_argument('--jitter-ms', type=float, default=0.0,
+                            help='Uniform +/- jitter added to the base delay')
+        parser.add_argument('--spike-rate', type=float, default=0.0,
+                            help='Fraction of responses that get an extra --spike-ms of delay')
+        parser.add_argument('--spike-ms', type=float, default=0.0)
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Fraction of calls answered with --error-status')
+        parser.add_argument('--error-status', type=int, default=503)
+        parser.add_argument('--decline-rate', type=float, default=0.0,
+                            help='Fraction of transactions and transfers that end up failed')
+        parser.add_argument('--webhook-url', default=None,
+                            help='POST signed charge/transfer events here, e.g. '
+                                 'http://127.0.0.1:8000/api/payments/webhook/')
+        parser.add_argument('--webhook-delay', type=float, default=0.5,
+                            help='Seconds between initializing a transaction and its webhook')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Seed the fault injection for reproducible runs')
+
+    def handle(self, *args, **options):
+        simulator = PaystackSimulator(
+            settings.PAYSTACK_SECRET_KEY,
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            spike_rate=options['spike_rate'],
+            spike_ms=options['spike_ms'],
+            error_rate=options['error_rate'],
+            error_status=options['error_status'],
+            decline_rate=options['decline_rate'],
+            webhook_url=options['webhook_url'],
+            webhook_delay=options['webhook_delay'],
+            seed=options['seed'],
+        )
+        server = simulator.make_server(options['host'], options['port'])
+        host, port = server.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(
+            f'Paystack simulator listening on http://{host}:{port} '
+            f'(set PAYSTACK_BASE_URL=http://{host}:{port} on the app)'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
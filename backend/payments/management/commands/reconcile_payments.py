@@ -0,0 +1,30 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from payments.reconciliation import reconcile_pending_payments
+
+
+class Command(BaseCommand):
+    help = 'Verify payments stuck in pending with Paystack and settle them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=settings.PAYMENT_RECONCILE_AFTER_MINUTES,
+                            help='Only payments pending for at least this many minutes')
+        parser.add_argument('--chunk-size', type=int, default=settings.PAYMENT_RECONCILE_CHUNK_SIZE,
+                            help='Payments read and settled per chunk')
+        parser.add_argument('--concurrency', type=int, default=settings.PAYMENT_RECONCILE_CONCURRENCY,
+                            help='Paystack verifications in flight')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many payments')
+
+    def handle(self, *args, **options):
+        summary = reconcile_pending_payments(
+            timezone.now() - timedelta(minutes=options['older_than']),
+            chunk_size=options['chunk_size'],
+            concurrency=options['concurrency'],
+            limit=options['limit'],
+        )
+        self.stdout.write(json.dumps(summary))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_webhook_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paystackwebhookevent',
+            name='signed',
+            field=models.BooleanField(default=False, help_text='Whether the event carried a valid x-paystack-signature'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0003_outbox_event'),
+        ('payments', '0005_webhook_event_signed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymenttransaction',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['transaction_date', 'id'], name='payment_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:36
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0006_payment_pending_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='paymenttransaction',
+            name='batch',
+            field=models.OneToOneField(blank=True, default=None, help_text='Set when the payment covers a whole checkout', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payment', to='payments.paymentbatch'),
+        ),
+    ]
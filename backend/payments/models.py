@@ -4,9 +4,24 @@ from django.db import models
 from donations.models import Donation
 
 # Create your models here.
+class PaymentBatch(models.Model):
+    """
+    The donations paid for by one checkout. Its payment's donation is one of
+    them; settling the payment settles the whole batch (see payments/state.py).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Batch {self.id} - {self.amount}"
+
+
 class PaymentTransaction(models.Model):
     id =  models.UUIDField(primary_key=True, default=uuid.uuid4,editable=False)
     donation = models.OneToOneField(Donation, on_delete=models.CASCADE)
+    batch = models.OneToOneField(PaymentBatch, on_delete=models.SET_NULL, null=True, blank=True, default=None,
+                                 related_name='payment', help_text='Set when the payment covers a whole checkout')
     user_id = models.ForeignKey('users_n_auth.User', db_index=True, editable=False, on_delete=models.CASCADE, null=True,
                                 default=None,
                                 help_text='References the user ID from the user service')
@@ -22,5 +37,42 @@ class PaymentTransaction(models.Model):
     payment_method = models.CharField(max_length=50)
     email = models.EmailField(null=True, blank=True, help_text="Email address of the payment method ('anonymous')")
 
+    class Meta:
+        indexes = [
+            # Pending payments in reconciliation order (see payments/reconciliation.py)
+            models.Index(fields=['transaction_date', 'id'], condition=models.Q(status='pending'),
+                         name='payment_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"Payment for {self.donation} by {self.user_id} - {self.status}"
+
+class PaystackWebhookEvent(models.Model):
+    """
+    Inbox of received Paystack webhook events.
+
+    The webhook view only inserts here; ``event_key`` is unique, so Paystack's
+    redeliveries of an event are dropped by the database. Only signed events
+    are stored and they are applied from their payload; rows stored unsigned
+    before that are verified with Paystack. The
+    ``process_paystack_webhooks`` task applies pending rows in batches (see
+    payments/webhooks.py).
+    """
+    id = models.BigAutoField(primary_key=True)
+    event_key = models.CharField(max_length=255, unique=True)
+    event = models.CharField(max_length=100)
+    reference = models.CharField(max_length=255, blank=True, db_index=True)
+    payload = models.JSONField()
+    signed = models.BooleanField(default=False, help_text='Whether the event carried a valid x-paystack-signature')
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(processed_at__isnull=True), name='webhook_pending_idx'),
+        ]
+
     def __str__(self):
-        return f"Payment for {self.donation} by {self.user_id} - {self.status}"
\ No newline at end of file
+        return f"{self.event} {self.reference or self.event_key}"
@@ -1,37 +1,60 @@
-from http.client import responses
-
+import httpx
 import requests
-from django.conf import settings
 
-class Paystack:
-    BASE_URL = settings.PAYSTACK_BASE_URL
-    SECRET_KEY = settings.PAYSTACK_SECRET_KEY
+from causehive.paystack_client import CircuitOpenError, get_async_paystack_client, get_paystack_client
+
+
+def initialize_payload(email, amount):
+    return {
+        "email": email,
+        "amount": int(amount * 100), # Convert to pesewas
+    }
 
+
+class Paystack:
     @classmethod
     def initialize_payment(cls, email, amount):
         """Initialize a payment on Paystack
         Amount is in pesewas (multiply by ten)"""
-        url = f"{cls.BASE_URL}/transaction/initialize"
-        headers = {
-            "Authorization": f"Bearer {cls.SECRET_KEY}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "email": email,
-            "amount": int(amount * 100), # Convert to pesewas
-        }
-
-        response = requests.post(url, json=data, headers=headers)
-        return response.json()
+        data = initialize_payload(email, amount)
+
+        try:
+            response = get_paystack_client().post('/transaction/initialize', endpoint='transaction.initialize', json=data)
+            return response.json()
+        except requests.RequestException as e:
+            return {'status': False, 'message': f'Payment initialization failed: {str(e)}'}
 
     @classmethod
     def verify_payment(cls, reference):
         """Verify payment with Paystack"""
-        url = f"{cls.BASE_URL}/transaction/verify/{reference}"
-        headers = {
-            "Authorization": f"Bearer {cls.SECRET_KEY}",
-            "Content-Type": "application/json",
-        }
-
-        response = requests.get(url, headers=headers)
-        return response.json()
\ No newline at end of file
+        try:
+            response = get_paystack_client().get(f'/transaction/verify/{reference}', endpoint='transaction.verify')
+            return response.json()
+        except requests.RequestException as e:
+            return {'status': False, 'message': f'Payment verification failed: {str(e)}'}
+
+
+class AsyncPaystack:
+    """Awaitable versions of the Paystack calls, for the async views."""
+
+    @classmethod
+    async def initialize_payment(cls, email, amount):
+        data = initialize_payload(email, amount)
+
+        try:
+            response = await get_async_paystack_client().post(
+                '/transaction/initialize', endpoint='transaction.initialize', json=data
+            )
+            return response.json()
+        except (httpx.HTTPError, CircuitOpenError, ValueError) as e:
+            return {'status': False, 'message': f'Payment initialization failed: {str(e)}'}
+
+    @classmethod
+    async def verify_payment(cls, reference):
+        try:
+            response = await get_async_paystack_client().get(
+                f'/transaction/verify/{reference}', endpoint='transaction.verify'
+            )
+            return response.json()
+        except (httpx.HTTPError, CircuitOpenError, ValueError) as e:
+            return {'status': False, 'message': f'Payment verification failed: {str(e)}'}
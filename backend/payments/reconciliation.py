@@ -0,0 +1,103 @@
+"""
+Reconciliation of payments that never heard back from Paystack.
+
+A payment stays pending if the donor closes the tab before the verify call
+and the webhook is lost. ``reconcile_pending_payments`` (run by the
+``reconcile_pending_payments`` Celery task and the ``reconcile_payments``
+command) sweeps pending payments older than a cut-off in chunks:
+
+* each chunk is read with keyset pagination on (transaction_date, id), so
+  payments that stay pending are not read again in the same run;
+* the chunk is verified with Paystack from a small thread pool, bounded by
+  ``concurrency`` (and by the Paystack client's connection pool);
+* the outcomes are applied in bulk through payments/state.py, one UPDATE
+  per target status, only to payments that are still pending, so a verify
+  or webhook that got there first wins.
+
+It returns a summary of what it checked and changed.
+"""
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db.models import Q
+
+from .models import PaymentTransaction
+from .paystack import Paystack
+from .state import COMPLETED, FAILED, PENDING, complete_payments, fail_payments
+
+logger = logging.getLogger(__name__)
+
+# Paystack transaction status -> our payment status. Anything else (ongoing,
+# pending, queued...) leaves the payment pending for a later run.
+SETTLED_STATUSES = {
+    'success': COMPLETED,
+    'failed': FAILED,
+    'abandoned': FAILED,
+    'reversed': FAILED,
+}
+
+
+def stale_pending_payments(older_than, chunk_size):
+    """Yield lists of (pk, reference) for payments pending since before ``older_than``."""
+    queryset = PaymentTransaction.objects.filter(status=PENDING, transaction_date__lt=older_than) \
+        .order_by('transaction_date', 'id')
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            page = page.filter(Q(transaction_date__gt=last[0]) | Q(transaction_date=last[0], id__gt=last[1]))
+        rows = list(page.values_list('transaction_date', 'id', 'transaction_id')[:chunk_size])
+        if not rows:
+            return
+        yield [(pk, reference) for _, pk, reference in rows]
+        last = rows[-1][:2]
+
+
+def verify_chunk(chunk, pool):
+    """Verify a chunk with Paystack. Returns {pk: our status for it, or None if verification failed}."""
+    responses = pool.map(lambda row: Paystack.verify_payment(row[1]), chunk)
+    outcomes = {}
+    for (pk, reference), response in zip(chunk, responses):
+        if not response.get('status'):
+            logger.warning('Could not verify pending payment %s: %s', reference, response.get('message'))
+            outcomes[pk] = None
+        else:
+            outcomes[pk] = SETTLED_STATUSES.get((response.get('data') or {}).get('status'), PENDING)
+    return outcomes
+
+
+def apply_outcomes(outcomes):
+    """Move still-pending payments (and their donations) to their verified status. Returns counts."""
+    completed = [pk for pk, outcome in outcomes.items() if outcome == COMPLETED]
+    failed = [pk for pk, outcome in outcomes.items() if outcome == FAILED]
+    return {
+        'completed': complete_payments(completed) if completed else 0,
+        'failed': fail_payments(failed) if failed else 0,
+    }
+
+
+def reconcile_pending_payments(older_than, *, chunk_size=100, concurrency=5, limit=None):
+    """
+    Verify and settle payments pending since before ``older_than``, at most
+    ``limit`` of them. Returns a summary dict.
+    """
+    summary = Counter(checked=0, completed=0, failed=0, unchanged=0, errors=0, chunks=0)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for chunk in stale_pending_payments(older_than, chunk_size):
+            if limit is not None:
+                chunk = chunk[:limit - summary['checked']]
+            outcomes = verify_chunk(chunk, pool)
+            applied = apply_outcomes(outcomes)
+
+            summary['chunks'] += 1
+            summary['checked'] += len(chunk)
+            summary['errors'] += sum(1 for outcome in outcomes.values() if outcome is None)
+            summary['completed'] += applied['completed']
+            summary['failed'] += applied['failed']
+            if limit is not None and summary['checked'] >= limit:
+                break
+
+    summary['unchanged'] = summary['checked'] - summary['errors'] - summary['completed'] - summary['failed']
+    logger.info('Payment reconciliation: %s', dict(summary))
+    return dict(summary)
@@ -0,0 +1,296 @@
+"""
+A local stand-in for the Paystack API, for development and load testing.
+
+Run it with ``manage.py paystack_simulator`` and point the app at it with
+``PAYSTACK_BASE_URL=http://127.0.0.1:8100``. It implements the endpoints we
+call (transaction initialize/verify, transfer recipients, transfers and their
+verification, bank lists and account resolution) with Paystack's response
+shapes, keeps its state in memory, and can inject:
+
+* latency: a base delay with jitter, plus occasional spikes;
+* gateway errors: a fraction of calls answered with a 5xx;
+* declined payments: a fraction of transactions that verify as failed;
+* webhooks: ``charge.success``/``charge.failed`` and ``transfer.success``
+  events POSTed to a callback URL, signed with ``x-paystack-signature`` like
+  the real thing (HMAC-SHA512 of the body with the secret key).
+"""
+import hashlib
+import hmac
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+BANKS = [
+    {'id': 1, 'name': 'Absa Bank Ghana', 'code': '030100', 'type': 'ghipss', 'currency': 'GHS'},
+    {'id': 2, 'name': 'Access Bank Ghana', 'code': '280100', 'type': 'ghipss', 'currency': 'GHS'},
+    {'id': 3, 'name': 'Ecobank Ghana', 'code': '130100', 'type': 'ghipss', 'currency': 'GHS'},
+    {'id': 4, 'name': 'GCB Bank', 'code': '040100', 'type': 'ghipss', 'currency': 'GHS'},
+]
+
+MOBILE_MONEY = [
+    {'id': 28, 'name': 'MTN', 'code': 'MTN', 'type': 'mobile_money', 'currency': 'GHS'},
+    {'id': 29, 'name': 'Vodafone', 'code': 'VOD', 'type': 'mobile_money', 'currency': 'GHS'},
+    {'id': 66, 'name': 'AirtelTigo', 'code': 'ATL', 'type': 'mobile_money', 'currency': 'GHS'},
+]
+
+
+def sign(body, secret_key):
+    """The x-paystack-signature of a raw webhook ``body``."""
+    return hmac.new(secret_key.encode(), body, hashlib.sha512).hexdigest()
+
+
+def ok(message, data):
+    return 200, {'status': True, 'message': message, 'data': data}
+
+
+def error(status_code, message):
+    return status_code, {'status': False, 'message': message}
+
+
+class PaystackSimulator:
+    def __init__(self, secret_key, *, latency_ms=0.0, jitter_ms=0.0, spike_rate=0.0, spike_ms=0.0,
+                 error_rate=0.0, error_status=503, decline_rate=0.0, webhook_url=None, webhook_delay=0.5,
+                 callback_url='http://localhost:5173/payment/callback', seed=None):
+        self.secret_key = secret_key
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.spike_rate = spike_rate
+        self.spike_ms = spike_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.decline_rate = decline_rate
+        self.webhook_url = webhook_url
+        self.webhook_delay = webhook_delay
+        self.callback_url = callback_url
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.transactions = {}
+        self.recipients = {}
+        self.transfers = {}
+        self.routes = [
+            ('POST', re.compile(r'^/transaction/initialize$'), self.initialize_transaction),
+            ('GET', re.compile(r'^/transaction/verify/(?P<reference>[^/]+)$'), self.verify_transaction),
+            ('POST', re.compile(r'^/transferrecipient$'), self.create_recipient),
+            ('POST', re.compile(r'^/transfer$'), self.initiate_transfer),
+            ('GET', re.compile(r'^/transfer/verify/(?P<code>[^/]+)$'), self.verify_transfer),
+            ('GET', re.compile(r'^/bank$'), self.list_banks),
+            ('POST', re.compile(r'^/bank/resolve$'), self.resolve_account),
+            ('GET', re.compile(r'^/bank/resolve$'), self.resolve_account),
+        ]
+
+    # Fault injection
+
+    def delay(self):
+        """Seconds to hold the next response for."""
+        with self.lock:
+            delay_ms = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+            if self.random.random() < self.spike_rate:
+                delay_ms += self.spike_ms
+        return max(delay_ms, 0) / 1000
+
+    def should_fail(self):
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def should_decline(self):
+        with self.lock:
+            return self.random.random() < self.decline_rate
+
+    # Dispatch
+
+    def handle(self, method, path, query, body, headers):
+        """Route one request; returns ``(status_code, payload)``."""
+        if headers.get('Authorization') != f'Bearer {self.secret_key}':
+            return error(401, 'Invalid key')
+        if not isinstance(body, dict):
+            return error(400, 'Invalid JSON body')
+        if self.should_fail():
+            return error(self.error_status, 'Simulated gateway error')
+
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path.rstrip('/') or '/')
+            if match and route_method == method:
+                return handler(query=query, body=body, **match.groupdict())
+        return error(404, f'{method} {path} is not simulated')
+
+    # Transactions
+
+    def initialize_transaction(self, body, **kwargs):
+        email, amount = body.get('email'), body.get('amount')
+        if not email or not isinstance(amount, int) or amount <= 0:
+            return error(400, 'Invalid email or amount')
+
+        reference = body.get('reference') or uuid.uuid4().hex[:12]
+        transaction = {
+            'id': self.random.randint(10 ** 9, 10 ** 10),
+            'reference': reference,
+            'amount': amount,
+            'currency': body.get('currency', 'GHS'),
+            'status': 'failed' if self.should_decline() else 'success',
+            'customer': {'email': email},
+            'created_at': time.time(),
+        }
+        with self.lock:
+            if reference in self.transactions:
+                return error(400, 'Duplicate Transaction Reference')
+            self.transactions[reference] = transaction
+
+        event = 'charge.success' if transaction['status'] == 'success' else 'charge.failed'
+        self.schedule_webhook(event, self.transaction_data(transaction))
+        return ok('Authorization URL created', {
+            'authorization_url': f'https://checkout.paystack.com/{reference}',
+            'access_code': uuid.uuid4().hex[:15],
+            'reference': reference,
+        })
+
+    def transaction_data(self, transaction):
+        return {
+            'id': transaction['id'],
+            'status': transaction['status'],
+            'reference': transaction['reference'],
+            'amount': transaction['amount'],
+            'currency': transaction['currency'],
+            'gateway_response': 'Successful' if transaction['status'] == 'success' else 'Declined',
+            'channel': 'card',
+            'customer': transaction['customer'],
+        }
+
+    def verify_transaction(self, reference, **kwargs):
+        with self.lock:
+            transaction = self.transactions.get(reference)
+        if transaction is None:
+            return error(400, 'Transaction reference not found')
+        return ok('Verification successful', self.transaction_data(transaction))
+
+    # Transfers
+
+    def create_recipient(self, body, **kwargs):
+        if not body.get('account_number') or not body.get('bank_code'):
+            return error(400, 'Account number and bank code are required')
+        code = f'RCP_{uuid.uuid4().hex[:12]}'
+        recipient = {
+            'recipient_code': code,
+            'type': body.get('type', 'ghipss'),
+            'currency': body.get('currency', 'GHS'),
+            'details': {'account_number': body['account_number'], 'bank_code': body['bank_code']},
+            'name': body.get('name') or body.get('account_name') or 'Withdrawal Recipient',
+        }
+        with self.lock:
+            self.recipients[code] = recipient
+        return 201, {'status': True, 'message': 'Transfer recipient created successfully', 'data': recipient}
+
+    def initiate_transfer(self, body, **kwargs):
+        with self.lock:
+            known_recipient = body.get('recipient') in self.recipients
+        if not known_recipient:
+            return error(400, 'Recipient specified is invalid')
+        transfer = {
+            'transfer_code': f'TRF_{uuid.uuid4().hex[:12]}',
+            'reference': body.get('reference') or uuid.uuid4().hex[:12],
+            'amount': body.get('amount'),
+            'currency': body.get('currency', 'GHS'),
+            'reason': body.get('reason', ''),
+            'recipient': body['recipient'],
+            'status': 'failed' if self.should_decline() else 'success',
+        }
+        with self.lock:
+            self.transfers[transfer['transfer_code']] = transfer
+        self.schedule_webhook(f"transfer.{transfer['status']}", transfer)
+        return ok('Transfer has been queued', dict(transfer, status='pending'))
+
+    def verify_transfer(self, code, **kwargs):
+        with self.lock:
+            transfer = self.transfers.get(code) or next(
+                (t for t in self.transfers.values() if t['reference'] == code), None
+            )
+        if transfer is None:
+            return error(400, 'Transfer not found')
+        return ok('Transfer retrieved', transfer)
+
+    # Banks
+
+    def list_banks(self, query, **kwargs):
+        banks = MOBILE_MONEY if query.get('type') == 'mobile_money' else BANKS
+        return ok('Banks retrieved', banks)
+
+    def resolve_account(self, query, body, **kwargs):
+        params = {**query, **(body or {})}
+        if not params.get('account_number') or not params.get('bank_code'):
+            return error(400, 'Account number and bank code are required')
+        return ok('Account number resolved', {
+            'account_number': params['account_number'],
+            'account_name': 'SIMULATED ACCOUNT HOLDER',
+            'bank_id': 1,
+        })
+
+    # Webhooks
+
+    def schedule_webhook(self, event, data):
+        if not self.webhook_url:
+            return
+        timer = threading.Timer(self.webhook_delay, self.send_webhook, args=(event, data))
+        timer.daemon = True
+        timer.start()
+
+    def send_webhook(self, event, data):
+        body = json.dumps({'event': event, 'data': data}).encode()
+        try:
+            response = requests.post(self.webhook_url, data=body, timeout=10, headers={
+                'Content-Type': 'application/json',
+                'x-paystack-signature': sign(body, self.secret_key),
+            })
+            logger.info('Webhook %s for %s -> %s', event, data.get('reference'), response.status_code)
+        except requests.RequestException as exc:
+            logger.warning('Webhook %s for %s failed: %s', event, data.get('reference'), exc)
+
+    # Serving
+
+    def make_server(self, host, port):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                self.respond()
+
+            def do_POST(self):
+                self.respond()
+
+            def respond(self):
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    status_code, payload = error(400, 'Invalid JSON body')
+                else:
+                    time.sleep(simulator.delay())
+                    status_code, payload = simulator.handle(self.command, url.path, query, body, self.headers)
+
+                content = json.dumps(payload).encode()
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                logger.debug('%s - %s', self.address_string(), format % args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        return server
@@ -0,0 +1,129 @@
+"""
+Payment state machine shared by the verify view, the webhook processor and
+reconciliation.
+
+A payment starts pending and is settled exactly once, as completed or
+failed; its donations follow it - the payment's own donation or, for a cart
+checkout, every donation in its PaymentBatch. Every transition is a
+conditional UPDATE ``... WHERE status = 'pending'``, so when several callers
+race to settle the same payment only one of them changes a row. That caller, and only that
+caller, runs the side effects: folding the donations into their causes'
+statistics and the daily rollups, queueing their donation.completed events
+and, once the transaction commits, the donor's success emails.
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+
+from donations import rollups
+from donations.models import Donation
+from donations.tasks import send_donation_success_notification
+
+from .models import PaymentTransaction
+
+PENDING, COMPLETED, FAILED = 'pending', 'completed', 'failed'
+
+TRANSITIONS = {
+    PENDING: {COMPLETED, FAILED},
+    COMPLETED: set(),
+    FAILED: set(),
+}
+
+# The Paystack statuses that settle a payment as soon as they are reported.
+# Reconciliation also treats abandoned/reversed transactions as failed, but
+# only once they are old enough (see payments/reconciliation.py).
+PAYSTACK_STATUSES = {
+    'success': COMPLETED,
+    'failed': FAILED,
+}
+
+
+def can_transition(from_status, to_status):
+    return to_status in TRANSITIONS.get(from_status, ())
+
+
+def settle_payment(reference, paystack_status, donor_email=None):
+    """
+    Apply the status Paystack reported for ``reference``. Returns the payment's
+    new status if this call settled it, or None if the status does not settle
+    a payment or someone else already did.
+    """
+    to_status = PAYSTACK_STATUSES.get(paystack_status)
+    if to_status == COMPLETED and complete_payment(reference, donor_email):
+        return COMPLETED
+    if to_status == FAILED and fail_payment(reference):
+        return FAILED
+    return None
+
+
+def complete_payment(reference, donor_email=None):
+    """Complete the pending payment ``reference``. Returns True if this call completed it."""
+    payment = PaymentTransaction.objects.filter(transaction_id=reference)
+    with transaction.atomic():
+        won = payment.filter(status=PENDING).update(status=COMPLETED)
+        if won:
+            complete_donations(payment_donations(payment), donor_email)
+    return bool(won)
+
+
+def fail_payment(reference):
+    """Fail the pending payment ``reference``. Returns True if this call failed it."""
+    payment = PaymentTransaction.objects.filter(transaction_id=reference)
+    with transaction.atomic():
+        won = payment.filter(status=PENDING).update(status=FAILED)
+        if won:
+            fail_donations(payment_donations(payment))
+    return bool(won)
+
+
+def complete_payments(pks):
+    """Complete the still-pending payments among ``pks``. Returns how many this call completed."""
+    with transaction.atomic():
+        won = _lock_pending(pks)
+        if won:
+            PaymentTransaction.objects.filter(pk__in=won).update(status=COMPLETED)
+            complete_donations(payment_donations(won))
+    return len(won)
+
+
+def fail_payments(pks):
+    """Fail the still-pending payments among ``pks``. Returns how many this call failed."""
+    with transaction.atomic():
+        won = _lock_pending(pks)
+        if won:
+            PaymentTransaction.objects.filter(pk__in=won).update(status=FAILED)
+            fail_donations(payment_donations(won))
+    return len(won)
+
+
+def _lock_pending(pks):
+    # A multi-row UPDATE does not say which rows it changed, so the pending
+    # rows are locked first; nobody else can settle them until we commit.
+    return list(
+        PaymentTransaction.objects.select_for_update().filter(pk__in=pks, status=PENDING)
+        .values_list('pk', flat=True)
+    )
+
+
+def payment_donations(payments):
+    """The donations settled by ``payments`` (a queryset or list of payment ids)."""
+    return Donation.objects.filter(Q(paymenttransaction__in=payments) | Q(payment_batch__payment__in=payments))
+
+
+def complete_donations(donations, donor_email=None):
+    """Complete ``donations`` whose payment this caller settled, with their side effects."""
+    donations = donations.select_related('user_id').annotate(
+        payment_email=Coalesce('paymenttransaction__email', 'payment_batch__payment__email'),
+    )
+    for donation in Donation.complete_pending(donations):
+        email = donation.user_id.email if donation.user_id else donation.payment_email or donor_email
+        if email:
+            transaction.on_commit(
+                lambda donation_id=donation.pk, email=email: send_donation_success_notification.delay(donation_id, email)
+            )
+
+
+def fail_donations(donations):
+    """Fail the pending ``donations`` of a payment this caller failed."""
+    rollups.record_failures(donations)
+    donations.filter(status=PENDING).update(status=FAILED)
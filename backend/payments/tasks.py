@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from causehive.celery import app
+from payments import reconciliation
+from payments.webhooks import process_pending_events, prune_processed_events
+
+
+@app.task
+def process_paystack_webhooks():
+    """Apply pending webhook events batch by batch until the inbox is drained."""
+    batch_size = settings.WEBHOOK_BATCH_SIZE
+    processed = 0
+    for _ in range(settings.WEBHOOK_MAX_BATCHES):
+        taken = process_pending_events(batch_size)
+        processed += taken
+        if taken < batch_size:
+            break
+    return processed
+
+
+@app.task
+def prune_webhook_events():
+    return prune_processed_events(timezone.now() - timedelta(days=settings.WEBHOOK_RETENTION_DAYS))
+
+
+@app.task
+def reconcile_pending_payments():
+    """Settle payments that have been pending longer than PAYMENT_RECONCILE_AFTER_MINUTES."""
+    return reconciliation.reconcile_pending_payments(
+        timezone.now() - timedelta(minutes=settings.PAYMENT_RECONCILE_AFTER_MINUTES),
+        chunk_size=settings.PAYMENT_RECONCILE_CHUNK_SIZE,
+        concurrency=settings.PAYMENT_RECONCILE_CONCURRENCY,
+        limit=settings.PAYMENT_RECONCILE_LIMIT,
+    )
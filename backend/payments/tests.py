@@ -1,4 +1,5 @@
 # payments/tests.py
+import json
 import uuid
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
@@ -522,4 +523,599 @@ class PaymentIntegrationTestCase(APITestCase):
                 # Expected due to the bug in the view
                 self.assertTrue(True)
             else:
-                raise
\ No newline at end of file
+                raise
+
+class PaystackClientTestCase(TestCase):
+    """Test cases for the shared Paystack HTTP client"""
+
+    def _client(self, *responses, max_retries=2, breaker=None):
+        from causehive.paystack_client import PaystackClient
+
+        self.sleeps = []
+        client = PaystackClient('https://paystack.test/', 'sk_test', max_retries=max_retries,
+                                breaker=breaker, sleep=self.sleeps.append)
+        client.session.request = MagicMock(side_effect=list(responses))
+        return client
+
+    def _response(self, status_code, body=None):
+        response = MagicMock(status_code=status_code)
+        response.json.return_value = body or {}
+        return response
+
+    def test_uses_endpoint_timeout_and_pooled_session(self):
+        from causehive.paystack_client import ENDPOINT_TIMEOUTS
+
+        client = self._client(self._response(200, {'status': True}))
+        client.get('/transaction/verify/ref-1', endpoint='transaction.verify')
+
+        method, url = client.session.request.call_args.args
+        self.assertEqual((method, url), ('GET', 'https://paystack.test/transaction/verify/ref-1'))
+        self.assertEqual(client.session.request.call_args.kwargs['timeout'],
+                         (client.connect_timeout, ENDPOINT_TIMEOUTS['transaction.verify']))
+        self.assertEqual(client.session.headers['Authorization'], 'Bearer sk_test')
+
+    def test_idempotent_calls_are_retried_with_backoff(self):
+        import requests
+
+        ok = self._response(200)
+        client = self._client(requests.ReadTimeout(), self._response(503), ok)
+        self.assertIs(client.get('/bank', endpoint='bank.list'), ok)
+        self.assertEqual(client.session.request.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(all(0 <= delay <= client.backoff * 2 for delay in self.sleeps))
+
+    def test_retries_are_bounded(self):
+        client = self._client(*(self._response(502) for _ in range(3)), max_retries=2)
+        self.assertEqual(client.get('/bank', endpoint='bank.list').status_code, 502)
+        self.assertEqual(client.session.request.call_count, 3)
+
+    def test_non_idempotent_calls_only_retry_unsent_requests(self):
+        import requests
+
+        client = self._client(requests.ConnectTimeout(), requests.ReadTimeout())
+        with self.assertRaises(requests.ReadTimeout):
+            client.post('/transaction/initialize', endpoint='transaction.initialize', json={})
+        self.assertEqual(client.session.request.call_count, 2)
+
+        client = self._client(self._response(500))
+        self.assertEqual(client.post('/transfer', endpoint='transfer.initiate', json={}).status_code, 500)
+        self.assertEqual(client.session.request.call_count, 1)
+
+    def test_non_idempotent_calls_retry_refused_connections(self):
+        import socket
+        import requests
+        from urllib3.exceptions import ProtocolError
+        from causehive.paystack_client import PaystackClient
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        client = PaystackClient(f'http://127.0.0.1:{port}', 'sk_test', max_retries=2, sleep=lambda delay: None)
+        client.session.request = MagicMock(wraps=client.session.request)
+        with self.assertRaises(requests.ConnectionError):
+            client.post('/transaction/initialize', endpoint='transaction.initialize', json={})
+        self.assertEqual(client.session.request.call_count, 3)
+
+        # A connection dropped after the request went out is not retried
+        aborted = requests.ConnectionError(ProtocolError('Connection aborted.', ConnectionResetError()))
+        client = self._client(aborted)
+        with self.assertRaises(requests.ConnectionError):
+            client.post('/transaction/initialize', endpoint='transaction.initialize', json={})
+        self.assertEqual(client.session.request.call_count, 1)
+
+    def test_circuit_opens_after_consecutive_failures_and_probes_after_reset(self):
+        import requests
+        from causehive.paystack_client import CircuitBreaker, CircuitOpenError
+
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+        client = self._client(requests.ConnectionError(), requests.ConnectionError(), self._response(200),
+                              max_retries=0, breaker=breaker)
+
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                client.get('/bank', endpoint='bank.list')
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            client.get('/bank', endpoint='bank.list')
+        self.assertEqual(client.session.request.call_count, 2)
+
+        now[0] = 31
+        self.assertEqual(client.get('/bank', endpoint='bank.list').status_code, 200)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_interrupted_probe_does_not_wedge_the_circuit(self):
+        import requests
+        from causehive.paystack_client import CircuitBreaker, CircuitOpenError
+
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+        client = self._client(requests.ConnectionError(), ValueError('bad payload'), self._response(200),
+                              max_retries=0, breaker=breaker)
+        with self.assertRaises(requests.ConnectionError):
+            client.get('/bank', endpoint='bank.list')
+
+        now[0] = 31
+        with self.assertRaises(ValueError):
+            client.get('/bank', endpoint='bank.list')
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(client.get('/bank', endpoint='bank.list').status_code, 200)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_circuit_is_reported_as_failed_verification(self):
+        from causehive.paystack_client import CircuitOpenError
+        from .paystack import Paystack
+
+        client = MagicMock()
+        client.get.side_effect = CircuitOpenError('circuit open')
+        with patch('payments.paystack.get_paystack_client', return_value=client):
+            result = Paystack.verify_payment('ref-1')
+        self.assertFalse(result['status'])
+        self.assertIn('circuit open', result['message'])
+
+
+class AsyncPaystackTestCase(TestCase):
+    """Test cases for the async Paystack client and views"""
+
+    def test_async_client_retries_idempotent_calls(self):
+        import httpx
+        from asgiref.sync import async_to_sync
+        from causehive.paystack_client import AsyncPaystackClient
+
+        statuses = iter([503, 200])
+        seen = []
+
+        def handler(request):
+            seen.append((request.method, str(request.url), request.headers['Authorization']))
+            return httpx.Response(next(statuses), json={'status': True})
+
+        async def no_sleep(delay):
+            pass
+
+        async def call():
+            client = AsyncPaystackClient('https://paystack.test', 'sk_test', sleep=no_sleep,
+                                         transport=httpx.MockTransport(handler))
+            response = await client.get('/transaction/verify/ref-1', endpoint='transaction.verify')
+            return response.status_code, response.json()
+
+        self.assertEqual(async_to_sync(call)(), (200, {'status': True}))
+        self.assertEqual(seen, [('GET', 'https://paystack.test/transaction/verify/ref-1', 'Bearer sk_test')] * 2)
+
+    def test_cancelled_half_open_probe_is_released(self):
+        import asyncio
+        import httpx
+        from asgiref.sync import async_to_sync
+        from causehive.paystack_client import AsyncPaystackClient, CircuitBreaker
+
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 31
+
+        async def handler(request):
+            if request.url.path == '/slow':
+                await asyncio.sleep(60)
+            return httpx.Response(200, json={'status': True})
+
+        async def call():
+            client = AsyncPaystackClient('https://paystack.test', 'sk_test', breaker=breaker,
+                                         transport=httpx.MockTransport(handler))
+            probe = asyncio.create_task(client.get('/slow', endpoint='bank.list'))
+            await asyncio.sleep(0)
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+            state = breaker.state
+            response = await client.get('/bank', endpoint='bank.list')
+            return state, response.status_code
+
+        self.assertEqual(async_to_sync(call)(), (CircuitBreaker.HALF_OPEN, 200))
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_async_verify_skips_paystack_for_settled_payments(self):
+        from unittest.mock import AsyncMock
+        from asgiref.sync import async_to_sync
+        from categories.models import Category
+        from causes.models import Causes
+        from rest_framework.test import APIRequestFactory
+        from .views import AsyncVerifyPaymentView
+
+        organizer = get_user_model().objects.create_user(email='verify-organizer@example.com', password='testpass123')
+        cause = Causes.objects.create(
+            name='Verify Cause', category=Category.objects.create(name='Verify', description='Verify causes'),
+            organizer_id=organizer, target_amount=Decimal('100.00'), status='ongoing',
+        )
+        donation = Donation.objects.create(cause_id=cause, recipient_id=organizer, amount=Decimal('10.00'))
+        PaymentTransaction.objects.create(donation=donation, amount=Decimal('10.00'), transaction_id='ref-settled',
+                                          status='completed', payment_method='Paystack')
+
+        view = AsyncVerifyPaymentView.as_view()
+        with patch('payments.views.AsyncPaystack.verify_payment', new=AsyncMock()) as verify:
+            request = APIRequestFactory().get('/payments/verify/ref-settled/')
+            response = async_to_sync(view)(request, reference='ref-settled')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'status': 'completed'})
+        verify.assert_not_awaited()
+
+
+class PaystackSimulatorTestCase(TestCase):
+    """Test cases for the local Paystack simulator and the load-test report"""
+
+    def _serve(self, **options):
+        import threading
+        from causehive.paystack_client import PaystackClient
+        from .simulator import PaystackSimulator
+
+        simulator = PaystackSimulator('sk_sim', seed=7, **options)
+        server = simulator.make_server('127.0.0.1', 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        host, port = server.server_address[:2]
+        return simulator, PaystackClient(f'http://{host}:{port}', 'sk_sim', max_retries=0)
+
+    def test_initialize_then_verify_round_trip(self):
+        simulator, client = self._serve()
+
+        initialized = client.post('/transaction/initialize', endpoint='transaction.initialize',
+                                  json={'email': 'donor@example.com', 'amount': 2500}).json()
+        self.assertTrue(initialized['status'])
+        reference = initialized['data']['reference']
+        self.assertIn(reference, initialized['data']['authorization_url'])
+
+        verified = client.get(f'/transaction/verify/{reference}', endpoint='transaction.verify').json()
+        self.assertEqual(verified['data']['status'], 'success')
+        self.assertEqual(verified['data']['amount'], 2500)
+        self.assertEqual(verified['data']['customer']['email'], 'donor@example.com')
+
+        banks = client.get('/bank', endpoint='bank.list', params={'currency': 'GHS', 'type': 'mobile_money'}).json()
+        self.assertEqual({bank['type'] for bank in banks['data']}, {'mobile_money'})
+
+    def test_injected_errors_declines_and_bad_keys(self):
+        from causehive.paystack_client import PaystackClient
+
+        simulator, client = self._serve(error_rate=1.0, error_status=502)
+        response = client.get('/bank', endpoint='bank.list')
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(response.json()['status'])
+
+        simulator.error_rate, simulator.decline_rate = 0.0, 1.0
+        reference = client.post('/transaction/initialize', endpoint='transaction.initialize',
+                                json={'email': 'donor@example.com', 'amount': 100}).json()['data']['reference']
+        verified = client.get(f'/transaction/verify/{reference}', endpoint='transaction.verify').json()
+        self.assertEqual(verified['data']['status'], 'failed')
+
+        intruder = PaystackClient(client.base_url, 'sk_wrong', max_retries=0)
+        self.assertEqual(intruder.get('/bank', endpoint='bank.list').status_code, 401)
+
+    def test_non_object_json_bodies_are_rejected(self):
+        simulator, client = self._serve()
+        for raw in (b'[1, 2]', b'"text"', b'5', b'null'):
+            response = client.post('/transaction/initialize', endpoint='transaction.initialize', data=raw)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['message'], 'Invalid JSON body')
+
+    def test_webhooks_are_signed(self):
+        import hashlib
+        import hmac
+        from .simulator import PaystackSimulator
+
+        simulator = PaystackSimulator('sk_sim', webhook_url='http://app.test/api/payments/webhook/')
+        with patch('payments.simulator.requests.post') as post:
+            simulator.send_webhook('charge.success', {'reference': 'ref-1', 'status': 'success'})
+
+        body = post.call_args.kwargs['data']
+        self.assertEqual(json.loads(body), {'event': 'charge.success', 'data': {'reference': 'ref-1', 'status': 'success'}})
+        expected = hmac.new(b'sk_sim', body, hashlib.sha512).hexdigest()
+        self.assertEqual(post.call_args.kwargs['headers']['x-paystack-signature'], expected)
+
+    def test_load_test_summary_percentiles(self):
+        from .loadtest import FlowResult, percentile
+
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile(list(range(1, 101)), 99), 99)
+        self.assertIsNone(percentile([], 95))
+
+        result = FlowResult('donate')
+        for i in range(1, 100):
+            result.record(200, i / 1000)
+        result.record(503, 0.5)
+        result.record('ReadTimeout', None)
+        result.elapsed = 2.0
+
+        summary = result.summary()
+        self.assertEqual((summary['requests'], summary['ok'], summary['errors']), (101, 99, 2))
+        self.assertEqual((summary['p50_ms'], summary['p95_ms'], summary['p99_ms']), (50.0, 95.0, 99.0))
+        self.assertEqual(summary['throughput_rps'], 50.5)
+        self.assertEqual(summary['statuses'], {'200': 99, '503': 1, 'ReadTimeout': 1})
+
+
+@override_settings(PAYSTACK_SECRET_KEY='sk_webhook')
+class PaystackWebhookInboxTestCase(APITestCase):
+    """Test cases for the Paystack webhook inbox"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        organizer = get_user_model().objects.create_user(email='webhook-organizer@example.com', password='testpass123')
+        cause = Causes.objects.create(
+            name='Webhook Cause', category=Category.objects.create(name='Webhook', description='Webhook causes'),
+            organizer_id=organizer, target_amount=Decimal('100.00'), status='ongoing',
+        )
+        self.donation = Donation.objects.create(cause_id=cause, recipient_id=organizer, amount=Decimal('10.00'))
+        self.payment = PaymentTransaction.objects.create(donation=self.donation, amount=Decimal('10.00'),
+                                                         transaction_id='ref-webhook', payment_method='Paystack')
+
+    def _send(self, payload, signature=None):
+        from .simulator import sign
+
+        body = json.dumps(payload).encode()
+        if signature is None:
+            signature = sign(body, 'sk_webhook')
+        return self.client.generic('POST', '/api/payments/webhook/', body, content_type='application/json',
+                                   HTTP_X_PAYSTACK_SIGNATURE=signature)
+
+    def _post(self, event='charge.success', reference='ref-webhook', **data):
+        return self._send({'event': event, 'data': {'id': 1001, 'reference': reference, 'status': 'success', **data}})
+
+    def test_redelivered_events_are_stored_once(self):
+        from .models import PaystackWebhookEvent
+
+        with patch('payments.webhooks.Paystack.verify_payment') as verify:
+            for _ in range(3):
+                response = self._post()
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data, {'status': 'success'})
+        verify.assert_not_called()
+
+        event = PaystackWebhookEvent.objects.get()
+        self.assertEqual((event.event_key, event.reference), ('charge.success:1001', 'ref-webhook'))
+        self.assertIsNone(event.processed_at)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'pending')
+
+    def test_missing_event_or_reference_is_rejected(self):
+        response = self._send({'data': {'reference': 'ref-webhook'}})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self._send({'event': 'charge.success', 'data': {}})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_object_payloads_are_rejected(self):
+        for payload in (['charge.success'], 'charge.success', 7, None):
+            response = self._send(payload)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unsigned_events_are_rejected_before_storing(self):
+        from .models import PaystackWebhookEvent
+
+        response = self.client.post('/api/payments/webhook/', {
+            'event': 'charge.success', 'data': {'id': 1001, 'reference': 'ref-webhook', 'status': 'success'},
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PaystackWebhookEvent.objects.exists())
+
+    def test_batch_completes_payment_once(self):
+        from donations.models import OutboxEvent
+        from .models import PaystackWebhookEvent
+        from .tasks import process_paystack_webhooks
+
+        self._post()
+        self._post(id=1002)
+        self._post(event='transfer.success', reference='trf-1', id=2001)
+
+        verified = {'status': True, 'data': {'status': 'success'}}
+        with patch('payments.webhooks.Paystack.verify_payment', return_value=verified) as verify:
+            self.assertEqual(process_paystack_webhooks(), 3)
+            self.assertEqual(process_paystack_webhooks(), 0)
+        verify.assert_called_once_with('ref-webhook')
+
+        self.payment.refresh_from_db()
+        self.donation.refresh_from_db()
+        self.assertEqual((self.payment.status, self.donation.status), ('completed', 'completed'))
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+        self.assertFalse(PaystackWebhookEvent.objects.filter(processed_at__isnull=True).exists())
+
+    @override_settings(WEBHOOK_MAX_ATTEMPTS=2)
+    def test_failed_events_are_retried_then_parked(self):
+        from .models import PaystackWebhookEvent
+        from .tasks import process_paystack_webhooks
+
+        self._post()
+        unverified = {'status': False, 'message': 'Paystack is unavailable'}
+        with patch('payments.webhooks.Paystack.verify_payment', return_value=unverified) as verify:
+            for _ in range(3):
+                process_paystack_webhooks()
+        self.assertEqual(verify.call_count, 2)
+
+        event = PaystackWebhookEvent.objects.get()
+        self.assertEqual((event.attempts, event.last_error), (2, 'Paystack is unavailable'))
+        self.assertIsNone(event.processed_at)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'pending')
+
+
+@override_settings(PAYSTACK_SECRET_KEY='sk_webhook')
+class SignedWebhookTestCase(APITestCase):
+    """Test cases for trusting signed Paystack webhooks"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        organizer = get_user_model().objects.create_user(email='signed-organizer@example.com', password='testpass123')
+        cause = Causes.objects.create(
+            name='Signed Cause', category=Category.objects.create(name='Signed', description='Signed causes'),
+            organizer_id=organizer, target_amount=Decimal('100.00'), status='ongoing',
+        )
+        self.donation = Donation.objects.create(cause_id=cause, recipient_id=organizer, amount=Decimal('10.00'))
+        self.payment = PaymentTransaction.objects.create(donation=self.donation, amount=Decimal('10.00'),
+                                                         transaction_id='ref-signed', payment_method='Paystack')
+
+    def _post(self, amount=1000, secret_key='sk_webhook', event='charge.success', status_='success'):
+        from .simulator import sign
+
+        body = json.dumps({'event': event, 'data': {
+            'id': 3001, 'reference': 'ref-signed', 'status': status_, 'amount': amount, 'currency': 'GHS',
+        }}).encode()
+        return self.client.generic('POST', '/api/payments/webhook/', body, content_type='application/json',
+                                   HTTP_X_PAYSTACK_SIGNATURE=sign(body, secret_key))
+
+    def test_signed_event_is_applied_without_verification(self):
+        from .tasks import process_paystack_webhooks
+
+        self.assertEqual(self._post(event='charge.failed', status_='failed').status_code, status.HTTP_200_OK)
+        with patch('payments.webhooks.Paystack.verify_payment') as verify:
+            process_paystack_webhooks()
+        verify.assert_not_called()
+
+        self.payment.refresh_from_db()
+        self.donation.refresh_from_db()
+        self.assertEqual((self.payment.status, self.donation.status), ('failed', 'failed'))
+
+    def test_wrong_signature_is_rejected(self):
+        from .models import PaystackWebhookEvent
+
+        response = self._post(secret_key='sk_forged')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PaystackWebhookEvent.objects.exists())
+
+    def test_signed_event_for_wrong_amount_is_verified(self):
+        from .tasks import process_paystack_webhooks
+
+        self._post(amount=1)
+        verified = {'status': True, 'data': {'status': 'failed'}}
+        with patch('payments.webhooks.Paystack.verify_payment', return_value=verified) as verify:
+            process_paystack_webhooks()
+        verify.assert_called_once_with('ref-signed')
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'failed')
+
+    def test_verify_answers_settled_payments_without_paystack(self):
+        PaymentTransaction.objects.filter(pk=self.payment.pk).update(status='completed')
+
+        with patch('payments.views.Paystack.verify_payment') as verify:
+            response = self.client.get('/api/payments/verify/ref-signed/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'status': 'completed'})
+        verify.assert_not_called()
+
+
+class PaymentReconciliationTestCase(TestCase):
+    """Test cases for reconciling stale pending payments"""
+
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from categories.models import Category
+        from causes.models import Causes
+
+        organizer = get_user_model().objects.create_user(email='reconcile-organizer@example.com', password='testpass123')
+        cause = Causes.objects.create(
+            name='Reconcile Cause', category=Category.objects.create(name='Reconcile', description='Reconcile causes'),
+            organizer_id=organizer, target_amount=Decimal('100.00'), status='ongoing',
+        )
+        for reference in ('ref-paid', 'ref-declined', 'ref-ongoing', 'ref-unknown', 'ref-recent'):
+            donation = Donation.objects.create(cause_id=cause, recipient_id=organizer, amount=Decimal('10.00'))
+            PaymentTransaction.objects.create(donation=donation, amount=Decimal('10.00'), transaction_id=reference,
+                                              email=f'{reference}@example.com', payment_method='Paystack')
+        PaymentTransaction.objects.exclude(transaction_id='ref-recent') \
+            .update(transaction_date=timezone.now() - timedelta(hours=2))
+        self.cutoff = timezone.now() - timedelta(hours=1)
+
+    @staticmethod
+    def _verify(reference):
+        statuses = {'ref-paid': 'success', 'ref-declined': 'abandoned', 'ref-ongoing': 'ongoing'}
+        if reference not in statuses:
+            return {'status': False, 'message': 'Transaction reference not found'}
+        return {'status': True, 'data': {'status': statuses[reference]}}
+
+    def test_stale_payments_are_settled_in_chunks(self):
+        from donations.models import OutboxEvent
+        from .reconciliation import reconcile_pending_payments
+
+        with patch('payments.reconciliation.Paystack.verify_payment', side_effect=self._verify) as verify, \
+                patch('payments.state.send_donation_success_notification.delay') as notify, \
+                self.captureOnCommitCallbacks(execute=True):
+            summary = reconcile_pending_payments(self.cutoff, chunk_size=2, concurrency=2)
+
+        self.assertEqual(summary, {'checked': 4, 'completed': 1, 'failed': 1, 'unchanged': 1, 'errors': 1, 'chunks': 2})
+        self.assertNotIn('ref-recent', [call.args[0] for call in verify.call_args_list])
+        statuses = dict(PaymentTransaction.objects.values_list('transaction_id', 'status'))
+        self.assertEqual(statuses, {'ref-paid': 'completed', 'ref-declined': 'failed', 'ref-ongoing': 'pending',
+                                    'ref-unknown': 'pending', 'ref-recent': 'pending'})
+        donations = dict(Donation.objects.values_list('paymenttransaction__transaction_id', 'status'))
+        self.assertEqual((donations['ref-paid'], donations['ref-declined']), ('completed', 'failed'))
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+        notify.assert_called_once()
+        self.assertEqual(notify.call_args.args[1], 'ref-paid@example.com')
+
+    def test_payments_settled_meanwhile_are_left_alone(self):
+        from .reconciliation import apply_outcomes
+
+        paid = PaymentTransaction.objects.get(transaction_id='ref-paid')
+        PaymentTransaction.objects.filter(pk=paid.pk).update(status='failed')
+
+        with patch('payments.state.send_donation_success_notification.delay') as notify:
+            self.assertEqual(apply_outcomes({paid.pk: 'completed'})['completed'], 0)
+        notify.assert_not_called()
+        paid.donation.refresh_from_db()
+        self.assertEqual(paid.donation.status, 'pending')
+
+
+class PaymentStateTestCase(TestCase):
+    """Test cases for the compare-and-set payment transitions"""
+
+    def setUp(self):
+        from categories.models import Category
+        from causes.models import Causes
+
+        organizer = get_user_model().objects.create_user(email='state-organizer@example.com', password='testpass123')
+        cause = Causes.objects.create(
+            name='State Cause', category=Category.objects.create(name='State', description='State causes'),
+            organizer_id=organizer, target_amount=Decimal('100.00'), status='ongoing',
+        )
+        self.donation = Donation.objects.create(cause_id=cause, recipient_id=organizer, amount=Decimal('10.00'))
+        self.payment = PaymentTransaction.objects.create(donation=self.donation, amount=Decimal('10.00'),
+                                                         transaction_id='ref-state', payment_method='Paystack')
+
+    def test_only_the_first_settlement_wins(self):
+        from donations.models import OutboxEvent
+        from .state import COMPLETED, settle_payment
+
+        with patch('payments.state.send_donation_success_notification.delay') as notify, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(settle_payment('ref-state', 'success', 'donor@example.com'), COMPLETED)
+            self.assertIsNone(settle_payment('ref-state', 'success', 'donor@example.com'))
+            self.assertIsNone(settle_payment('ref-state', 'failed'))
+
+        notify.assert_called_once_with(self.donation.pk, 'donor@example.com')
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+        self.payment.refresh_from_db()
+        self.donation.refresh_from_db()
+        self.assertEqual((self.payment.status, self.donation.status), ('completed', 'completed'))
+
+    def test_failed_payment_cannot_complete(self):
+        from .state import FAILED, can_transition, complete_payments, settle_payment
+
+        self.assertEqual(settle_payment('ref-state', 'failed'), FAILED)
+        self.assertIsNone(settle_payment('ref-state', 'ongoing'))
+        self.assertEqual(complete_payments([self.payment.pk]), 0)
+        self.assertFalse(can_transition('failed', 'completed'))
+
+        self.donation.refresh_from_db()
+        self.assertEqual(self.donation.status, 'failed')
+
+    def test_verify_reports_status_without_settling_twice(self):
+        from .views import record_verified_payment
+
+        verified = {'status': True, 'data': {'status': 'success', 'customer': {'email': 'donor@example.com'}}}
+        with patch('payments.state.send_donation_success_notification.delay') as notify, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(record_verified_payment('ref-state', verified).data, {'status': 'completed'})
+            self.assertEqual(record_verified_payment('ref-state', verified).data, {'status': 'completed'})
+        notify.assert_called_once()
+
+        self.assertEqual(record_verified_payment('ref-missing', verified).status_code, status.HTTP_404_NOT_FOUND)
@@ -1,9 +1,17 @@
-from .views import PaystackWebhookView, InitiatePaymentView, VerifyPaymentView, AdminPaymentTransactionListView
+from django.conf import settings
+
+from .views import (PaystackWebhookView, InitiatePaymentView, VerifyPaymentView, AdminPaymentTransactionListView,
+                    AsyncInitiatePaymentView, AsyncVerifyPaymentView)
 from django.urls import path
 
+if settings.PAYMENT_VIEWS_ASYNC:
+    initiate_view, verify_view = AsyncInitiatePaymentView, AsyncVerifyPaymentView
+else:
+    initiate_view, verify_view = InitiatePaymentView, VerifyPaymentView
+
 urlpatterns = [
     path('webhook/', PaystackWebhookView.as_view(), name='paystack_webhook'),
-    path('initiate/', InitiatePaymentView.as_view(), name='initiate_payment'),
-    path('verify/<str:reference>/', VerifyPaymentView.as_view(), name='verify_payment'),
+    path('initiate/', initiate_view.as_view(), name='initiate_payment'),
+    path('verify/<str:reference>/', verify_view.as_view(), name='verify_payment'),
     # path('admin/transactions/', AdminPaymentTransactionListView.as_view(), name='admin_payment_transaction_list'),
-]
\ No newline at end of file
+]
@@ -1,3 +1,5 @@
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -7,11 +9,11 @@ from rest_framework.views import APIView
 from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 
-from donations.tasks import publish_donation_completed_event, send_donation_success_notification
-
 from .models import PaymentTransaction
-from .paystack import Paystack
+from .paystack import AsyncPaystack, Paystack
 from .serializers import PaymentTransactionSerializer
+from .state import settle_payment
+from .webhooks import CHARGE_EVENTS, receive_event, signature_status
 from .permissions import IsAdminService
 
 # Create your views here.
@@ -21,120 +23,136 @@ class PaymentTransactionViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.AllowAny]
 
 
+def initiate_params(request):
+    """The required initiate fields, or None if any is missing."""
+    params = {key: request.data.get(key) for key in ('email', 'amount', 'user_id', 'donation_id')}
+    return params if all(params.values()) else None
+
+
+def missing_initiate_params():
+    return Response({'error': 'Email, amount, user_id, and donation_id are required'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def record_initiated_payment(params, paystack_response):
+    """Store the transaction Paystack initialized and answer the client."""
+    if paystack_response['status']:
+        data = paystack_response['data']
+
+        PaymentTransaction.objects.create(
+            transaction_id=data['reference'],
+            amount=params['amount'],
+            currency=data['currency'],
+            email=params['email'],
+            user_id=params['user_id'],
+            donation_id=params['donation_id'],
+            status='pending',
+            payment_method='Paystack'
+        )
+        return Response({'authorization_url': data['authorization_url']})
+    return Response({'error': paystack_response['message']}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def record_verified_payment(reference, paystack_response):
+    """Apply a Paystack verification result to the payment and its donation."""
+    if paystack_response['status']:
+        data = paystack_response['data']
+        donor_email = (data.get('customer') or {}).get('email')
+        payment_status = settle_payment(reference, data['status'], donor_email)
+        if payment_status is None:
+            # Not settled by this call: report whatever the payment is now
+            payment_status = PaymentTransaction.objects.filter(transaction_id=reference) \
+                .values_list('status', flat=True).first()
+            if payment_status is None:
+                return Response({'error': 'Payment not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'status': payment_status})
+    return Response({'error': paystack_response['message']}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def settled_payment_status(reference):
+    """The status of a payment that no longer needs verifying, else None."""
+    return PaymentTransaction.objects.filter(
+        transaction_id=reference, status__in=('completed', 'failed'),
+    ).values_list('status', flat=True).first()
+
+
 class InitiatePaymentView(APIView):
     def post(self, request):
-        email = request.data.get('email')
-        amount = request.data.get('amount')
-        user_id = request.data.get('user_id')
-        donation_id = request.data.get('donation_id')
-
-        if not all([email, amount, user_id, donation_id]):
-            return Response({'error': 'Email, amount, user_id, and donation_id are required'}, status=status.HTTP_400_BAD_REQUEST)
-
-        paystack_response = Paystack.initialize_payment(email, amount)
-        if paystack_response['status']:
-            data = paystack_response['data']
-
-            PaymentTransaction.objects.create(
-                transaction_id=data['reference'],
-                amount=amount,
-                currency=data['currency'],
-                email=email,
-                user_id=user_id,
-                donation_id=donation_id,
-                status='pending',
-                payment_method='Paystack'
-            )
-            return Response({'authorization_url': data['authorization_url']})
-        return Response({'error': paystack_response['message']}, status=status.HTTP_400_BAD_REQUEST)
+        params = initiate_params(request)
+        if params is None:
+            return missing_initiate_params()
+
+        paystack_response = Paystack.initialize_payment(params['email'], params['amount'])
+        return record_initiated_payment(params, paystack_response)
 
 
 class VerifyPaymentView(APIView):
     @method_decorator(cache_page(30))  # Cache for 30 seconds
     def get(self, request, reference):
+        # Payments settled by a webhook are answered without calling Paystack
+        settled = settled_payment_status(reference)
+        if settled:
+            return Response({'status': settled})
+
         paystack_response = Paystack.verify_payment(reference)
-        if paystack_response['status']:
-            data = paystack_response['data']
-            try:
-                # Include donation details in select_related
-                payment = PaymentTransaction.objects.select_related('donation').get(transaction_id=reference)
-
-                if data['status'] == 'success':
-                    payment.status = 'completed'
-                    payment.save()
-
-
-                    if payment.donation:
-                        # Update donation status
-                        payment.donation.status = 'completed'
-                        payment.donation.save()
-
-                        # Get email from payment data or donation user
-                        donor_email = None
-                        if payment.donation.user_id:
-                            donor_email = payment.donation.user_id.email
-                        else:
-                            donor_email = data.get('customer', {}).get('email')
-
-                        if donor_email:
-                            # Send donation success email
-                            send_donation_success_notification(payment.donation.id, donor_email)
-
-                        # Call task with proper parameters
-                        publish_donation_completed_event.delay(
-                            str(payment.donation.cause_id.id if hasattr(payment.donation.cause_id, 'id') else payment.donation.cause_id),
-                            float(payment.donation.amount)
-                        )
-
-                return Response({'status': payment.status})
-            except PaymentTransaction.DoesNotExist:
-                return Response({'error': 'Payment not found'}, status=status.HTTP_404_NOT_FOUND)
-            except Exception as e:
-                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        return Response({'error': paystack_response['message']}, status=status.HTTP_400_BAD_REQUEST)
+        return record_verified_payment(reference, paystack_response)
 
 
+class AsyncInitiatePaymentView(AsyncAPIView):
+    """InitiatePaymentView that awaits Paystack instead of blocking a worker thread."""
 
-class PaystackWebhookView(APIView):
-    authentication_classes = []
-    permission_classes = []
+    async def post(self, request):
+        params = initiate_params(request)
+        if params is None:
+            return missing_initiate_params()
 
-    def post(self, request):
-        event = request.data('event')
-        data = request.data('data', {})
-        reference = data.get('reference')
+        paystack_response = await AsyncPaystack.initialize_payment(params['email'], params['amount'])
+        return await sync_to_async(record_initiated_payment)(params, paystack_response)
 
-        if not reference:
-            return Response({'error': 'Reference not provided'}, status=status.HTTP_400_BAD_REQUEST)
 
-        verification = Paystack.verify_payment(reference)
-        if not verification.get('status'):
-            return Response({'error': verification.get('message', 'Verification failed')}, status=status.HTTP_400_BAD_REQUEST)
+class AsyncVerifyPaymentView(AsyncAPIView):
+    """
+    VerifyPaymentView that awaits Paystack instead of blocking a worker thread.
+    Instead of the response cache, payments that are already settled are
+    answered from the database without calling Paystack.
+    """
 
-        payment_status = verification['data']['status']
+    async def get(self, request, reference):
+        settled = await sync_to_async(settled_payment_status)(reference)
+        if settled:
+            return Response({'status': settled})
 
-        try:
-            payment = PaymentTransaction.objects.get(transaction_id=reference)
-            if payment_status == 'success':
-                payment.status = 'completed'
+        paystack_response = await AsyncPaystack.verify_payment(reference)
+        return await sync_to_async(record_verified_payment)(reference, paystack_response)
 
-                if payment.donation:
-                    payment.donation.status = 'completed'
-                    payment.donation.save()
-                    publish_donation_completed_event.delay(payment.donation.cause_id, payment.donation.amount)
 
-            elif payment_status == 'failed':
-                payment.status = 'failed'
+class PaystackWebhookView(APIView):
+    """
+    Stores the event in the webhook inbox and acknowledges it at once; the
+    process_paystack_webhooks task applies it (see payments/webhooks.py).
+    Redelivered events are acknowledged without being stored again. Events
+    without a valid x-paystack-signature are refused before anything is
+    stored.
+    """
+    authentication_classes = []
+    permission_classes = []
 
-                if payment.donation:
-                    payment.donation.status = 'failed'
-                    payment.donation.save()
-            else:
-                payment.status = payment_status
-            payment.save()
-        except PaymentTransaction.DoesNotExist:
-            return Response({'error': 'Payment record not found'}, status=status.HTTP_400_BAD_REQUEST)
+    def post(self, request):
+        # The signature covers the raw body, which must be read before request.data
+        body = request.body
+        if not signature_status(body, request.headers.get('x-paystack-signature')):
+            return Response({'error': 'Invalid signature'}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(request.data, dict):
+            return Response({'error': 'Event not provided'}, status=status.HTTP_400_BAD_REQUEST)
+
+        event = request.data.get('event')
+        data = request.data.get('data') or {}
+
+        if not event or not isinstance(data, dict):
+            return Response({'error': 'Event not provided'}, status=status.HTTP_400_BAD_REQUEST)
+        if event in CHARGE_EVENTS and not data.get('reference'):
+            return Response({'error': 'Reference not provided'}, status=status.HTTP_400_BAD_REQUEST)
 
+        receive_event({'event': event, 'data': data}, body, signed=True)
         return Response({'status': 'success'}, status=status.HTTP_200_OK)
 
 class AdminPaymentTransactionListView(generics.ListAPIView):
@@ -0,0 +1,174 @@
+"""
+Inbox for Paystack webhooks.
+
+Paystack delivers every event at least once and retries anything that is not
+answered with a 2xx quickly, so the webhook view does no work inline: it
+stores the event with ``receive_event`` and returns 200. The row's
+``event_key`` is unique, so a redelivered event is dropped by the database
+rather than applied twice.
+
+Paystack signs each webhook with ``x-paystack-signature``, an HMAC-SHA512 of
+the raw body keyed with our secret key. The view rejects events without a
+valid signature before storing anything. A charge event is applied from its
+own payload, without calling Paystack back, unless its amount or currency
+disagrees with the payment (or it was stored unsigned, before unsigned events
+were refused); those are verified with Paystack first.
+
+``process_paystack_webhooks`` (a periodic Celery task) drains pending rows in
+batches: each batch is locked with SKIP LOCKED so concurrent workers split the
+work, the batch's payments are loaded in one query, and each event is applied
+in its own savepoint. An event that fails is retried on later runs until
+``WEBHOOK_MAX_ATTEMPTS``, after which it is parked with its last error.
+"""
+import hashlib
+import hmac
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import PaymentTransaction, PaystackWebhookEvent
+from .paystack import Paystack
+from .state import PENDING, settle_payment
+
+logger = logging.getLogger(__name__)
+
+CHARGE_EVENTS = ('charge.success', 'charge.failed')
+
+
+class WebhookProcessingError(Exception):
+    pass
+
+
+def signature_status(body, signature, secret_key=None):
+    """
+    Check a webhook ``signature`` header against the raw ``body``: True if it
+    is valid, False if it is wrong, None if the event was not signed.
+    """
+    if not signature:
+        return None
+    secret_key = secret_key or settings.PAYSTACK_SECRET_KEY
+    expected = hmac.new(secret_key.encode(), body, hashlib.sha512).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def event_key(event, data, body):
+    """
+    The identity of a webhook event: its name plus Paystack's id for the
+    object (or its reference/transfer code), falling back to a digest of the
+    raw body.
+    """
+    identifier = data.get('id') or data.get('reference') or data.get('transfer_code')
+    if identifier:
+        return f'{event}:{identifier}'
+    return f'{event}:sha256:{hashlib.sha256(body).hexdigest()}'
+
+
+def receive_event(payload, body, signed=False):
+    """
+    Store a webhook ``payload`` (the parsed ``body``) unless it was already
+    received. Returns True if it was new.
+    """
+    event = payload['event']
+    data = payload.get('data') or {}
+    key = event_key(event, data, body)
+    try:
+        with transaction.atomic():
+            PaystackWebhookEvent.objects.create(
+                event_key=key,
+                event=event,
+                reference=data.get('reference') or '',
+                payload=payload,
+                signed=signed,
+            )
+    except IntegrityError:
+        logger.info('Ignoring duplicate Paystack webhook %s', key)
+        return False
+    return True
+
+
+def apply_event(row, payments):
+    """Apply one inbox row. ``payments`` maps the batch's references to their payments."""
+    if row.event not in CHARGE_EVENTS or not row.reference:
+        return
+
+    payment = payments.get(row.reference)
+    if payment is None:
+        raise WebhookProcessingError(f'Payment record not found for {row.reference}')
+    if payment.status != PENDING:
+        return
+
+    data = row.payload.get('data') or {}
+    payment_status = trusted_payment_status(row, payment)
+    if payment_status is None:
+        verification = Paystack.verify_payment(row.reference)
+        if not verification.get('status'):
+            raise WebhookProcessingError(verification.get('message', 'Verification failed'))
+        data = verification['data']
+        payment_status = data['status']
+    # Later events in the batch for the same payment see it settled
+    payment.status = settle_payment(row.reference, payment_status, (data.get('customer') or {}).get('email')) \
+        or payment.status
+
+
+def trusted_payment_status(row, payment):
+    """
+    The charge status a signed event reports for ``payment``, or None if the
+    event has to be verified with Paystack: it was stored unsigned, or its
+    status, amount or currency does not match what we expect.
+    """
+    if not row.signed:
+        return None
+    data = row.payload.get('data') or {}
+    payment_status = data.get('status')
+    if f'charge.{payment_status}' != row.event:
+        return None
+    if data.get('amount') != int(payment.amount * 100) or data.get('currency', payment.currency) != payment.currency:
+        logger.warning('Signed Paystack webhook %s does not match payment %s; verifying', row.event_key, payment.pk)
+        return None
+    return payment_status
+
+
+def process_pending_events(batch_size):
+    """Apply up to ``batch_size`` pending events in id order. Returns how many were taken."""
+    with transaction.atomic():
+        rows = list(
+            PaystackWebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True, attempts__lt=settings.WEBHOOK_MAX_ATTEMPTS)
+            .order_by('id')[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        references = {row.reference for row in rows if row.reference}
+        payments = PaymentTransaction.objects.only('id', 'transaction_id', 'amount', 'currency', 'status').in_bulk(
+            references, field_name='transaction_id'
+        )
+
+        processed, failed = [], []
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    apply_event(row, payments)
+            except Exception as exc:
+                logger.warning('Paystack webhook %s failed: %s', row.event_key, exc)
+                failed.append((row.pk, str(exc)))
+            else:
+                processed.append(row.pk)
+
+        now = timezone.now()
+        if processed:
+            PaystackWebhookEvent.objects.filter(pk__in=processed).update(
+                processed_at=now, attempts=F('attempts') + 1, last_error='',
+            )
+        for pk, error in failed:
+            PaystackWebhookEvent.objects.filter(pk=pk).update(attempts=F('attempts') + 1, last_error=error)
+    return len(rows)
+
+
+def prune_processed_events(older_than):
+    """Delete events processed before ``older_than``. Returns the number deleted."""
+    deleted, _ = PaystackWebhookEvent.objects.filter(processed_at__lt=older_than).delete()
+    return deleted
@@ -30,6 +30,8 @@ from django.http import HttpResponseRedirect
 from rest_framework_simplejwt.views import TokenObtainPairView
 from twisted.mail.scripts.mailmail import failure
 
+from causehive.paystack_client import get_paystack_client
+
 from .email_utils import send_account_verification_email, send_password_reset_email
 from .models import User, UserProfile
 from .permissions import IsAdminService
@@ -551,13 +553,7 @@ class BankListAPIView(APIView):
 
         if not banks:
             try:
-                url = "https://api.paystack.co/bank?currency=GHS"
-                headers = {
-                    "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
-                    "Content-Type": "application/json"
-                }
-
-                response = requests.get(url, headers=headers)
+                response = get_paystack_client().get('/bank', endpoint='bank.list', params={'currency': 'GHS'})
                 response.raise_for_status()
 
                 data = response.json()
@@ -588,13 +584,9 @@ class MobileMoneyListAPIView(APIView):
 
         if not mobile_money:
             try:
-                url = "https://api.paystack.co/bank?currency=GHS&type=mobile_money"
-                headers = {
-                    "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
-                    "Content-Type": "application/json"
-                }
-
-                response = requests.get(url, headers=headers)
+                response = get_paystack_client().get(
+                    '/bank', endpoint='bank.list', params={'currency': 'GHS', 'type': 'mobile_money'}
+                )
                 response.raise_for_status()
 
                 data = response.json()
@@ -629,17 +621,13 @@ class ValidateBankAccountAPIView(APIView):
             )
 
         try:
-            url = "https://api.paystack.co/bank/resolve"
-            headers = {
-                "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
-                "Content-Type": "application/json"
-            }
             data = {
                 "account_number": account_number,
                 "bank_code": bank_code
             }
 
-            response = requests.post(url, json=data, headers=headers)
+            # A lookup, so safe to retry
+            response = get_paystack_client().post('/bank/resolve', endpoint='bank.resolve', json=data, idempotent=True)
             response.raise_for_status()
 
             result = response.json()
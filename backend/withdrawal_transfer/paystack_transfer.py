@@ -1,14 +1,11 @@
 # donation_processing_service/withdrawal_transfer/paystack_transfer.py
 import requests
 import json
-from django.conf import settings
+from causehive.paystack_client import get_paystack_client
 from .models import WithdrawalRequest
 
 
 class PaystackTransfer:
-    BASE_URL = settings.PAYSTACK_BASE_URL
-    SECRET_KEY = settings.PAYSTACK_SECRET_KEY
-
     @classmethod
     def initiate_transfer(cls, withdrawal_request):
         """Initiate transfer by first creating recipient, then transferring"""
@@ -25,12 +22,6 @@ class PaystackTransfer:
         withdrawal_request.save()
 
         # Step 2: Initiate transfer with recipient code
-        url = f"{cls.BASE_URL}/transfer"
-        headers = {
-            'Authorization': f'Bearer {cls.SECRET_KEY}',
-            'Content-Type': 'application/json'
-        }
-
         transfer_data = {
             "amount": int(withdrawal_request.amount * 100),  # Convert to pesewas
             "currency": withdrawal_request.currency,
@@ -40,7 +31,7 @@ class PaystackTransfer:
         }
 
         try:
-            response = requests.post(url, json=transfer_data, headers=headers)
+            response = get_paystack_client().post('/transfer', endpoint='transfer.initiate', json=transfer_data)
             return response.json()
         except requests.RequestException as e:
             return {
@@ -59,12 +50,6 @@ class PaystackTransfer:
                 'data': {'recipient_code': existing_recipient}
             }
 
-        url = f"{cls.BASE_URL}/transferrecipient"
-        headers = {
-            'Authorization': f'Bearer {cls.SECRET_KEY}',
-            'Content-Type': 'application/json'
-        }
-
         payment_details = withdrawal_request.payment_details
         payment_method = withdrawal_request.payment_method
 
@@ -129,7 +114,7 @@ class PaystackTransfer:
         print(f"Recipient Data: {json.dumps(recipient_data, indent=2)}")
 
         try:
-            response = requests.post(url, json=recipient_data, headers=headers)
+            response = get_paystack_client().post('/transferrecipient', endpoint='transfer.recipient', json=recipient_data)
             result = response.json()
 
             # Debug logging
@@ -188,14 +173,8 @@ class PaystackTransfer:
 
     @classmethod
     def verify_transfer(cls, transfer_code):
-        url = f"{cls.BASE_URL}/transfer/verify/{transfer_code}"
-        headers = {
-            'Authorization': f'Bearer {cls.SECRET_KEY}',
-            'Content-Type': 'application/json'
-        }
-
         try:
-            response = requests.get(url, headers=headers)
+            response = get_paystack_client().get(f'/transfer/verify/{transfer_code}', endpoint='transfer.verify')
             return response.json()
         except requests.RequestException as e:
             return {
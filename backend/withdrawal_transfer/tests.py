@@ -704,8 +704,8 @@ class AdminWithdrawalViewsTestCase(APITestCase):
 class PaystackTransferTestCase(TestCase):
     """Test cases for PaystackTransfer class."""
 
-    @patch('withdrawal_transfer.paystack_transfer.requests.post')
-    def test_initiate_transfer_success(self, mock_post):
+    @patch('withdrawal_transfer.paystack_transfer.get_paystack_client')
+    def test_initiate_transfer_success(self, mock_client):
         """Test successful transfer initiation."""
         # Mock recipient creation
         mock_recipient_response = MagicMock()
@@ -721,7 +721,7 @@ class PaystackTransferTestCase(TestCase):
             'data': {'reference': 'TXN123456'}
         }
 
-        mock_post.side_effect = [mock_recipient_response, mock_transfer_response]
+        mock_client.return_value.post.side_effect = [mock_recipient_response, mock_transfer_response]
 
         withdrawal = WithdrawalRequest.objects.create(
             user_id=uuid.uuid4(),
@@ -743,15 +743,15 @@ class PaystackTransferTestCase(TestCase):
         withdrawal.refresh_from_db()
         self.assertEqual(withdrawal.recipient_code, 'RCP_1234567890')
 
-    @patch('withdrawal_transfer.paystack_transfer.requests.post')
-    def test_initiate_transfer_recipient_creation_failure(self, mock_post):
+    @patch('withdrawal_transfer.paystack_transfer.get_paystack_client')
+    def test_initiate_transfer_recipient_creation_failure(self, mock_client):
         """Test transfer initiation when recipient creation fails."""
         mock_response = MagicMock()
         mock_response.json.return_value = {
             'status': False,
             'message': 'Recipient creation failed'
         }
-        mock_post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         withdrawal = WithdrawalRequest.objects.create(
             user_id=uuid.uuid4(),
@@ -77,6 +77,11 @@ export function mapPagination<TOut>(p: AnyPagination, mapper: (x: unknown) => TO
   }
 }
 
+// Cursor-paged listings link to their neighbouring pages with ?cursor=
+export function cursorOf(link: string | null): string | null {
+  return link ? new URL(link, window.location.origin).searchParams.get('cursor') : null
+}
+
 export function mapDonation(input: unknown): Donation {
   const obj = (input ?? {}) as Record<string, unknown>
   const cause = (obj.cause ?? {}) as Record<string, unknown>
@@ -94,8 +94,9 @@ export function HomePage() {
   const { data: _liveCausesCount } = useQuery<number>({
     queryKey: ['home-live-causes-count'],
     queryFn: async () => {
-      const { data } = await api.get('/causes/', { params: { status: 'live', page_size: 1 } })
-      return Number(data?.count ?? 0)
+      // Cursor-paged: the total is the planner's estimate, only sent on request
+      const { data } = await api.get('/causes/', { params: { status: 'live', page_size: 1, estimate_total: 1 } })
+      return Number(data?.total_estimate ?? 0)
     }
   })
   const { data: _categoriesCount } = useQuery<number>({
@@ -117,8 +118,8 @@ export function HomePage() {
     queryKey: ['home-donations-count'],
     queryFn: async () => {
       try {
-        const { data } = await api.get('/donations/', { params: { page_size: 1 } })
-        return Number(data?.count ?? 0)
+        const { data } = await api.get('/donations/', { params: { page_size: 1, estimate_total: 1 } })
+        return data?.total_estimate == null ? null : Number(data.total_estimate)
       } catch (err) {
         // Not authenticated or endpoint not public; hide this metric but log for visibility
         console.warn('Failed to fetch donations count (possibly unauthenticated):', err)
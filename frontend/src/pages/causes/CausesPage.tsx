@@ -8,6 +8,7 @@ import { Progress } from '@/components/ui/progress'
 import { Badge } from '@/components/ui/badge'
 import { Pagination as UIPagination } from '@/components/ui/pagination'
 import { Empty } from '@/components/ui/empty'
+import { cursorOf } from '@/lib/mappers'
 import { ShoppingCart } from 'lucide-react'
 
 // Mock data for demonstration
@@ -98,12 +99,14 @@ const mockCategories = [
 export function CausesPage() {
   const [params, setParams] = useSearchParams()
   const page = Number(params.get('page') ?? '1')
+  const cursor = params.get('cursor') ?? ''
   const search = params.get('search') ?? ''
   const category = params.get('category') ?? ''
 
   const { data: categories } = useCategories()
   const { data, isLoading } = useCauses({
-    page,
+    cursor: cursor || undefined,
+    page_size: 12,
     search: search || undefined,
     category: category || undefined,
     status: 'live',
@@ -140,6 +143,7 @@ export function CausesPage() {
     const s = String(form.get('q') ?? '')
     const next = new URLSearchParams(params)
     if (s) next.set('search', s); else next.delete('search')
+    next.delete('cursor')
     next.set('page', '1')
     setParams(next)
   }
@@ -147,12 +151,14 @@ export function CausesPage() {
   const onCategoryChange = (catId: string) => {
     const next = new URLSearchParams(params)
     if (catId) next.set('category', catId); else next.delete('category')
+    next.delete('cursor')
     next.set('page', '1')
     setParams(next)
   }
 
-  const onPageChange = (p: number) => {
+  const onPageChange = (p: number, link: string | null) => {
     const next = new URLSearchParams(params)
+    next.set('cursor', cursorOf(link) ?? '')
     next.set('page', String(p))
     setParams(next)
   }
@@ -317,13 +323,13 @@ export function CausesPage() {
             </div>
 
             {/* Pagination */}
-            {data?.count && data.count > 12 && (
+            {data && (data.next || data.previous) && (
               <UIPagination
                 page={page}
-                hasPrev={page > 1}
-                hasNext={page < Math.ceil(data.count / 12)}
-                onPrev={() => onPageChange(page - 1)}
-                onNext={() => onPageChange(page + 1)}
+                hasPrev={!!data.previous}
+                hasNext={!!data.next}
+                onPrev={() => onPageChange(Math.max(1, page - 1), data.previous)}
+                onNext={() => onPageChange(page + 1, data.next)}
               />
             )}
           </>
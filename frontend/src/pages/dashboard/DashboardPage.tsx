@@ -25,10 +25,22 @@ export default function DashboardPage() {
     staleTime: 5 * 60 * 1000,
   })
 
+  // The donation listing is cursor-paged and carries no count; the donor's
+  // statistics do
+  const { data: donationStats } = useQuery({
+    queryKey: ['dashboard-donation-statistics'],
+    queryFn: async () => {
+      const { data } = await api.get('/donations/statistics/')
+      return data
+    },
+    retry: 1,
+    staleTime: 5 * 60 * 1000,
+  })
+
   const { data: causes, isLoading: causesLoading } = useQuery({
     queryKey: ['dashboard-causes'],
     queryFn: async () => {
-      const { data } = await api.get('/causes/', { params: { page_size: 10 } })
+      const { data } = await api.get('/causes/', { params: { page_size: 10, estimate_total: 1 } })
       return data
     },
     retry: 1,
@@ -75,7 +87,7 @@ export default function DashboardPage() {
         <div className="bg-white rounded-lg border p-6 shadow-sm">
           <div className="text-sm text-gray-600">Recent donations</div>
           <div className="mt-2 text-3xl font-semibold">
-            {donationsLoading ? '…' : (donations?.count ?? 0)}
+            {donationsLoading ? '…' : (donationStats?.total_donations ?? 0)}
           </div>
         </div>
         <div className="bg-white rounded-lg border p-4 shadow-sm">
@@ -93,7 +105,7 @@ export default function DashboardPage() {
         <div className="bg-white rounded-lg border p-4 shadow-sm">
           <div className="text-sm text-gray-600">Available causes</div>
           <div className="mt-2 text-3xl font-semibold">
-            {causes?.count ?? 0}
+            {causes?.total_estimate ?? 0}
           </div>
         </div>
       </div>
@@ -1,7 +1,7 @@
 import { useQuery } from '@tanstack/react-query'
 import { api } from '@/lib/api'
 import type { Pagination, Donation } from '@/types/api'
-import { mapDonation, mapPagination } from '@/lib/mappers'
+import { cursorOf, mapDonation, mapPagination } from '@/lib/mappers'
 import { useSearchParams } from 'react-router-dom'
 import { useToast } from '@/components/ui/toast'
 import { Skeleton } from '@/components/ui/skeleton'
@@ -16,21 +16,22 @@ export function DonationsPage() {
   const { notify } = useToast()
   const [params, setParams] = useSearchParams()
   const page = Number(params.get('page') ?? '1')
+  const cursor = params.get('cursor') || ''
   const status = params.get('status') || ''
   const search = params.get('search') || ''
 
   const { data, isLoading, isError } = useQuery({
-    queryKey: ['donations', { page, status, search }],
+    queryKey: ['donations', { cursor, status, search }],
     queryFn: async () => {
       const { data } = await api.get<Pagination<Donation>>('/donations/', {
         params: {
-          page,
+          cursor: cursor || undefined,
           status: status || undefined,
           search: search || undefined,
           ordering: '-donated_at'
         }
       })
-  return mapPagination(data, mapDonation)
+      return mapPagination(data, mapDonation)
     }
   })
 
@@ -49,6 +50,7 @@ export function DonationsPage() {
             const p=new URLSearchParams(params)
             if(val && val !== 'all') p.set('status', val)
             else p.delete('status')
+            p.delete('cursor')
             p.set('page','1')
             setParams(p)
           }}
@@ -62,7 +64,7 @@ export function DonationsPage() {
           </SelectContent>
         </Select>
         <form
-          onSubmit={(e)=>{e.preventDefault(); const form=new FormData(e.currentTarget); const q=String(form.get('q')??''); const p=new URLSearchParams(params); if(q) p.set('search',q); else p.delete('search'); p.set('page','1'); setParams(p)}}
+          onSubmit={(e)=>{e.preventDefault(); const form=new FormData(e.currentTarget); const q=String(form.get('q')??''); const p=new URLSearchParams(params); if(q) p.set('search',q); else p.delete('search'); p.delete('cursor'); p.set('page','1'); setParams(p)}}
           className="flex gap-2"
         >
           <input name="q" defaultValue={search} placeholder="Search by cause" className="rounded-md border border-gray-300 px-3 py-2 bg-white text-gray-900" />
@@ -124,8 +126,8 @@ export function DonationsPage() {
           page={page}
           hasPrev={!!data.previous}
           hasNext={!!data.next}
-          onPrev={()=>{const p=new URLSearchParams(params); p.set('page', String(Math.max(1, page-1))); setParams(p)}}
-          onNext={()=>{const p=new URLSearchParams(params); p.set('page', String(page+1)); setParams(p)}}
+          onPrev={()=>{const p=new URLSearchParams(params); p.set('cursor', cursorOf(data.previous) ?? ''); p.set('page', String(Math.max(1, page-1))); setParams(p)}}
+          onNext={()=>{const p=new URLSearchParams(params); p.set('cursor', cursorOf(data.next) ?? ''); p.set('page', String(page+1)); setParams(p)}}
         />
       )}
     </div>